@@ -10,6 +10,7 @@ import subprocess
 import sys
 import uuid
 from pathlib import Path
+from typing import AsyncIterator
 
 from fastapi import UploadFile
 
@@ -18,6 +19,8 @@ from .storage import JobStorage
 
 logger = logging.getLogger("restapi.jobs")
 
+REPORT_CHUNK_BYTES = 1 << 16
+
 
 def _build_cli_args(
     job_id: str, detail_params: SamplingParams, storage: JobStorage
@@ -53,9 +56,80 @@ def _build_cli_args(
         args.append("--fast")
     if detail_params.progress:
         args.append("--progress")
+    if not detail_params.keep_report:
+        args.append("--skip-report")
     return args
 
 
+def _build_report_args(job_id: str, storage: JobStorage) -> list[str]:
+    """Worker command writing a finished job's workbook to stdout."""
+    return [
+        sys.executable,
+        "-m",
+        "src.main",
+        "report",
+        str(storage.report_inputs_path(job_id)),
+        "--stdout",
+    ]
+
+
+async def open_report_stream(
+    job_id: str, storage: JobStorage
+) -> AsyncIterator[bytes]:
+    """Build a job's workbook from its report inputs and stream the bytes.
+
+    The worker renders the workbook in memory and writes it to stdout, so
+    nothing is written to the job directory. The first chunk is awaited
+    here, so a failing worker is reported before any response starts.
+
+    :param job_id: Identifier of a finished job
+    :param storage: Storage holding the job's report inputs
+    :return: Async iterator over the workbook bytes
+    :raises RuntimeError: If the worker exits without writing a workbook
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *_build_report_args(job_id, storage),
+        cwd=os.path.join(Path.cwd(), "worker"),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    # Drain stderr alongside stdout so a chatty worker cannot block
+    stderr = asyncio.create_task(proc.stderr.read())
+    first = await proc.stdout.read(REPORT_CHUNK_BYTES)
+    if not first:
+        await proc.wait()
+        lines = (await stderr).decode(errors="replace").splitlines()
+        raise RuntimeError(
+            f"Worker exited with code {proc.returncode}. "
+            f"Last errors: {' | '.join(lines[-5:]) or 'No stderr output'}"
+        )
+    return _relay_report(job_id, proc, first, stderr)
+
+
+async def _relay_report(
+    job_id: str,
+    proc: asyncio.subprocess.Process,
+    first: bytes,
+    stderr: asyncio.Task,
+) -> AsyncIterator[bytes]:
+    try:
+        chunk = first
+        while chunk:
+            yield chunk
+            chunk = await proc.stdout.read(REPORT_CHUNK_BYTES)
+    finally:
+        if proc.returncode is None and not proc.stdout.at_eof():
+            proc.kill()  # client went away mid-download
+        await proc.wait()
+        await stderr
+        if proc.returncode:
+            logger.error(
+                "Report stream for job %s ended with code %s",
+                job_id,
+                proc.returncode,
+            )
+
+
 class JobManager:
     """In-memory queue + worker loop to run CLI jobs."""
 
@@ -193,8 +267,11 @@ class JobManager:
             return
 
         report_path = self.storage.report_path(job_id)
-        rel_path = str(report_path)
+        # keep_report=False jobs only keep their report inputs on disk
+        rel_path = str(report_path) if report_path.exists() else None
         self.storage.update_job(
             job_id, status=JobStatus.DONE, report_path=rel_path
         )
-        logger.info("Job %s succeeded: %s", job_id, rel_path)
+        logger.info(
+            "Job %s succeeded: %s", job_id, rel_path or "report on demand"
+        )
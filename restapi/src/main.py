@@ -19,12 +19,18 @@ if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
 from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import (
+    FileResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from pydantic import ValidationError
 
+from worker.src.bundle import bundle_members, iter_bundle
 from worker.src.models import BalanceType
 
-from .jobs import JobManager
+from .jobs import JobManager, open_report_stream
 from .schemas import (
     JobCreateResponse,
     JobDetail,
@@ -42,6 +48,9 @@ app = FastAPI(
     author="r00tmebaby",
 )
 api_logger = logging.getLogger("restapi.api")
+XLSX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
 storage = JobStorage()
 manager = JobManager(storage)
 
@@ -79,6 +88,7 @@ async def submit_job(
     include_zeros: bool = Form(True),
     fast: bool = Form(True),
     progress: bool = Form(False),
+    keep_report: bool = Form(True),
 ) -> JobCreateResponse:
     try:
         # Construct SamplingParams so Pydantic can enforce CLI-consistent rules
@@ -92,6 +102,7 @@ async def submit_job(
             include_zeros=include_zeros,
             fast=fast,
             progress=progress,
+            keep_report=keep_report,
         )
     except ValidationError as exc:
         api_logger.warning("Invalid job parameters: %s", exc)
@@ -131,16 +142,23 @@ async def list_jobs(
 
 
 @app.get("/jobs/{job_id}/report", tags=["Audit Job Sampling"])
-async def download_report(job_id: str) -> FileResponse:
-    """Download the Excel report for a completed job."""
+async def download_report(job_id: str) -> Response:
+    """Download the Excel report for a completed job.
+
+    Jobs run with ``keep_report=False`` have no workbook on disk; it is
+    built in memory from the saved report inputs and streamed instead.
+    """
     try:
         job = storage.load_job(job_id)
     except FileNotFoundError:
         api_logger.warning("Report requested for missing job %s", job_id)
         raise HTTPException(status_code=404, detail="Job not found")
-    if job.status != JobStatus.DONE or not job.report_path:
+    if job.status != JobStatus.DONE:
         api_logger.warning("Report not ready for job %s", job_id)
         raise HTTPException(status_code=400, detail="Report not ready")
+    filename = f"sample_selection_{job_id}.xlsx"
+    if not job.report_path:
+        return await _stream_report(job_id, filename)
 
     # Resolve path - handle both relative and absolute paths
     path = Path(job.report_path)
@@ -154,8 +172,52 @@ async def download_report(job_id: str) -> FileResponse:
         )
     return FileResponse(
         path=path,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        filename=f"sample_selection_{job_id}.xlsx",
+        media_type=XLSX_MEDIA_TYPE,
+        filename=filename,
+    )
+
+
+@app.get("/jobs/{job_id}/bundle", tags=["Audit Job Sampling"])
+async def download_bundle(job_id: str) -> StreamingResponse:
+    """Download every artefact of a finished job as one ZIP file.
+
+    The archive is built while it is sent, one block at a time, and ends
+    with a ``manifest.json`` of each file's size and SHA-256 digest.
+    """
+    try:
+        job = storage.load_job(job_id)
+    except FileNotFoundError:
+        api_logger.warning("Bundle requested for missing job %s", job_id)
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in (JobStatus.DONE, JobStatus.FAILED):
+        api_logger.warning("Bundle not ready for job %s", job_id)
+        raise HTTPException(status_code=400, detail="Job still running")
+    members = bundle_members(storage.job_dir(job_id))
+    return StreamingResponse(
+        iter_bundle(members),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": (f'attachment; filename="job_{job_id}.zip"')
+        },
+    )
+
+
+async def _stream_report(job_id: str, filename: str) -> StreamingResponse:
+    """Stream a workbook built from the job's saved report inputs."""
+    if not storage.report_inputs_path(job_id).exists():
+        api_logger.error("Report inputs missing for job %s", job_id)
+        raise HTTPException(status_code=404, detail="Report inputs missing")
+    try:
+        chunks = await open_report_stream(job_id, storage)
+    except RuntimeError as exc:
+        api_logger.error("Report build failed for job %s: %s", job_id, exc)
+        raise HTTPException(
+            status_code=500, detail="Report could not be built"
+        ) from exc
+    return StreamingResponse(
+        chunks,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
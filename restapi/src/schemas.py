@@ -53,6 +53,13 @@ class SamplingParams(BaseModel):
     include_zeros: bool = Field(default=True)
     fast: bool = Field(default=True)
     progress: bool = Field(default=False)
+    keep_report: bool = Field(
+        default=True,
+        description=(
+            "Keep the Excel report on disk; otherwise it is built in "
+            "memory from the saved report inputs on each download"
+        ),
+    )
 
     @model_validator(mode="after")
     def validate_relationships(self) -> "SamplingParams":
@@ -39,6 +39,12 @@ class JobStorage:
             self.job_dir(job_id) / "sample_selection_output.xlsx"
         ).resolve()
 
+    def report_inputs_path(self, job_id: str) -> Path:
+        # The worker runs with the job id as its run id
+        return (
+            self.job_dir(job_id) / "runs" / f"{job_id}.report.json.gz"
+        ).resolve()
+
     def create_job_record(
         self,
         job_id: str,
@@ -1,4 +1,6 @@
 import io
+import os
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
@@ -75,3 +77,104 @@ def test_submit_job_enqueues_and_returns_id(tmp_path, monkeypatch):
     assert detail.job_id == job_id
     assert detail.status == JobStatus.PENDING
     assert detail.file_name == "input.csv"
+
+
+def test_report_streamed_from_report_inputs(tmp_path, monkeypatch):
+    """keep_report=False jobs keep no workbook; downloads build one."""
+    from openpyxl import load_workbook
+
+    from restapi.src.jobs import JobManager
+    from restapi.src.schemas import SamplingParams
+    from restapi.src.storage import JobStorage
+
+    storage = JobStorage(tmp_path)
+    monkeypatch.setattr(api_main, "storage", storage)
+    # The worker resolves its absolute imports from worker/src
+    worker_src = str(Path.cwd() / "worker" / "src")
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.pathsep.join(filter(None, [os.environ.get("PYTHONPATH"), worker_src])),
+    )
+    job_id = "streamjob"
+    params = SamplingParams(
+        tolerable_misstatement=1000,
+        expected_misstatement=100,
+        assurance_factor=2,
+        keep_report=False,
+    )
+    storage.create_job_record(job_id, "input.csv", params)
+    rows = "".join(f"A{i},{i * 7},2024-01-0{i % 9 + 1},INV\n" for i in range(60))
+    storage.input_path(job_id).write_text(
+        "transaction_id,amount,effective_date,document_type\n" + rows
+    )
+    JobManager(storage)._run_job_sync(job_id)
+    detail = storage.load_job(job_id)
+    assert detail.status == JobStatus.DONE
+    assert detail.report_path is None
+    assert not storage.report_path(job_id).exists()
+
+    resp = TestClient(api_main.app).get(f"/jobs/{job_id}/report")
+    assert resp.status_code == 200
+    assert "sample_selection_streamjob.xlsx" in resp.headers[
+        "content-disposition"
+    ]
+    workbook = load_workbook(io.BytesIO(resp.content))
+    assert workbook.sheetnames == [
+        "Population Summary",
+        "Sample Selected",
+        "Parameters Used",
+    ]
+    assert not storage.report_path(job_id).exists()
+
+    storage.report_inputs_path(job_id).unlink()
+    resp = TestClient(api_main.app).get(f"/jobs/{job_id}/report")
+    assert resp.status_code == 404
+
+
+def test_bundle_streams_job_directory(tmp_path, monkeypatch):
+    """The bundle holds every job file plus a manifest of their digests."""
+    import hashlib
+    import json
+    import zipfile
+
+    from restapi.src.schemas import SamplingParams
+    from restapi.src.storage import JobStorage
+
+    storage = JobStorage(tmp_path)
+    monkeypatch.setattr(api_main, "storage", storage)
+    job_id = "bundlejob"
+    params = SamplingParams(
+        tolerable_misstatement=1000, expected_misstatement=100, assurance_factor=2
+    )
+    storage.create_job_record(job_id, "input.csv", params)
+    client = TestClient(api_main.app)
+    assert client.get(f"/jobs/{job_id}/bundle").status_code == 400
+
+    storage.input_path(job_id).write_text("transaction_id,amount\nA,1\n")
+    storage.report_path(job_id).write_bytes(os.urandom(200_000))
+    (storage.job_dir(job_id) / "runs").mkdir()
+    (storage.job_dir(job_id) / "runs" / f"{job_id}.json").write_text("{}")
+    storage.update_job(job_id, status=JobStatus.DONE)
+
+    resp = client.get(f"/jobs/{job_id}/bundle")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    bundle = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert bundle.testzip() is None
+    manifest = json.loads(bundle.read("manifest.json"))
+    names = [entry["name"] for entry in manifest["files"]]
+    assert names == [
+        "input.csv",
+        "metadata.json",
+        "runs/bundlejob.json",
+        "sample_selection_output.xlsx",
+    ]
+    for entry in manifest["files"]:
+        data = bundle.read(entry["name"])
+        assert hashlib.sha256(data).hexdigest() == entry["sha256"]
+        assert len(data) == entry["size"]
+    xlsx = bundle.getinfo("sample_selection_output.xlsx")
+    assert xlsx.compress_type == zipfile.ZIP_STORED
+    assert bundle.getinfo("input.csv").compress_type == zipfile.ZIP_DEFLATED
+
+    assert client.get("/jobs/nojob/bundle").status_code == 404
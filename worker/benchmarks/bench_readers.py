@@ -0,0 +1,85 @@
+"""Benchmark the fast CSV tokeniser against ``csv.DictReader``.
+
+Run from the repository root::
+
+    python -m worker.benchmarks.bench_readers --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from worker.src.readers import CsvPopulation, iter_csv_rows
+
+HEADER = "transaction_id,amount,effective_date,document_type,description\n"
+DOC_TYPES = ["INV", "CM", "JE", "PAY"]
+
+
+def write_population(path: Path, rows: int, seed: int = 42) -> None:
+    """Write a synthetic, unquoted population CSV.
+
+    Args:
+        path (Path): Destination file.
+        rows (int): Number of data rows to write.
+        seed (int): Random seed for reproducible content.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(HEADER)
+        for i in range(rows):
+            amount = round(rng.uniform(-250000, 250000), 2)
+            f.write(
+                f"T{i},{amount},{rng.randint(1, 28):02d}/"
+                f"{rng.randint(1, 12):02d}/2024,"
+                f"{rng.choice(DOC_TYPES)},Journal line {i % 500}\n"
+            )
+
+
+def _time_dict_reader(path: Path) -> tuple[float, int]:
+    started = time.perf_counter()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        count = sum(1 for _ in csv.DictReader(f))
+    return time.perf_counter() - started, count
+
+
+def _time_fast_reader(path: Path) -> tuple[float, int]:
+    started = time.perf_counter()
+    count = sum(1 for _ in iter_csv_rows(path))
+    return time.perf_counter() - started, count
+
+
+def _time_mapped_scan(path: Path) -> tuple[float, int]:
+    started = time.perf_counter()
+    with CsvPopulation(path) as source:
+        count = sum(1 for _ in source.iter_fields(1))
+    return time.perf_counter() - started, count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "population.csv"
+        write_population(path, args.rows)
+        baseline = min(_time_dict_reader(path)[0] for _ in range(args.repeat))
+        fast = min(_time_fast_reader(path)[0] for _ in range(args.repeat))
+        mapped = min(_time_mapped_scan(path)[0] for _ in range(args.repeat))
+
+    print(f"rows:            {args.rows:,}")
+    print(f"csv.DictReader:  {baseline:.3f}s")
+    print(f"iter_csv_rows:   {fast:.3f}s")
+    print(f"speedup:         {baseline / fast:.2f}x")
+    print(f"mmap amount scan: {mapped:.3f}s ({baseline / mapped:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,328 @@
+"""Benchmark report writers: wall time, peak memory and output size.
+
+Every writer variant runs at every sample size in a fresh process, so the
+peak memory of one case does not hide another's. Results can be saved as
+JSON and compared with a recorded baseline.
+
+Run from the repository root::
+
+    PYTHONPATH=worker/src python -m worker.benchmarks.bench_reporter \\
+        --rows 1000 100000 --output results.json --baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from worker.src import reporter
+from worker.src.models import (
+    CleanedTransaction,
+    DataQualityReport,
+    SampleStatistics,
+    SamplingParameters,
+)
+
+DOC_TYPES = ["INV", "CM", "JE", "PAY"]
+DEFAULT_ROWS = [1_000, 100_000, 1_000_000]
+# Larger sizes run once; their timings are long enough to be stable
+REPEAT_MAX_ROWS = 100_000
+# Slowdown over the baseline, as a fraction, reported as a regression
+DEFAULT_TOLERANCE = 0.2
+BASELINE_PATH = Path(__file__).with_name("reporter_baseline.json")
+
+# name: (description, writer options)
+VARIANTS: dict[str, tuple[str, dict]] = {
+    "per_cell": (
+        "per-cell formats, constant_memory (default writer)",
+        {"fast_writer": False, "constant_memory": True},
+    ),
+    "per_cell_in_memory": (
+        "per-cell formats, all cells held until close",
+        {"fast_writer": False, "constant_memory": False},
+    ),
+    "bulk": (
+        "write_row with column formats, constant_memory (--fast-report)",
+        {"fast_writer": True, "constant_memory": True},
+    ),
+    "bulk_in_memory": (
+        "write_row with column formats, all cells held until close",
+        {"fast_writer": True, "constant_memory": False},
+    ),
+    "buffer": (
+        "render_report into a spooled buffer (API downloads)",
+        {"buffer": True},
+    ),
+    "csv": (
+        "CSV sink, no workbook (--output-format csv)",
+        {"csv": True},
+    ),
+}
+
+
+def build_sample(rows: int, seed: int = 42) -> list[CleanedTransaction]:
+    """Build a synthetic sample of selected transactions.
+
+    Args:
+        rows (int): Number of transactions.
+        seed (int): Random seed for reproducible content.
+
+    Returns:
+        list[CleanedTransaction]: Transactions marked as selected.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    sample = []
+    for i in range(rows):
+        amount = round(rng.uniform(-250000, 250000), 2)
+        sample.append(
+            CleanedTransaction(
+                transaction_id=f"T{i}",
+                amount_signed=amount,
+                amount_abs=abs(amount),
+                effective_date=start + timedelta(days=rng.randint(0, 365)),
+                document_type=rng.choice(DOC_TYPES),
+                description=f"Journal line {i % 500}",
+                balance_category="debit" if amount >= 0 else "credit",
+                source_row_index=i,
+                selection_type="High Value" if i % 10 == 0 else "Random",
+            )
+        )
+    return sample
+
+
+def _report_inputs(
+    rows: int,
+) -> tuple[DataQualityReport, SampleStatistics, SamplingParameters]:
+    quality = DataQualityReport(
+        total_rows_raw=rows,
+        total_rows_cleaned=rows,
+        missing_transaction_id=0,
+        missing_amount=0,
+        missing_effective_date=0,
+        missing_document_type=0,
+        missing_description=0,
+        invalid_amount_format=0,
+        invalid_date_format=0,
+        duplicate_transaction_ids=0,
+        excluded_due_to_amount=0,
+        excluded_due_to_balance=0,
+    )
+    stats = SampleStatistics(
+        population_size=rows * 10,
+        population_balance_abs=1.0e9,
+        sampling_interval=100000.0,
+        high_value_count=rows // 10,
+        random_sample_count=rows - rows // 10,
+        coverage_abs=1.0e8,
+        coverage_percent=10.0,
+    )
+    params = SamplingParameters(
+        tolerable_misstatement=500000.0,
+        expected_misstatement=50000.0,
+        assurance_factor=4.5,
+    )
+    return quality, stats, params
+
+
+def _peak_rss() -> int | None:
+    """Return this process's peak resident set size in bytes, if known."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _write(
+    variant: str, sample: list[CleanedTransaction], out_dir: Path
+) -> int:
+    """Write one report with ``variant`` and return its size in bytes."""
+    options = VARIANTS[variant][1]
+    quality, stats, params = _report_inputs(len(sample))
+    timestamp = datetime.now(timezone.utc)
+    if options.get("buffer"):
+        with reporter.render_report(
+            sample, quality, stats, params, timestamp, "bench"
+        ) as output:
+            return output.seek(0, os.SEEK_END)
+    if options.get("csv"):
+        path = out_dir / "sample.csv"
+        reporter._feed_sinks([reporter.CsvSink(path)], sample)
+        return path.stat().st_size
+    path = out_dir / "sample.xlsx"
+    reporter._write_excel_report(
+        path, sample, quality, stats, params, timestamp, "bench", **options
+    )
+    return path.stat().st_size
+
+
+def measure(rows: int, variant: str, repeat: int) -> dict:
+    """Time one variant at one sample size (run in a fresh process).
+
+    Args:
+        rows (int): Sample size.
+        variant (str): Key of ``VARIANTS``.
+        repeat (int): Runs to take the fastest of.
+
+    Returns:
+        dict: ``seconds`` (fastest run), ``peak_memory_mib`` (growth of
+        the peak RSS over the built sample, ``None`` where unavailable)
+        and ``output_bytes``.
+    """
+    sample = build_sample(rows)
+    baseline = _peak_rss()
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            size = _write(variant, sample, Path(tmp))
+            times.append(time.perf_counter() - started)
+    peak = _peak_rss()
+    return {
+        "rows": rows,
+        "variant": variant,
+        "seconds": round(min(times), 4),
+        "peak_memory_mib": (
+            None
+            if peak is None or baseline is None
+            else round((peak - baseline) / 2**20, 1)
+        ),
+        "output_bytes": size,
+    }
+
+
+def _run_isolated(rows: int, variant: str, repeat: int) -> dict:
+    """Run ``measure`` in its own process; record crashes as errors."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(1, mp_context=context) as pool:
+        try:
+            return pool.submit(measure, rows, variant, repeat).result()
+        except BrokenProcessPool:
+            # Usually the kernel killing an in-memory workbook
+            return {"rows": rows, "variant": variant, "error": "crashed"}
+
+
+def compare(
+    results: list[dict], baseline: list[dict], tolerance: float
+) -> list[str]:
+    """List the cases slower than their baseline by more than ``tolerance``.
+
+    Args:
+        results (list[dict]): Fresh ``measure`` results.
+        baseline (list[dict]): Recorded results.
+        tolerance (float): Allowed slowdown as a fraction.
+
+    Returns:
+        list[str]: One line per regression.
+    """
+    recorded = {(r["rows"], r["variant"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = recorded.get((result["rows"], result["variant"]))
+        if not before or "seconds" not in before or "seconds" not in result:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{result['variant']} at {result['rows']:,} rows: "
+                f"{result['seconds']:.3f}s vs {before['seconds']:.3f}s "
+                f"({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def _print_row(result: dict) -> None:
+    if "error" in result:
+        print(f"{result['rows']:>10,}  {result['variant']:<20} {'error':>9}")
+        return
+    memory = result["peak_memory_mib"]
+    print(
+        f"{result['rows']:>10,}  {result['variant']:<20} "
+        f"{result['seconds']:>8.3f}s "
+        f"{'-' if memory is None else f'{memory:.1f}':>9} MiB "
+        f"{result['output_bytes'] / 2**20:>9.2f} MiB"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument(
+        "--variants",
+        nargs="+",
+        choices=list(VARIANTS),
+        default=list(VARIANTS),
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help=f"Runs per case up to {REPEAT_MAX_ROWS:,} rows (fastest kept)",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        nargs="?",
+        const=BASELINE_PATH,
+        help=(
+            "Compare with recorded results (default: the committed "
+            "reporter_baseline.json); exit 1 on a regression"
+        ),
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    for name in args.variants:
+        print(f"{name:<20} {VARIANTS[name][0]}")
+    print(
+        f"\n{'rows':>10}  {'variant':<20} {'time':>9} {'peak mem':>13} {'output':>13}"
+    )
+    results = []
+    for rows in args.rows:
+        repeat = args.repeat if rows <= REPEAT_MAX_ROWS else 1
+        for name in args.variants:
+            results.append(_run_isolated(rows, name, repeat))
+            _print_row(results[-1])
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "recorded_at_utc": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cpu_count": os.cpu_count(),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
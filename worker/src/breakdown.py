@@ -0,0 +1,167 @@
+"""Population totals grouped by document type, balance category and month."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable
+
+from .cleaner import _clean_string, _parse_date
+from .models import BreakdownGroup, CleanedTransaction, PopulationBreakdown
+
+BREAKDOWN_KEYS = ("document_type", "balance_category", "month")
+# Values tracked per key; later values share OTHER_GROUP
+MAX_BREAKDOWN_GROUPS = 500
+OTHER_GROUP = "(other)"
+BLANK_GROUP = "(blank)"
+
+# Totals list layout: count, amount_abs, high_value_count, sample_count,
+# sample_amount_abs
+_COUNT, _AMOUNT, _HIGH, _SAMPLED, _SAMPLED_AMOUNT = range(5)
+
+
+class BreakdownAccumulator:
+    """Running population totals per key value, kept in plain dicts.
+
+    Memory is bounded: each key tracks at most ``max_groups`` values, and
+    rows whose value is first seen after that count towards
+    ``OTHER_GROUP``. Sample rows land in the same groups as their
+    population rows, so per-group coverage stays consistent.
+    """
+
+    def __init__(
+        self, interval: float, max_groups: int = MAX_BREAKDOWN_GROUPS
+    ) -> None:
+        self.interval = interval
+        self.max_groups = max_groups
+        self._groups: dict[str, dict[str, list[Any]]] = {
+            key: {} for key in BREAKDOWN_KEYS
+        }
+
+    def add(
+        self,
+        document_type: str | None,
+        balance_category: str | None,
+        effective_date: datetime | None,
+        amount_abs: float,
+    ) -> None:
+        """Count one population row.
+
+        Args:
+            document_type (str | None): Cleaned document type.
+            balance_category (str | None): ``debit``, ``credit`` or ``zero``.
+            effective_date (datetime | None): Parsed effective date.
+            amount_abs (float): Absolute amount.
+        """
+        high = amount_abs > self.interval
+        for groups, value in zip(
+            self._groups.values(),
+            (
+                document_type,
+                balance_category,
+                effective_date.strftime("%Y-%m") if effective_date else None,
+            ),
+        ):
+            totals = self._bucket(groups, value or BLANK_GROUP)
+            totals[_COUNT] += 1
+            totals[_AMOUNT] += amount_abs
+            if high:
+                totals[_HIGH] += 1
+
+    def add_raw(
+        self,
+        document_type: Any,
+        effective_date: Any,
+        balance_category: str | None,
+        amount_abs: float,
+    ) -> None:
+        """Count one streamed row from its raw document type and date cells.
+
+        Args:
+            document_type (Any): Raw document type cell.
+            effective_date (Any): Raw date cell (text or ``datetime``).
+            balance_category (str | None): Derived balance category.
+            amount_abs (float): Absolute amount.
+        """
+        self.add(
+            _clean_string(document_type),
+            balance_category,
+            _parse_date(effective_date or "")["value"],
+            amount_abs,
+        )
+
+    def merge(self, other: "BreakdownAccumulator") -> None:
+        """Add another accumulator's totals, e.g. from another file.
+
+        Args:
+            other (BreakdownAccumulator): Totals over other rows.
+        """
+        for key, groups in self._groups.items():
+            for value, extra in other._groups[key].items():
+                totals = self._bucket(groups, value)
+                for field, amount in enumerate(extra):
+                    totals[field] += amount
+
+    def add_sample(self, sample: Iterable[CleanedTransaction]) -> None:
+        """Count the selected rows, for per-group coverage.
+
+        Args:
+            sample (Iterable[CleanedTransaction]): Selected transactions.
+        """
+        for txn in sample:
+            values = (
+                txn.document_type,
+                txn.balance_category,
+                (
+                    txn.effective_date.strftime("%Y-%m")
+                    if txn.effective_date
+                    else None
+                ),
+            )
+            for groups, value in zip(self._groups.values(), values):
+                value = value or BLANK_GROUP
+                totals = groups.get(value) or groups.get(OTHER_GROUP)
+                if totals is None:
+                    totals = self._bucket(groups, value)
+                totals[_SAMPLED] += 1
+                totals[_SAMPLED_AMOUNT] += txn.amount_abs or 0.0
+
+    def result(self) -> PopulationBreakdown:
+        """Return the groups, largest document types first.
+
+        Balance categories and months are in key order, with the blank
+        and other groups last.
+
+        Returns:
+            PopulationBreakdown: Totals per key value.
+        """
+        tables: dict[str, list[BreakdownGroup]] = {}
+        for key, groups in self._groups.items():
+            if key == "document_type":
+                order = sorted(groups, key=lambda v: -groups[v][_AMOUNT])
+            else:
+                order = sorted(groups)
+            # Catch-all groups always go last
+            order.sort(key=lambda v: v in (BLANK_GROUP, OTHER_GROUP))
+            tables[key] = [
+                BreakdownGroup(
+                    key=value,
+                    count=groups[value][_COUNT],
+                    amount_abs=groups[value][_AMOUNT],
+                    high_value_count=groups[value][_HIGH],
+                    sample_count=groups[value][_SAMPLED],
+                    sample_amount_abs=groups[value][_SAMPLED_AMOUNT],
+                )
+                for value in order
+            ]
+        return PopulationBreakdown(max_groups=self.max_groups, **tables)
+
+    def _bucket(self, groups: dict[str, list[Any]], value: str) -> list[Any]:
+        """Return the totals for ``value``, or the other group when full."""
+        totals = groups.get(value)
+        if totals is None:
+            if len(groups) >= self.max_groups:
+                value = OTHER_GROUP
+                totals = groups.get(value)
+            if totals is None:
+                totals = groups[value] = [0, 0.0, 0, 0, 0.0]
+        return totals
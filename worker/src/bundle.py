@@ -0,0 +1,155 @@
+"""ZIP bundles of run artefacts, streamed with a content-hash manifest."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .logging_setup import get_logger
+from .models import EventCode
+
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = ".zip"
+MANIFEST_NAME = "manifest.json"
+# Bytes read from a member, and held before a chunk is handed on
+BUNDLE_CHUNK_BYTES = 1 << 16
+# Already compressed formats; deflating them again only costs time
+STORED_SUFFIXES = frozenset({".xlsx", ".zip", ".gz", ".parquet", ".pq"})
+
+log = get_logger("bundle")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable target collecting what ``ZipFile`` writes.
+
+    ``ZipFile`` cannot seek back into it, so each member's sizes and CRC
+    follow its data in a data descriptor and nothing is rewritten.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self.size += len(chunk)
+        return len(chunk)
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
+
+def bundle_members(root: Path) -> list[tuple[Path, str]]:
+    """List every file under a directory with its name in the bundle.
+
+    Args:
+        root (Path): Run or job directory.
+
+    Returns:
+        list[tuple[Path, str]]: Files and their ``/``-separated names
+        relative to ``root``, sorted by name.
+    """
+    return sorted(
+        (
+            (path, path.relative_to(root).as_posix())
+            for path in root.rglob("*")
+            if path.is_file()
+        ),
+        key=lambda member: member[1],
+    )
+
+
+def iter_bundle(
+    members: Iterable[tuple[Path, str]],
+    chunk_bytes: int = BUNDLE_CHUNK_BYTES,
+) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``members`` as it is built.
+
+    Each member is read once in ``chunk_bytes`` blocks, so memory use does
+    not depend on the file sizes. Already compressed files (see
+    ``STORED_SUFFIXES``) are stored as they are; the rest are deflated.
+    The last member, ``manifest.json``, lists every file with its size and
+    SHA-256 digest.
+
+    Args:
+        members (Iterable[tuple[Path, str]]): Files and their names in the
+            archive, e.g. from ``bundle_members``.
+        chunk_bytes (int): Read size and the minimum size of each chunk
+            yielded before the end of the archive.
+
+    Yields:
+        bytes: Consecutive parts of the archive.
+    """
+    sink = _ChunkSink()
+    entries = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path, name in members:
+            info = zipfile.ZipInfo.from_file(path, name)
+            stored = path.suffix.lower() in STORED_SUFFIXES
+            info.compress_type = (
+                zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            )
+            digest = hashlib.sha256()
+            with path.open("rb") as source, zf.open(info, "w") as target:
+                while block := source.read(chunk_bytes):
+                    digest.update(block)
+                    target.write(block)
+                    if sink.size >= chunk_bytes:
+                        yield sink.drain()
+            entries.append(
+                {
+                    "name": name,
+                    "size": info.file_size,
+                    "sha256": digest.hexdigest(),
+                    "compression": "stored" if stored else "deflated",
+                }
+            )
+        manifest = {
+            "version": BUNDLE_VERSION,
+            "created_at_utc": datetime.now(timezone.utc).isoformat(),
+            "files": entries,
+        }
+        zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    yield sink.drain()
+
+
+def write_bundle(
+    path: Path,
+    members: Iterable[tuple[Path, str]],
+) -> Path:
+    """Write a bundle of ``members`` to ``path``, atomically.
+
+    Args:
+        path (Path): Destination ZIP file.
+        members (Iterable[tuple[Path, str]]): Files and their names in the
+            archive.
+
+    Returns:
+        Path: The written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    with partial.open("wb") as handle:
+        for chunk in iter_bundle(members):
+            handle.write(chunk)
+    os.replace(partial, path)
+    log.info(
+        EventCode.BUNDLE_WRITTEN.value,
+        path=str(path),
+        bytes=path.stat().st_size,
+    )
+    return path
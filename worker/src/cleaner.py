@@ -4,14 +4,38 @@ from __future__ import annotations
 
 import csv
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal
+from typing import IO, Any, Iterable, Iterator, Literal, Sequence
 
 from .logging_setup import get_logger
-from .models import CleanedTransaction, DataQualityReport, EventCode
+from .models import (
+    CleanedTransaction,
+    DataQualityReport,
+    EventCode,
+    SamplingParameters,
+)
+from .readers import is_columnar, is_excel, is_sqlite, iter_csv_rows
 
 log = get_logger("cleaner")
 
+DATE_CACHE_SIZE = 1 << 16
+
+REJECTED_FILENAME = "rejected_rows.csv"
+REJECTED_BUFFER_BYTES = 1 << 20
+
+INTERN_COLUMNS = ("transaction_id", "document_type", "description")
+INTERN_PROBE_ROWS = 4096
+INTERN_MAX_RATIO = 0.5
+
+RejectReason = Literal["missing_amount", "invalid_amount", "validation_failed"]
+ScopeReason = Literal["amount_band", "document_type", "date"]
+# ``_parse_amount`` status of an unusable amount -> rejection reason
+AMOUNT_REJECT_REASONS: dict[str, RejectReason] = {
+    "missing": "missing_amount",
+    "invalid": "invalid_amount",
+}
+
 DATE_FORMATS = [
     "%d/%m/%Y %H:%M",
     "%m/%d/%Y %H:%M",
@@ -37,11 +61,52 @@ COLUMN_ALIASES = {
 }
 
 
-def load_raw_data(file_path: Path) -> list[dict[str, str]]:
+def iter_raw_data(
+    file_path: Path, sql: str | None = None, sheet: str | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield raw population rows one at a time.
+
+    Parquet and Arrow IPC/Feather files are read through pyarrow, SQLite
+    databases through a batched cursor and Excel workbooks through
+    openpyxl's read-only mode; all yield rows of the same shape.
+
+    Args:
+        file_path (Path): Absolute or relative path to the population file.
+        sql (str | None): Table name or query for SQLite inputs; ``None``
+            reads the only table.
+        sheet (str | None): Worksheet name or 1-based position for Excel
+            inputs; ``None`` reads the active sheet.
+
+    Returns:
+        Iterator[dict[str, Any]]: Raw rows keyed by column header.
+
+    Raises:
+        FileNotFoundError: If the provided file path does not exist.
+        csv.Error: If the CSV reader encounters malformed input.
+    """
+    if is_columnar(file_path):
+        from .columnar import iter_columnar_rows
+
+        return iter_columnar_rows(file_path)
+    if is_sqlite(file_path):
+        from .sqlite_source import iter_sqlite_rows
+
+        return iter_sqlite_rows(file_path, sql)
+    if is_excel(file_path):
+        from .excel_source import iter_excel_rows
+
+        return iter_excel_rows(file_path, sheet)
+    return iter_csv_rows(file_path)
+
+
+def load_raw_data(
+    file_path: Path, sql: str | None = None
+) -> list[dict[str, str]]:
     """Load raw CSV data into a list of dictionaries.
 
     Args:
-        file_path (Path): Absolute or relative path to the population CSV file.
+        file_path (Path): Absolute or relative path to the population file.
+        sql (str | None): Table name or query for SQLite inputs.
 
     Returns:
         list[dict[str, str]]: Raw CSV rows keyed by column header.
@@ -50,30 +115,70 @@ def load_raw_data(file_path: Path) -> list[dict[str, str]]:
         FileNotFoundError: If the provided file path does not exist.
         csv.Error: If the CSV reader encounters malformed input.
     """
-    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    rows = list(iter_raw_data(file_path, sql))
     log.info(EventCode.RAW_LOADED.value, rows=len(rows), path=str(file_path))
     return rows
 
 
 def clean_data(
-    input_path: Path,
+    input_path: Path | Sequence[Path],
+    rejected_path: Path | None = None,
+    sql: str | None = None,
+    sheet: str | None = None,
+    params: SamplingParameters | None = None,
 ) -> tuple[list[CleanedTransaction], DataQualityReport]:
     """Clean population data and produce a quality report.
 
+    Raw rows are streamed rather than loaded up front, so only cleaned
+    transactions (with low-cardinality text interned) stay resident.
+
+    Several files are cleaned as one population: headers are aliased per
+    file, row indices restart in each file and every transaction records
+    its ``source_file``.
+
     Args:
-        input_path (Path): Path to the population CSV file.
+        input_path (Path | Sequence[Path]): Population file, or files
+            making up one population.
+        rejected_path (Path | None): Optional CSV receiving every rejected
+            row with its index and reason code. Created on first rejection;
+            a file left by an earlier run is removed.
+        sql (str | None): Table name or query for SQLite inputs.
+        sheet (str | None): Worksheet name or position for Excel inputs.
+        params (SamplingParameters | None): When given, rows outside its
+            date range, document types or amount band are dropped as they
+            are read and counted in the report.
 
     Returns:
         tuple[list[CleanedTransaction], DataQualityReport]: Cleaned transactions and associated quality metrics.
     """
-    raw_rows = load_raw_data(input_path)
+    paths = [input_path] if isinstance(input_path, Path) else input_path
+    multi_file = len(paths) > 1
     metrics = _initialize_metrics()
-    cleaned = _process_rows(raw_rows, metrics)
+    pool = _StringPool()
+    scope = PopulationScope.from_params(params)
+    cleaned: list[CleanedTransaction] = []
+    with _RejectedRowWriter(rejected_path, multi_file) as rejected:
+        for path in paths:
+            cleaned.extend(
+                _process_rows(
+                    iter_raw_data(path, sql, sheet),
+                    metrics,
+                    rejected,
+                    pool,
+                    source_file=str(path) if multi_file else None,
+                    scope=scope,
+                )
+            )
+    raw_count = len(cleaned) + rejected.total + _scope_total(metrics)
+    log.info(
+        EventCode.RAW_LOADED.value,
+        rows=raw_count,
+        path=", ".join(str(path) for path in paths),
+    )
+    rejected.log_summary()
     duplicate_count = _count_duplicates(cleaned)
     report = _build_quality_report(
-        len(raw_rows),
+        raw_count,
         len(cleaned),
         metrics,
         duplicate_count,
@@ -81,9 +186,10 @@ def clean_data(
 
     log.info(
         EventCode.CLEANING_DONE.value,
-        raw_rows=len(raw_rows),
+        raw_rows=raw_count,
         cleaned_rows=len(cleaned),
         duplicates=duplicate_count,
+        interned_columns=pool.columns,
     )
 
     return cleaned, report
@@ -103,17 +209,285 @@ def _initialize_metrics() -> dict[str, int]:
         "missing_date": 0,
         "missing_doc_type": 0,
         "missing_desc": 0,
+        "validation_failed": 0,
+        "excluded_date": 0,
+        "excluded_document_type": 0,
+        "excluded_amount_band": 0,
     }
 
 
+def _scope_total(metrics: dict[str, int]) -> int:
+    """Return the number of rows dropped by population scope filters."""
+    return (
+        metrics["excluded_date"]
+        + metrics["excluded_document_type"]
+        + metrics["excluded_amount_band"]
+    )
+
+
+class _RejectedRowWriter:
+    """Buffered CSV sink for rows rejected during cleaning.
+
+    Rows are written as they are rejected, so memory use does not grow
+    with the number of rejections. Per-reason counts are kept for a
+    single aggregated log event instead of one warning per row.
+
+    For multi-file populations a ``source_file`` column is added, and rows
+    whose headers differ from the first rejected row are matched to its
+    columns through the canonical aliases.
+
+    A file left by an earlier run is removed up front: the file is only
+    created on the first rejection, so it would otherwise outlive a run
+    that rejected nothing.
+    """
+
+    def __init__(self, path: Path | None, multi_file: bool = False) -> None:
+        if path is not None:
+            path.unlink(missing_ok=True)
+        self.path = path
+        self.multi_file = multi_file
+        self.counts: dict[str, int] = {}
+        self._handle: IO[str] | None = None
+        self._writer: Any = None
+        self._columns: list[str] = []
+        self._canonical: list[str] = []
+
+    def __enter__(self) -> "_RejectedRowWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(
+        self,
+        idx: int,
+        raw_row: dict[str, str],
+        reason: RejectReason,
+        source_file: str | None = None,
+    ) -> None:
+        """Record one rejected row.
+
+        Args:
+            idx (int): Row index within the population file.
+            raw_row (dict[str, str]): Original row values keyed by header.
+            reason (RejectReason): Reason code for the rejection.
+            source_file (str | None): Population file the row came from.
+        """
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._open(raw_row)
+        assert self._writer is not None
+        if all(key in raw_row for key in self._columns):
+            values = [raw_row.get(key) for key in self._columns]
+        else:
+            normalized = _normalize_row(raw_row)
+            values = [normalized.get(key) for key in self._canonical]
+        prefix = [source_file] if self.multi_file else []
+        self._writer.writerow([*prefix, idx, reason, *values])
+
+    @property
+    def total(self) -> int:
+        """Number of rows rejected so far."""
+        return sum(self.counts.values())
+
+    def close(self) -> None:
+        """Flush and close the underlying file, if one was opened."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def log_summary(self) -> None:
+        """Emit one aggregated event describing all rejections."""
+        if not self.counts:
+            return
+        log.warning(
+            EventCode.ROWS_REJECTED.value,
+            total=self.total,
+            reasons=dict(self.counts),
+            path=str(self.path) if self._columns else None,
+        )
+
+    def _open(self, raw_row: dict[str, str]) -> None:
+        """Create the quarantine file using the first row's headers."""
+        assert self.path is not None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._columns = [key for key in raw_row if key is not None]
+        self._canonical = [
+            COLUMN_ALIASES.get(name, name)
+            for name in map(_canonical_name, self._columns)
+        ]
+        self._handle = open(
+            self.path,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=REJECTED_BUFFER_BYTES,
+        )
+        self._writer = csv.writer(self._handle)
+        prefix = ["source_file"] if self.multi_file else []
+        self._writer.writerow([*prefix, "row_index", "reason", *self._columns])
+
+
+class _StringPool:
+    """Per-run intern table for repetitive text columns.
+
+    Every candidate column starts out interned: equal values share the
+    first instance seen, so millions of transactions reference a handful
+    of ``str`` objects. Cardinality is measured on the fly; at each
+    checkpoint (``INTERN_PROBE_ROWS`` values, then every doubling) a column
+    whose distinct ratio exceeds ``INTERN_MAX_RATIO`` has its table dropped
+    and is passed through untouched from then on.
+    """
+
+    def __init__(self, columns: tuple[str, ...] = INTERN_COLUMNS) -> None:
+        self._tables: dict[str, dict[str, str]] = {c: {} for c in columns}
+        self._seen = dict.fromkeys(columns, 0)
+        self._checkpoint = dict.fromkeys(columns, INTERN_PROBE_ROWS)
+
+    @property
+    def columns(self) -> list[str]:
+        """Columns still interned (judged low cardinality so far)."""
+        return list(self._tables)
+
+    def intern(self, column: str, value: str | None) -> str | None:
+        """Return the shared instance of ``value`` for ``column``.
+
+        Args:
+            column (str): Canonical column name.
+            value (str | None): Cleaned cell value.
+
+        Returns:
+            str | None: An equal string, shared across rows when the
+            column is low cardinality.
+        """
+        table = self._tables.get(column)
+        if table is None or value is None:
+            return value
+        shared = table.setdefault(value, value)
+        seen = self._seen[column] + 1
+        self._seen[column] = seen
+        if seen == self._checkpoint[column]:
+            if len(table) > seen * INTERN_MAX_RATIO:
+                del self._tables[column]
+            else:
+                self._checkpoint[column] = seen * 2
+        return shared
+
+
+class PopulationScope:
+    """Date range, document type and amount band filters for one run.
+
+    Checks run cheapest first: the absolute amount band (the amount is
+    already parsed), then document type (a set lookup on trimmed,
+    upper-cased text), then the date range (a cached parse). Rows without
+    a valid date are outside any date range. Both the cleaner and the
+    streaming sources run the checks right after the amount parse, and
+    decode the other fields only when :attr:`needs_fields` is set.
+    """
+
+    def __init__(self, params: SamplingParameters) -> None:
+        self.amount_min = params.amount_min
+        self.amount_max = params.amount_max
+        self.include_types = frozenset(
+            t.strip().upper() for t in params.include_document_types
+        )
+        self.exclude_types = frozenset(
+            t.strip().upper() for t in params.exclude_document_types
+        )
+        self.date_from = params.date_from
+        self.date_to = params.date_to
+        self.needs_fields = bool(
+            self.include_types
+            or self.exclude_types
+            or self.date_from
+            or self.date_to
+        )
+
+    @classmethod
+    def from_params(
+        cls, params: SamplingParameters | None
+    ) -> "PopulationScope | None":
+        """Build the scope for ``params``, or ``None`` when unfiltered.
+
+        Args:
+            params (SamplingParameters | None): Run parameters.
+
+        Returns:
+            PopulationScope | None: Scope when any filter is set.
+        """
+        if params is None or not params.has_scope_filters():
+            return None
+        return cls(params)
+
+    def amount_reason(self, amount: float) -> ScopeReason | None:
+        """Return ``"amount_band"`` when the amount is outside the band.
+
+        Args:
+            amount (float): Parsed signed amount.
+
+        Returns:
+            ScopeReason | None: ``"amount_band"`` or ``None``.
+        """
+        abs_value = abs(amount)
+        if self.amount_min is not None and abs_value < self.amount_min:
+            return "amount_band"
+        if self.amount_max is not None and abs_value > self.amount_max:
+            return "amount_band"
+        return None
+
+    def field_reason(
+        self, document_type: Any, effective_date: Any
+    ) -> ScopeReason | None:
+        """Return why a row's document type or date is out of scope.
+
+        Only called when :attr:`needs_fields` is set, after the amount
+        band passed.
+
+        Args:
+            document_type (Any): Raw document type cell.
+            effective_date (Any): Raw date cell (text or ``datetime``).
+
+        Returns:
+            ScopeReason | None: First failing check, ``None`` when in scope.
+        """
+        if self.include_types or self.exclude_types:
+            key = (_clean_string(document_type) or "").upper()
+            if self.include_types and key not in self.include_types:
+                return "document_type"
+            if key in self.exclude_types:
+                return "document_type"
+        if self.date_from or self.date_to:
+            parsed = _parse_date(effective_date or "")["value"]
+            if parsed is None:
+                return "date"
+            day = parsed.date()
+            if self.date_from and day < self.date_from:
+                return "date"
+            if self.date_to and day > self.date_to:
+                return "date"
+        return None
+
+
 def _process_rows(
-    raw_rows: list[dict[str, str]], metrics: dict[str, int]
+    raw_rows: Iterable[dict[str, str]],
+    metrics: dict[str, int],
+    rejected: _RejectedRowWriter | None = None,
+    pool: _StringPool | None = None,
+    source_file: str | None = None,
+    scope: PopulationScope | None = None,
 ) -> list[CleanedTransaction]:
     """Process raw rows into cleaned transactions.
 
     Args:
-        raw_rows (list[dict[str, str]]): Raw CSV dictionaries.
+        raw_rows (Iterable[dict[str, str]]): Raw CSV dictionaries.
         metrics (dict[str, int]): Mutable metrics accumulator.
+        rejected (_RejectedRowWriter | None): Optional sink for rejected rows.
+        pool (_StringPool | None): Optional intern table shared by all rows.
+        source_file (str | None): File label recorded on each transaction
+            of a multi-file population.
+        scope (PopulationScope | None): Optional population filters.
 
     Returns:
         list[CleanedTransaction]: Validated transactions ready for sampling.
@@ -121,9 +495,13 @@ def _process_rows(
     cleaned: list[CleanedTransaction] = []
 
     for idx, raw_row in enumerate(raw_rows):
-        transaction = _process_single_row(idx, raw_row, metrics)
+        transaction, reason = _process_single_row(
+            idx, raw_row, metrics, pool, source_file, scope
+        )
         if transaction:
             cleaned.append(transaction)
+        elif rejected is not None and reason is not None:
+            rejected.write(idx, raw_row, reason, source_file)
 
     return cleaned
 
@@ -132,39 +510,82 @@ def _process_single_row(
     idx: int,
     raw_row: dict[str, str],
     metrics: dict[str, int],
-) -> CleanedTransaction | None:
+    pool: _StringPool | None = None,
+    source_file: str | None = None,
+    scope: PopulationScope | None = None,
+) -> tuple[CleanedTransaction | None, RejectReason | None]:
     """Process a single raw row into a cleaned transaction.
 
+    Rows outside ``scope`` are dropped before the remaining fields are
+    parsed; they are counted but not rejected.
+
     Args:
         idx (int): Row index within the population file.
         raw_row (dict[str, str]): Raw CSV row dictionary.
         metrics (dict[str, int]): Mutable metrics accumulator.
+        pool (_StringPool | None): Optional intern table for text columns.
+        source_file (str | None): File label for multi-file populations.
+        scope (PopulationScope | None): Optional population filters.
 
     Returns:
-        CleanedTransaction | None: Cleaned transaction when valid, otherwise ``None``.
+        tuple[CleanedTransaction | None, RejectReason | None]: Cleaned transaction when valid, otherwise ``None`` with the rejection reason (``None`` for rows outside the scope).
     """
     normalized = _normalize_row(raw_row)
-    parsed_data = _parse_row_fields(normalized)
+    amount_result = _parse_amount(normalized.get("amount", ""))
+    if scope is not None and amount_result["value"] is not None:
+        excluded = scope.amount_reason(amount_result["value"])
+        if excluded is None and scope.needs_fields:
+            excluded = scope.field_reason(
+                normalized.get("document_type"),
+                normalized.get("effective_date"),
+            )
+        if excluded is not None:
+            metrics[f"excluded_{excluded}"] += 1
+            return None, None
+    parsed_data = _parse_row_fields(normalized, amount_result)
     _update_metrics(parsed_data, metrics)
 
-    if parsed_data["amount_result"]["value"] is None:
-        return None
+    if amount_result["value"] is None:
+        return None, AMOUNT_REJECT_REASONS[amount_result["status"]]
 
-    return _create_transaction(idx, parsed_data)
+    if pool is not None:
+        parsed_data["txn_id"] = pool.intern(
+            "transaction_id", parsed_data["txn_id"]
+        )
+        parsed_data["doc_type"] = pool.intern(
+            "document_type", parsed_data["doc_type"]
+        )
+        parsed_data["desc"] = pool.intern("description", parsed_data["desc"])
 
+    transaction = _create_transaction(idx, parsed_data, source_file)
+    if transaction is None:
+        metrics["validation_failed"] += 1
+        return None, "validation_failed"
+    return transaction, None
 
-def _parse_row_fields(normalized: dict[str, str]) -> dict[str, Any]:
+
+def _parse_row_fields(
+    normalized: dict[str, str], amount_result: dict[str, Any] | None = None
+) -> dict[str, Any]:
     """Parse and validate each field from a normalized row.
 
+    Every row's date and text fields are parsed here, unlike in the
+    streaming passes, which defer them to selected rows: the quality
+    report counts missing and invalid values across the whole population.
+
     Args:
         normalized (dict[str, str]): Row dictionary keyed by canonical column names.
+        amount_result (dict[str, Any] | None): Amount already parsed by the
+            cheap first stage, if any.
 
     Returns:
         dict[str, Any]: Parsed values along with validation metadata.
     """
+    if amount_result is None:
+        amount_result = _parse_amount(normalized.get("amount", ""))
     return {
         "txn_id": _clean_string(normalized.get("transaction_id")),
-        "amount_result": _parse_amount(normalized.get("amount", "")),
+        "amount_result": amount_result,
         "date_result": _parse_date(normalized.get("effective_date", "")),
         "doc_type": _clean_string(normalized.get("document_type")),
         "desc": _clean_string(normalized.get("description")),
@@ -197,13 +618,16 @@ def _update_metrics(
 
 
 def _create_transaction(
-    idx: int, parsed_data: dict[str, Any]
+    idx: int,
+    parsed_data: dict[str, Any],
+    source_file: str | None = None,
 ) -> CleanedTransaction | None:
     """Create a ``CleanedTransaction`` from parsed data.
 
     Args:
         idx (int): Row index within the CSV file.
         parsed_data (dict[str, Any]): Parsed values for the row.
+        source_file (str | None): File label for multi-file populations.
 
     Returns:
         CleanedTransaction | None: Transaction when valid, otherwise ``None`` if schema validation fails.
@@ -221,9 +645,9 @@ def _create_transaction(
             description=parsed_data["desc"],
             balance_category=balance_cat,
             source_row_index=idx,
+            source_file=source_file,
         )
-    except Exception as e:
-        log.warning("VALIDATION_FAILED", row=idx, error=str(e))
+    except ValueError:
         return None
 
 
@@ -265,6 +689,24 @@ def _normalize_row(row: dict[str, str]) -> dict[str, str]:
     return normalized
 
 
+def _resolve_columns(header: list[str]) -> dict[str, int]:
+    """Map canonical column names to their positions in a header.
+
+    Later duplicates win, matching ``_normalize_row``.
+
+    Args:
+        header (list[str]): Raw column headers in file order.
+
+    Returns:
+        dict[str, int]: Canonical column name to header position.
+    """
+    columns = {}
+    for position, key in enumerate(header):
+        canonical = _canonical_name(key)
+        columns[COLUMN_ALIASES.get(canonical, canonical)] = position
+    return columns
+
+
 def _canonical_name(value: str) -> str:
     """Convert arbitrary header text to snake-like form.
 
@@ -316,26 +758,41 @@ def _parse_amount(value: str) -> dict[str, Any]:
         return {"value": None, "status": "invalid"}
 
 
-def _parse_date(value: str) -> dict[str, Any]:
+def _parse_date(value: str | datetime) -> dict[str, Any]:
     """Parse date using ordered formats.
 
     Args:
-        value (str): Source date string.
+        value (str | datetime): Source date string, or an already typed
+            value from a columnar input.
 
     Returns:
         dict[str, Any]: Parsed datetime and validity flag.
     """
+    if isinstance(value, datetime):
+        return {"value": value, "valid": True}
     if not value or not value.strip():
         return {"value": None, "valid": False}
 
+    dt = _parse_date_text(value.strip())
+    return {"value": dt, "valid": dt is not None}
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_text(text: str) -> datetime | None:
+    """Parse stripped date text, memoised because ledger dates repeat.
+
+    Args:
+        text (str): Non-empty, stripped date string.
+
+    Returns:
+        datetime | None: Parsed datetime, or ``None`` when no format fits.
+    """
     for fmt in DATE_FORMATS:
         try:
-            dt = datetime.strptime(value.strip(), fmt)
-            return {"value": dt, "valid": True}
+            return datetime.strptime(text, fmt)
         except ValueError:
             continue
-
-    return {"value": None, "valid": False}
+    return None
 
 
 def _derive_balance(
@@ -400,6 +857,10 @@ def _build_quality_report(
         excluded_due_to_amount=excluded,
         excluded_due_to_balance=balance_filtered,
         excluded_zero_amounts=zero_filtered,
+        excluded_by_date=metrics.get("excluded_date", 0),
+        excluded_by_document_type=metrics.get("excluded_document_type", 0),
+        excluded_by_amount_band=metrics.get("excluded_amount_band", 0),
+        validation_failed=metrics.get("validation_failed", 0),
         notes=notes,
     )
 
@@ -0,0 +1,215 @@
+"""Columnar (Parquet / Arrow IPC) population input with projection pushdown."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .cleaner import _parse_amount, _resolve_columns
+from .readers import _to_text
+
+DEFAULT_BATCH_ROWS = 65_536
+PARQUET_SUFFIXES = frozenset({".parquet", ".pq"})
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow lazily so CSV-only installs do not need it.
+
+    Returns:
+        Any: The ``pyarrow`` module.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "Parquet/Arrow input requires pyarrow (pip install pyarrow)"
+        ) from exc
+    return pyarrow
+
+
+class ColumnarPopulation:
+    """Batch reader over a Parquet or Arrow IPC population file.
+
+    Columns are resolved through ``COLUMN_ALIASES`` once, so callers read
+    by canonical name while only the requested columns are decoded.
+    """
+
+    def __init__(self, path: Path, batch_rows: int = DEFAULT_BATCH_ROWS):
+        self._pa = _import_pyarrow()
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self._parquet = None
+        self._ipc = None
+        self._source = None
+        if self.path.suffix.lower() in PARQUET_SUFFIXES:
+            self._parquet = self._pa.parquet.ParquetFile(str(self.path))
+            schema = self._parquet.schema_arrow
+            metadata = self._parquet.metadata
+            self._group_rows = [
+                metadata.row_group(i).num_rows
+                for i in range(metadata.num_row_groups)
+            ]
+        else:
+            self._source = self._pa.memory_map(str(self.path), "r")
+            self._ipc = self._pa.ipc.open_file(self._source)
+            schema = self._ipc.schema
+            self._group_rows = [
+                self._ipc.get_batch(i).num_rows
+                for i in range(self._ipc.num_record_batches)
+            ]
+        self.header = list(schema.names)
+        self.columns = {
+            canonical: self.header[position]
+            for canonical, position in _resolve_columns(self.header).items()
+        }
+        self.num_rows = sum(self._group_rows)
+
+    def __enter__(self) -> "ColumnarPopulation":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying file handle or memory map."""
+        if self._parquet is not None:
+            self._parquet.close()
+        self._ipc = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def iter_amounts(self) -> Iterator[float | None]:
+        """Yield parsed signed amounts in row order, reading one column.
+
+        Returns:
+            Iterator[float | None]: Amount per row, ``None`` when missing
+            or invalid.
+        """
+        name = self.columns.get("amount")
+        if name is None:
+            for _ in range(self.num_rows):
+                yield None
+            return
+        for column in self._iter_column(name):
+            pa_type = column.type
+            values = column.to_pylist()
+            if self._pa.types.is_integer(
+                pa_type
+            ) or self._pa.types.is_floating(pa_type):
+                for value in values:
+                    yield None if value is None else float(value)
+            else:
+                for value in values:
+                    yield _parse_amount(_to_text(value))["value"]
+
+    def iter_values(self, field: str) -> Iterator[Any]:
+        """Yield one canonical column's cells in row order, reading it alone.
+
+        Args:
+            field (str): Canonical column name.
+
+        Returns:
+            Iterator[Any]: Cells converted like :meth:`iter_rows` values,
+            ``""`` for every row when the column is absent.
+        """
+        name = self.columns.get(field)
+        if name is None:
+            for _ in range(self.num_rows):
+                yield ""
+            return
+        for column in self._iter_column(name):
+            for value in column.to_pylist():
+                yield _to_text(value)
+
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        """Yield every row keyed by its physical column name.
+
+        Returns:
+            Iterator[dict[str, Any]]: Rows shaped like ``csv.DictReader``
+            output, with dates passed through as ``datetime``.
+        """
+        for batch in self._iter_batches(None):
+            for row in batch.to_pylist():
+                yield {key: _to_text(value) for key, value in row.items()}
+
+    def take_rows(self, indices: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Fetch full rows for selected indices only.
+
+        Args:
+            indices (Iterable[int]): Zero-based population row indices.
+
+        Returns:
+            dict[int, dict[str, Any]]: Rows keyed by index, with columns
+            keyed by canonical name.
+        """
+        wanted = sorted(set(indices))
+        rows: dict[int, dict[str, Any]] = {}
+        if not wanted:
+            return rows
+        canonical_of = {name: key for key, name in self.columns.items()}
+        start = 0
+        cursor = 0
+        for group, group_rows in enumerate(self._group_rows):
+            end = start + group_rows
+            local = []
+            while cursor < len(wanted) and wanted[cursor] < end:
+                local.append(wanted[cursor] - start)
+                cursor += 1
+            if local:
+                table = self._read_group(group).take(local)
+                for offset, row in zip(local, table.to_pylist()):
+                    rows[start + offset] = {
+                        canonical_of.get(key, key): _to_text(value)
+                        for key, value in row.items()
+                    }
+            if cursor == len(wanted):
+                break
+            start = end
+        return rows
+
+    def _iter_column(self, name: str) -> Iterator[Any]:
+        """Yield one column of each record batch."""
+        for batch in self._iter_batches([name]):
+            yield batch.column(0)
+
+    def _iter_batches(self, columns: list[str] | None) -> Iterator[Any]:
+        """Yield record batches, projected to ``columns`` when given."""
+        if self._parquet is not None:
+            yield from self._parquet.iter_batches(
+                batch_size=self.batch_rows, columns=columns
+            )
+            return
+        ipc = self._ipc
+        assert ipc is not None
+        for i in range(ipc.num_record_batches):
+            batch = ipc.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            yield batch
+
+    def _read_group(self, group: int) -> Any:
+        """Read a whole row group / record batch as a table."""
+        if self._parquet is not None:
+            return self._parquet.read_row_group(group)
+        assert self._ipc is not None
+        batch = self._ipc.get_batch(group)
+        return self._pa.Table.from_batches([batch])
+
+
+def iter_columnar_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield every row of a columnar population file.
+
+    Args:
+        path (Path): Parquet or Arrow IPC/Feather file path.
+
+    Returns:
+        Iterator[dict[str, Any]]: Rows keyed by physical column name.
+    """
+    with ColumnarPopulation(path) as source:
+        yield from source.iter_rows()
@@ -0,0 +1,158 @@
+"""Streaming Excel (``.xlsx``) population input."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Generator, Iterator
+
+from .cleaner import _parse_amount, _resolve_columns
+from .readers import RowSpool, _to_text
+
+
+def _open_sheet(path: Path, sheet: str | None) -> tuple[Any, Any]:
+    """Open a workbook in streaming read-only mode and pick a sheet.
+
+    Args:
+        path (Path): Workbook path.
+        sheet (str | None): Sheet name, or 1-based position; ``None``
+            selects the active sheet.
+
+    Returns:
+        tuple[Any, Any]: Workbook and worksheet.
+
+    Raises:
+        ValueError: If the requested sheet does not exist.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    if sheet is None:
+        return workbook, workbook.active
+    if sheet in workbook.sheetnames:
+        return workbook, workbook[sheet]
+    if sheet.isdigit() and 1 <= int(sheet) <= len(workbook.sheetnames):
+        return workbook, workbook.worksheets[int(sheet) - 1]
+    workbook.close()
+    raise ValueError(
+        f"Sheet {sheet!r} not found in {path}; "
+        f"available: {workbook.sheetnames}"
+    )
+
+
+def iter_excel_records(
+    path: Path, sheet: str | None = None
+) -> Generator[list[Any], None, None]:
+    """Yield worksheet rows as lists, header first, skipping blank rows.
+
+    The sheet is streamed with openpyxl's ``read_only`` mode, so memory
+    use does not grow with the number of rows. Cells are converted like
+    other typed sources: dates stay ``datetime``, everything else is text.
+
+    Args:
+        path (Path): Workbook path.
+        sheet (str | None): Sheet name or 1-based position.
+
+    Returns:
+        Generator[list[Any], None, None]: Header row, then one list per
+        data row.
+    """
+    workbook, worksheet = _open_sheet(path, sheet)
+    try:
+        for values in worksheet.iter_rows(values_only=True):
+            if all(value is None or value == "" for value in values):
+                continue
+            yield [_to_text(value) for value in values]
+    finally:
+        workbook.close()
+
+
+def iter_excel_rows(
+    path: Path, sheet: str | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield every row of a worksheet keyed by header.
+
+    Args:
+        path (Path): Workbook path.
+        sheet (str | None): Sheet name or 1-based position.
+
+    Returns:
+        Iterator[dict[str, Any]]: Rows shaped like ``csv.DictReader``
+        output (trailing empty cells read as ``""``).
+    """
+    records = iter_excel_records(path, sheet)
+    header = next(records, None)
+    if header is None:
+        return
+    width = len(header)
+    for record in records:
+        if len(record) < width:
+            record = record + [""] * (width - len(record))
+        yield dict(zip(header, record))
+
+
+class ExcelPopulation:
+    """Worksheet opened for the two streaming passes.
+
+    The workbook is parsed once. Pass 1 reads it and the sampler spools
+    the rows still eligible for random selection (included and not high
+    value) to a :class:`RowSpool`; pass 2 reads the spool instead of the
+    workbook.
+    """
+
+    def __init__(self, path: Path, sheet: str | None = None) -> None:
+        self.path = Path(path)
+        self._records = iter_excel_records(self.path, sheet)
+        self.header = next(self._records, [])
+        self.columns = _resolve_columns(self.header)
+        self._spool = RowSpool(prefix="xlsx-spool-")
+        self._scanned = False
+
+    def __enter__(self) -> "ExcelPopulation":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the workbook and delete the spool."""
+        self._records.close()
+        self._spool.close()
+
+    def iter_amounts(self) -> Iterator[tuple[int, float | None, Any]]:
+        """Yield row index, signed amount and record.
+
+        The first call reads the workbook; later calls replay the spool.
+
+        Returns:
+            Iterator[tuple[int, float | None, Any]]: Row index, amount
+            (``None`` when missing or invalid) and field list.
+        """
+        if self._scanned:
+            return self._spool.replay()
+        self._scanned = True
+        return self._scan()
+
+    def spool(self, idx: int, signed: float, record: list[Any]) -> None:
+        """Keep one pass-1 row for pass 2.
+
+        Args:
+            idx (int): Row index within the worksheet.
+            signed (float): Parsed signed amount.
+            record (list[Any]): Converted cell values.
+        """
+        self._spool.append((idx, signed, record))
+
+    def _scan(self) -> Iterator[tuple[int, float | None, Any]]:
+        """Read the workbook once, parsing the amount cell per row."""
+        position = self.columns.get("amount", -1)
+        for idx, record in enumerate(self._records):
+            if 0 <= position < len(record):
+                signed = _parse_amount(_amount_text(record[position]))["value"]
+            else:
+                signed = None
+            yield idx, signed, record
+
+
+def _amount_text(value: Any) -> str:
+    """Return amount cell text; dates are not amounts."""
+    return value if isinstance(value, str) else ""
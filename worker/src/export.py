@@ -0,0 +1,164 @@
+"""Annotated full-population export written during the streaming passes."""
+
+from __future__ import annotations
+
+import csv
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Sequence
+
+from .columnar import PARQUET_SUFFIXES, _import_pyarrow
+
+EXPORT_COLUMNS = (
+    "source_file",
+    "source_row_index",
+    "transaction_id",
+    "amount_signed",
+    "amount_abs",
+    "effective_date",
+    "document_type",
+    "description",
+    "balance_category",
+    "selected",
+    "selection_type",
+    "exclusion_reason",
+)
+EXPORT_BATCH_ROWS = 65_536
+EXPORT_BUFFER_BYTES = 1 << 20
+DATE_COLUMN = EXPORT_COLUMNS.index("effective_date")
+
+
+class PopulationExport(ABC):
+    """Sink receiving one ``EXPORT_COLUMNS`` tuple per population row."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.rows = 0
+
+    def __enter__(self) -> "PopulationExport":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @abstractmethod
+    def write(self, values: Sequence[Any]) -> None:
+        """Write one row.
+
+        Args:
+            values (Sequence[Any]): Values in ``EXPORT_COLUMNS`` order.
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and close the output file."""
+
+
+class CsvExport(PopulationExport):
+    """Population export as a buffered CSV file.
+
+    Effective dates are written as ISO 8601 text, as the CSV report
+    writes them.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: IO[str] | None = open(
+            self.path,
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=EXPORT_BUFFER_BYTES,
+        )
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, values: Sequence[Any]) -> None:
+        date = values[DATE_COLUMN]
+        if date is not None:
+            values = list(values)
+            values[DATE_COLUMN] = date.isoformat()
+        self._writer.writerow(values)
+        self.rows += 1
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class ParquetExport(PopulationExport):
+    """Population export as a Parquet file written in row batches."""
+
+    def __init__(self, path: Path, batch_rows: int = EXPORT_BATCH_ROWS):
+        super().__init__(path)
+        self._pa = _import_pyarrow()
+        pa = self._pa
+        text = pa.string()
+        self._schema = pa.schema(
+            [
+                ("source_file", text),
+                ("source_row_index", pa.int64()),
+                ("transaction_id", text),
+                ("amount_signed", pa.float64()),
+                ("amount_abs", pa.float64()),
+                ("effective_date", pa.timestamp("us")),
+                ("document_type", text),
+                ("description", text),
+                ("balance_category", text),
+                ("selected", pa.bool_()),
+                ("selection_type", text),
+                ("exclusion_reason", text),
+            ]
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer: Any = pa.parquet.ParquetWriter(
+            str(self.path), self._schema
+        )
+        self._batch_rows = batch_rows
+        self._batch: list[Sequence[Any]] = []
+
+    def write(self, values: Sequence[Any]) -> None:
+        self._batch.append(values)
+        self.rows += 1
+        if len(self._batch) >= self._batch_rows:
+            self._flush()
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+
+    def _flush(self) -> None:
+        """Write the pending rows as one record batch."""
+        if not self._batch:
+            return
+        columns = list(zip(*self._batch))
+        arrays = [
+            self._pa.array(column, type=field.type)
+            for column, field in zip(columns, self._schema)
+        ]
+        self._writer.write_batch(
+            self._pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+        )
+        self._batch = []
+
+
+def open_export(path: Path) -> PopulationExport:
+    """Open the population export, Parquet for ``.parquet``/``.pq`` paths.
+
+    Args:
+        path (Path): Output file; any other suffix writes CSV.
+
+    Returns:
+        PopulationExport: Open sink, to be closed by the caller.
+
+    Raises:
+        ImportError: If a Parquet export is requested without pyarrow.
+    """
+    if Path(path).suffix.lower() in PARQUET_SUFFIXES:
+        return ParquetExport(path)
+    return CsvExport(path)
@@ -0,0 +1,609 @@
+"""Incremental sampling of append-only CSV populations."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import io
+import os
+import random
+from pathlib import Path
+from typing import Any
+
+from .cleaner import (
+    PopulationScope,
+    _build_quality_report,
+    _initialize_metrics,
+    _process_single_row,
+    _RejectedRowWriter,
+    _scope_total,
+)
+from .logging_setup import get_logger
+from .models import (
+    CleanedTransaction,
+    DataQualityReport,
+    EventCode,
+    SampleStatistics,
+    SamplingParameters,
+    SamplingState,
+)
+from .readers import (
+    DEFAULT_BLOCK_SIZE,
+    ByteStream,
+    _iter_records,
+    _ragged_row,
+    is_columnar,
+    is_excel,
+    is_sqlite,
+    is_stdin,
+)
+from .sampler import (
+    _apply_balance_filters,
+    _derive_balance,
+    _finish_streaming,
+    _mark_transaction,
+    _random_target,
+    _StreamFile,
+)
+
+log = get_logger("incremental")
+
+STATE_VERSION = 2
+PREFIX_CHECK_BYTES = 1 << 20
+TAIL_CHECK_BYTES = 1 << 16
+CANDIDATE_SLACK = 1024
+SKETCH_BITS_PER_ID = 16
+SKETCH_HASHES = 11
+SKETCH_MIN_CAPACITY = 1 << 16
+SKETCH_SUFFIX = ".ids"
+
+
+def sample_incremental(
+    input_csv: Path,
+    params: SamplingParameters,
+    state_path: Path,
+    rejected_path: Path | None = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> tuple[list[CleanedTransaction], SampleStatistics, DataQualityReport]:
+    """Clean and sample a CSV, reading only what the last run did not.
+
+    The first run (or any run that cannot resume) reads the whole file:
+    an amount-only pass sizes the random candidate pool, then every row
+    is cleaned as ``clean_data`` cleans it. Each population row eligible
+    for random selection draws a key from a seeded generator in file
+    order; the random sample is the ``k`` rows with the smallest keys,
+    which is a uniform sample without replacement. It is not the sample
+    ``generate_sample`` draws for the same seed: that one picks ``k`` of
+    the ``n`` eligible rows at once, so every pick depends on ``n`` and
+    would change as rows are appended. The run keeps the
+    ``candidate_capacity`` smallest keys, the high-value rows, running
+    totals, quality counters and the generator state in ``state_path``.
+    The Bloom filter of transaction IDs goes to a binary file beside it,
+    named after its digest, so the JSON stays small.
+
+    A later run checks that the file still starts with the same bytes
+    and still holds the same bytes just before the saved offset, then
+    cleans only the appended rows and continues the key sequence. The
+    result equals a fresh ``--state`` run over the whole file as long as
+    the new sample size fits the candidate pool and the ID count fits the
+    sketch; otherwise, and on any truncation, rewrite or parameter change,
+    the whole file is read again.
+
+    Duplicate IDs are counted with the Bloom filter, so the count may
+    overstate duplicates by its false-positive rate (about 0.05%).
+    ``rejected_path`` receives the rejections of the rows read by this
+    run only.
+
+    Args:
+        input_csv (Path): Append-only population CSV file.
+        params (SamplingParameters): Sampling parameters validated via Pydantic.
+        state_path (Path): State file read at start and rewritten at end.
+        rejected_path (Path | None): Optional CSV receiving rejected rows.
+        block_size (int): Bytes per block read from the CSV.
+
+    Returns:
+        tuple[list[CleanedTransaction], SampleStatistics, DataQualityReport]: Sample, statistics and quality report for the whole file.
+
+    Raises:
+        ValueError: If the input is not a CSV file, or the population is
+            empty after filtering.
+    """
+    if (
+        is_stdin(input_csv)
+        or is_columnar(input_csv)
+        or is_excel(input_csv)
+        or is_sqlite(input_csv)
+    ):
+        raise ValueError(f"Incremental runs read CSV files only: {input_csv}")
+    size = input_csv.stat().st_size
+    state = load_state(state_path)
+    problem = _resume_problem(state, input_csv, params, size)
+    sketch: _IdSketch | None = None
+    if state is not None and problem is None:
+        sketch = _IdSketch.load(state_path, state)
+        if sketch is None:
+            problem = "ID sketch missing"
+    run: _IncrementalRun | None = None
+    if state is not None and sketch is not None:
+        log.info(
+            EventCode.STATE_LOADED.value,
+            mode="tail",
+            offset=state.offset,
+            new_bytes=size - state.offset,
+        )
+        run = _IncrementalRun.from_state(state, params, sketch)
+        with _RejectedRowWriter(rejected_path) as rejected:
+            run.consume(input_csv, state.offset, size, rejected, block_size)
+        rejected.log_summary()
+        problem = run.overflow()
+        if problem is not None:
+            run = None
+    if run is None:
+        log.info(EventCode.STATE_LOADED.value, mode="full", reason=problem)
+        run = _IncrementalRun.start(input_csv, params, block_size)
+        with _RejectedRowWriter(rejected_path) as rejected:
+            run.consume(input_csv, 0, size, rejected, block_size)
+        rejected.log_summary()
+        if run.overflow() is not None:
+            raise RuntimeError(
+                f"{input_csv} grew while it was read; run again."
+            )
+
+    if run.population_size == 0:
+        raise ValueError("Population is empty after applying balance filters.")
+    sketch_file = run.sketch.save(state_path)
+    save_state(run.to_state(input_csv, size, sketch_file), state_path)
+    sample, stats = _finish_streaming(
+        run.high_value,
+        run.random_sample(),
+        run.population_size,
+        run.total_abs,
+        run.interval,
+        run.excluded_zero,
+        run.excluded_balance,
+    )
+    report = _build_quality_report(
+        run.cleaned_rows + run.rejected_rows + _scope_total(run.metrics),
+        run.cleaned_rows,
+        run.metrics,
+        run.duplicate_ids,
+        run.excluded_zero,
+        run.excluded_balance,
+    )
+    return sample, stats, report
+
+
+def load_state(state_path: Path) -> SamplingState | None:
+    """Read a state file, or ``None`` when absent or unreadable.
+
+    Args:
+        state_path (Path): State file written by a previous run.
+
+    Returns:
+        SamplingState | None: Saved progress, if any.
+    """
+    try:
+        return SamplingState.model_validate_json(state_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(state: SamplingState, state_path: Path) -> None:
+    """Write a state file atomically and drop superseded ID sketches.
+
+    The sketch named by ``state.id_sketch_file`` must already be saved
+    (see ``_IdSketch.save``).
+
+    Args:
+        state (SamplingState): Progress to persist.
+        state_path (Path): Destination file.
+    """
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = state_path.with_name(state_path.name + ".tmp")
+    partial.write_text(state.model_dump_json(), encoding="utf-8")
+    os.replace(partial, state_path)
+    for old in state_path.parent.glob(f"{state_path.name}.*{SKETCH_SUFFIX}"):
+        if old.name != state.id_sketch_file:
+            old.unlink(missing_ok=True)
+    log.info(
+        EventCode.STATE_SAVED.value,
+        path=str(state_path),
+        offset=state.offset,
+        rows=state.rows_read,
+    )
+
+
+def _resume_problem(
+    state: SamplingState | None,
+    input_csv: Path,
+    params: SamplingParameters,
+    size: int,
+) -> str | None:
+    """Return why ``state`` cannot be resumed, or ``None`` if it can.
+
+    Args:
+        state (SamplingState | None): Saved progress.
+        input_csv (Path): Population file about to be read.
+        params (SamplingParameters): Parameters of this run.
+        size (int): Current file size in bytes.
+
+    Returns:
+        str | None: Reason for a full run.
+    """
+    if state is None:
+        return "no state"
+    if state.version != STATE_VERSION:
+        return "state version changed"
+    if state.input_path != str(input_csv.resolve()):
+        return "different input file"
+    if state.parameters != params.model_dump_json():
+        return "parameters changed"
+    if size < state.offset:
+        return "file truncated"
+    if size > state.offset and not state.ends_with_newline:
+        return "last line extended"
+    prefix, tail = _digests(input_csv, state.offset)
+    if prefix != state.prefix_sha256 or tail != state.tail_sha256:
+        return "file rewritten"
+    return None
+
+
+def _digests(path: Path, offset: int) -> tuple[str, str]:
+    """Hash the first bytes of a file and the bytes just before ``offset``.
+
+    Args:
+        path (Path): File to hash.
+        offset (int): End of the processed bytes.
+
+    Returns:
+        tuple[str, str]: Prefix and tail SHA-256 hex digests.
+    """
+    with open(path, "rb") as f:
+        prefix = hashlib.sha256(f.read(min(offset, PREFIX_CHECK_BYTES)))
+        start = max(0, offset - TAIL_CHECK_BYTES)
+        f.seek(start)
+        tail = hashlib.sha256(f.read(offset - start))
+    return prefix.hexdigest(), tail.hexdigest()
+
+
+class _IdSketch:
+    """Bloom filter over transaction IDs for duplicate counting."""
+
+    def __init__(self, capacity: int, bits: bytes | None = None) -> None:
+        self.capacity = capacity
+        self._size = capacity * SKETCH_BITS_PER_ID
+        self._bits = bytearray(bits or bytes(self._size // 8))
+
+    def add(self, value: str) -> bool:
+        """Add an ID, returning whether it was (probably) seen before."""
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16)
+        raw = digest.digest()
+        h1 = int.from_bytes(raw[:8], "little")
+        h2 = int.from_bytes(raw[8:], "little") | 1
+        present = True
+        bits = self._bits
+        for i in range(SKETCH_HASHES):
+            bit = (h1 + i * h2) % self._size
+            mask = 1 << (bit & 7)
+            if not bits[bit >> 3] & mask:
+                present = False
+                bits[bit >> 3] |= mask
+        return present
+
+    def save(self, state_path: Path) -> str:
+        """Write the filter bits beside a state file, named by their digest.
+
+        An unchanged filter keeps its file, so a run that saw no new IDs
+        writes nothing.
+
+        Args:
+            state_path (Path): State file the sketch belongs to.
+
+        Returns:
+            str: File name, relative to the state file's directory.
+        """
+        digest = hashlib.sha256(self._bits).hexdigest()[:32]
+        name = f"{state_path.name}.{digest}{SKETCH_SUFFIX}"
+        path = state_path.with_name(name)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(name + ".tmp")
+            partial.write_bytes(self._bits)
+            os.replace(partial, path)
+        return name
+
+    @classmethod
+    def load(
+        cls, state_path: Path, state: SamplingState
+    ) -> "_IdSketch | None":
+        """Read the sketch a state file names, checking its digest.
+
+        Args:
+            state_path (Path): State file the sketch belongs to.
+            state (SamplingState): Progress read from ``state_path``.
+
+        Returns:
+            _IdSketch | None: The filter, or ``None`` when its file is
+            missing or does not match the digest in its name.
+        """
+        try:
+            bits = state_path.with_name(state.id_sketch_file).read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(bits).hexdigest()[:32]
+        if not state.id_sketch_file.endswith(f".{digest}{SKETCH_SUFFIX}"):
+            return None
+        return cls(state.id_sketch_capacity, bits)
+
+
+class _BoundedReader(io.RawIOBase):
+    """Raw stream yielding at most ``limit`` bytes of a wrapped file.
+
+    Keeps a run to the file size observed at start, so rows appended
+    while it reads are left for the next run.
+    """
+
+    def __init__(self, raw: ByteStream, limit: int) -> None:
+        self._raw = raw
+        self._left = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._left <= 0:
+            return 0
+        view = memoryview(buffer)[: self._left]
+        n = self._raw.readinto(view) or 0
+        self._left -= n
+        return n
+
+
+class _IncrementalRun:
+    """Running totals, quality counters and random candidates."""
+
+    def __init__(
+        self,
+        params: SamplingParameters,
+        header: list[str] | None,
+        candidate_capacity: int,
+        sketch: _IdSketch,
+    ) -> None:
+        self.params = params
+        self.interval = params.sampling_interval()
+        self.scope = PopulationScope.from_params(params)
+        self.header = header
+        self.metrics = _initialize_metrics()
+        self.rows_read = 0
+        self.cleaned_rows = 0
+        self.rejected_rows = 0
+        self.duplicate_ids = 0
+        self.sketch = sketch
+        self.population_size = 0
+        self.total_abs = 0.0
+        self.remaining_abs = 0.0
+        self.eligible_count = 0
+        self.excluded_zero = 0
+        self.excluded_balance = 0
+        self.high_value: list[CleanedTransaction] = []
+        self.candidate_capacity = candidate_capacity
+        # Max-heap on the key (stored negated) of the smallest-key rows
+        self.candidates: list[tuple[float, int, CleanedTransaction]] = []
+        self.rng = random.Random(params.random_seed)
+
+    @classmethod
+    def start(
+        cls, input_csv: Path, params: SamplingParameters, block_size: int
+    ) -> "_IncrementalRun":
+        """Size the candidate pool and ID sketch with an amount-only pass.
+
+        Args:
+            input_csv (Path): Population CSV file.
+            params (SamplingParameters): Sampling parameters.
+            block_size (int): Bytes per block read from the CSV.
+
+        Returns:
+            _IncrementalRun: Empty run ready to consume the whole file.
+        """
+        interval = params.sampling_interval()
+        scope = PopulationScope.from_params(params)
+        rows = 0
+        remaining_abs = 0.0
+        with _StreamFile(
+            input_csv, None, block_size, 0, None, scope=scope
+        ) as stream:
+            for _, signed, _ in stream.iter_amounts():
+                rows += 1
+                if signed is None:
+                    continue
+                abs_val = abs(signed)
+                include, _ = _apply_balance_filters(
+                    abs_val, _derive_balance(signed), params
+                )
+                if include and abs_val <= interval:
+                    remaining_abs += abs_val
+        capacity = 2 * _random_target(remaining_abs, interval)
+        sketch = _IdSketch(max(SKETCH_MIN_CAPACITY, 2 * rows))
+        return cls(params, None, capacity + CANDIDATE_SLACK, sketch)
+
+    @classmethod
+    def from_state(
+        cls,
+        state: SamplingState,
+        params: SamplingParameters,
+        sketch: _IdSketch,
+    ) -> "_IncrementalRun":
+        """Restore a run from saved progress.
+
+        Args:
+            state (SamplingState): Progress written by the previous run.
+            params (SamplingParameters): Sampling parameters.
+            sketch (_IdSketch): ID filter saved with ``state``.
+
+        Returns:
+            _IncrementalRun: Run ready to consume the appended rows.
+        """
+        run = cls(params, state.header, state.candidate_capacity, sketch)
+        run.metrics.update(state.metrics)
+        run.rows_read = state.rows_read
+        run.cleaned_rows = state.cleaned_rows
+        run.rejected_rows = state.rejected_rows
+        run.duplicate_ids = state.duplicate_ids
+        run.population_size = state.population_size
+        run.total_abs = state.total_abs
+        run.remaining_abs = state.remaining_abs
+        run.eligible_count = state.eligible_count
+        run.excluded_zero = state.excluded_zero
+        run.excluded_balance = state.excluded_balance
+        run.high_value = list(state.high_value)
+        run.candidates = [
+            (-key, txn.source_row_index, txn) for key, txn in state.candidates
+        ]
+        heapq.heapify(run.candidates)
+        run.rng.setstate((3, tuple(state.rng_state), None))
+        return run
+
+    def consume(
+        self,
+        input_csv: Path,
+        start: int,
+        end: int,
+        rejected: _RejectedRowWriter,
+        block_size: int,
+    ) -> None:
+        """Clean and tally the rows held in bytes ``[start, end)``.
+
+        Args:
+            input_csv (Path): Population CSV file.
+            start (int): Offset of the first unread row (``0`` reads the
+                header first).
+            end (int): File size observed when the run began.
+            rejected (_RejectedRowWriter): Sink for rejected rows.
+            block_size (int): Bytes per block read from the CSV.
+        """
+        with open(input_csv, "rb", buffering=0) as raw:
+            raw.seek(start)
+            records = _iter_records(
+                _BoundedReader(raw, end - start), block_size
+            )
+            if self.header is None:
+                self.header = next(records, [])
+            header = self.header
+            width = len(header)
+            for record in records:
+                idx = self.rows_read
+                self.rows_read += 1
+                if len(record) == width:
+                    row = dict(zip(header, record))
+                else:
+                    row = _ragged_row(header, record)
+                self._add(idx, row, rejected)
+
+    def _add(
+        self, idx: int, row: dict[str, str], rejected: _RejectedRowWriter
+    ) -> None:
+        """Clean one row and fold it into the totals and candidates."""
+        txn, reason = _process_single_row(
+            idx, row, self.metrics, scope=self.scope
+        )
+        if txn is None:
+            if reason is not None:
+                self.rejected_rows += 1
+                rejected.write(idx, row, reason)
+            return
+        self.cleaned_rows += 1
+        if txn.transaction_id and self.sketch.add(txn.transaction_id):
+            self.duplicate_ids += 1
+        amount_abs = txn.amount_abs or 0.0
+        include, why = _apply_balance_filters(
+            amount_abs, txn.balance_category, self.params
+        )
+        if not include:
+            if why == "zero":
+                self.excluded_zero += 1
+            else:
+                self.excluded_balance += 1
+            return
+        self.population_size += 1
+        self.total_abs += amount_abs
+        if amount_abs > self.interval:
+            self.high_value.append(_mark_transaction(txn, "High Value"))
+            return
+        self.eligible_count += 1
+        self.remaining_abs += amount_abs
+        key = self.rng.random()
+        if len(self.candidates) < self.candidate_capacity:
+            heapq.heappush(self.candidates, (-key, idx, txn))
+        elif key < -self.candidates[0][0]:
+            heapq.heapreplace(self.candidates, (-key, idx, txn))
+
+    def overflow(self) -> str | None:
+        """Return why the saved pools can no longer give exact results.
+
+        Returns:
+            str | None: Reason for a full run, or ``None``.
+        """
+        if self.cleaned_rows > self.sketch.capacity:
+            return "ID sketch full"
+        needed = _random_target(self.remaining_abs, self.interval)
+        if (
+            needed > self.candidate_capacity
+            and self.eligible_count > self.candidate_capacity
+        ):
+            return "candidate pool full"
+        return None
+
+    def random_sample(self) -> list[CleanedTransaction]:
+        """Return the rows with the smallest keys, smallest first.
+
+        Returns:
+            list[CleanedTransaction]: Random selections.
+        """
+        size = _random_target(self.remaining_abs, self.interval)
+        ranked = sorted(self.candidates, reverse=True)[:size]
+        return [_mark_transaction(txn, "Random") for _, _, txn in ranked]
+
+    def to_state(
+        self, input_csv: Path, size: int, sketch_file: str
+    ) -> SamplingState:
+        """Snapshot the run after reading ``size`` bytes.
+
+        Args:
+            input_csv (Path): Population CSV file.
+            size (int): Bytes processed.
+            sketch_file (str): Name of the saved ID sketch file.
+
+        Returns:
+            SamplingState: Progress for the next run.
+        """
+        prefix, tail = _digests(input_csv, size)
+        with open(input_csv, "rb") as f:
+            f.seek(max(0, size - 1))
+            last = f.read(1) if size else b"\n"
+        return SamplingState(
+            version=STATE_VERSION,
+            input_path=str(input_csv.resolve()),
+            parameters=self.params.model_dump_json(),
+            header=self.header or [],
+            offset=size,
+            ends_with_newline=last == b"\n",
+            prefix_sha256=prefix,
+            tail_sha256=tail,
+            rows_read=self.rows_read,
+            cleaned_rows=self.cleaned_rows,
+            rejected_rows=self.rejected_rows,
+            metrics=self.metrics,
+            duplicate_ids=self.duplicate_ids,
+            id_sketch_file=sketch_file,
+            id_sketch_capacity=self.sketch.capacity,
+            population_size=self.population_size,
+            total_abs=self.total_abs,
+            remaining_abs=self.remaining_abs,
+            eligible_count=self.eligible_count,
+            excluded_zero=self.excluded_zero,
+            excluded_balance=self.excluded_balance,
+            high_value=self.high_value,
+            candidate_capacity=self.candidate_capacity,
+            candidates=[(-key, txn) for key, _, txn in self.candidates],
+            rng_state=list(self.rng.getstate()[1]),
+        )
@@ -4,17 +4,47 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 import sys
 import time
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
-from .cleaner import clean_data
+from .bundle import BUNDLE_SUFFIX, write_bundle
+from .cleaner import REJECTED_FILENAME, clean_data
+from .incremental import sample_incremental
 from .logging_setup import configure_logging, get_logger
-from .models import EventCode, RunSummary, SamplingParameters
-from .reporter import generate_reports
+from .models import (
+    CleanedTransaction,
+    DataQualityReport,
+    EventCode,
+    RunSummary,
+    SamplingParameters,
+)
+from .preview import (
+    DEFAULT_PREVIEW_BLOCK_SIZE,
+    DEFAULT_PREVIEW_BLOCKS,
+    estimate_population,
+)
+from .readers import (
+    _GLOB_CHARS,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_PREFETCH_DEPTH,
+    ReadStats,
+    is_excel,
+    is_stdin,
+    resolve_inputs,
+)
+from .reporter import (
+    OUTPUT_SINKS,
+    ReportPipeline,
+    generate_reports,
+    render_report,
+    report_output_path,
+)
 from .sampler import generate_sample, generate_sample_streaming
+from .sidecar import load_report_inputs, save_report_inputs, sidecar_path
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,9 +59,31 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--input",
-        type=Path,
+        nargs="+",
         required=True,
-        help="Path to population CSV file",
+        help=(
+            "Population file(s): CSV, Excel, SQLite, or Parquet / Arrow "
+            "IPC / Feather when pyarrow is installed. Accepts several paths, a "
+            "directory or a glob; all files are sampled as one population. "
+            "Use - to read CSV from standard input"
+        ),
+    )
+    parser.add_argument(
+        "--sql",
+        default=None,
+        help=(
+            "Table name or SELECT query to read when --input is a SQLite "
+            "database (default: its only table). Queries, views and "
+            "WITHOUT ROWID tables are copied once into temporary storage"
+        ),
+    )
+    parser.add_argument(
+        "--sheet",
+        default=None,
+        help=(
+            "Worksheet name or 1-based position when --input is an Excel "
+            "workbook (default: the active sheet)"
+        ),
     )
     parser.add_argument(
         "--output-dir",
@@ -80,6 +132,42 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Include zero-amount transactions in the population",
     )
+    parser.add_argument(
+        "--date-from",
+        type=date.fromisoformat,
+        default=None,
+        help="Keep rows dated on or after this day (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--date-to",
+        type=date.fromisoformat,
+        default=None,
+        help="Keep rows dated on or before this day (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--document-types",
+        nargs="+",
+        default=[],
+        help="Keep only these document types (case-insensitive)",
+    )
+    parser.add_argument(
+        "--exclude-document-types",
+        nargs="+",
+        default=[],
+        help="Drop these document types (case-insensitive)",
+    )
+    parser.add_argument(
+        "--amount-min",
+        type=float,
+        default=None,
+        help="Keep rows whose absolute amount is at least this value",
+    )
+    parser.add_argument(
+        "--amount-max",
+        type=float,
+        default=None,
+        help="Keep rows whose absolute amount is at most this value",
+    )
     parser.add_argument(
         "--fast",
         action="store_true",
@@ -88,6 +176,114 @@ def parse_args() -> argparse.Namespace:
             "Reads input twice with reservoir sampling."
         ),
     )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help="Bytes per read block in streaming mode",
+    )
+    parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        default=DEFAULT_PREFETCH_DEPTH,
+        help=(
+            "Blocks to read ahead on a background thread in streaming "
+            "mode (0 memory-maps the file instead)"
+        ),
+    )
+    parser.add_argument(
+        "--fast-report",
+        action="store_true",
+        help=(
+            "Write Sample Selected rows in bulk with column formats and "
+            "real Excel dates"
+        ),
+    )
+    parser.add_argument(
+        "--output-format",
+        nargs="+",
+        choices=list(OUTPUT_SINKS),
+        default=["xlsx"],
+        help=(
+            "Sample outputs to write, side by side from one pass over the "
+            "sample (default: xlsx)"
+        ),
+    )
+    parser.add_argument(
+        "--skip-report",
+        action="store_true",
+        help=(
+            "Write no report files, only the run's report inputs; the "
+            "report command builds the outputs from them on demand"
+        ),
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "With --fast, start writing the report once pass 1 has picked "
+            "the high-value rows, while pass 2 selects the random rows"
+        ),
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=None,
+        help=(
+            "State file for an append-only CSV: read only the rows added "
+            "since the run that wrote it, re-reading the whole file if it "
+            "was truncated or rewritten. The random items come from seeded "
+            "per-row keys, so they differ from a run without --state for "
+            "the same seed"
+        ),
+    )
+    parser.add_argument(
+        "--export-population",
+        type=Path,
+        default=None,
+        help=(
+            "With --fast, also write every population row with its "
+            "selection type or exclusion reason to this CSV (or .parquet) "
+            "file during the sampling pass"
+        ),
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help=(
+            "Also write runs/<run_id>.zip holding this run's reports, "
+            "summary, report inputs and rejected rows, with a manifest of "
+            "SHA-256 digests"
+        ),
+    )
+    parser.add_argument(
+        "--breakdown",
+        action="store_true",
+        help=(
+            "Total the population by document type, balance category and "
+            "month on a Population Breakdown sheet"
+        ),
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help=(
+            "Estimate population size, balance and sample sizes from a "
+            "few random blocks of the CSV and exit (no report)"
+        ),
+    )
+    parser.add_argument(
+        "--preview-blocks",
+        type=int,
+        default=DEFAULT_PREVIEW_BLOCKS,
+        help="Number of random blocks read by --preview",
+    )
+    parser.add_argument(
+        "--preview-block-size",
+        type=int,
+        default=DEFAULT_PREVIEW_BLOCK_SIZE,
+        help="Bytes per block read by --preview",
+    )
     parser.add_argument(
         "--progress",
         action="store_true",
@@ -99,16 +295,129 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional run identifier; if omitted a UUID is generated",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    incremental = args.state is not None
+    if incremental and (
+        len(args.input) != 1
+        or Path(args.input[0]).is_dir()
+        or _GLOB_CHARS.intersection(args.input[0])
+    ):
+        parser.error("--state takes a single CSV input")
+    if args.export_population is not None and (incremental or not args.fast):
+        parser.error("--export-population requires --fast without --state")
+    if args.breakdown and incremental:
+        parser.error("--breakdown cannot be combined with --state")
+    if args.skip_report and args.pipeline:
+        parser.error("--skip-report cannot be combined with --pipeline")
+    if args.pipeline and (incremental or not args.fast):
+        parser.error("--pipeline requires --fast without --state")
+    return args
+
+
+def parse_report_args(argv: list[str]) -> argparse.Namespace:
+    """Parse arguments of the ``report`` command.
+
+    Args:
+        argv (list[str]): Arguments after ``report``.
+
+    Returns:
+        argparse.Namespace: Parsed command-line namespace.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main report",
+        description=(
+            "Rebuild report outputs from a run's saved report inputs, "
+            "without re-reading the population"
+        ),
+    )
+    parser.add_argument(
+        "report_inputs",
+        type=Path,
+        help="The run's runs/<run_id>.report.json.gz file",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directory for the outputs (default: the run's output directory)",
+    )
+    parser.add_argument(
+        "--output-format",
+        nargs="+",
+        choices=list(OUTPUT_SINKS),
+        default=["xlsx"],
+        help="Sample outputs to write (default: xlsx)",
+    )
+    parser.add_argument(
+        "--fast-report",
+        action="store_true",
+        help="Write Sample Selected rows in bulk with column formats",
+    )
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Write the Excel workbook to standard output instead of a file",
+    )
+    args = parser.parse_args(argv)
+    if args.stdout and args.output_format != ["xlsx"]:
+        parser.error("--stdout writes the xlsx output only")
+    return args
+
+
+def run_report(argv: list[str]) -> int:
+    """Regenerate outputs from saved report inputs (``main report ...``).
+
+    Args:
+        argv (list[str]): Arguments after ``report``.
+
+    Returns:
+        int: Process exit status code (0 indicates success).
+    """
+    args = parse_report_args(argv)
+    inputs = load_report_inputs(args.report_inputs)
+    configure_logging(inputs.run_id)
+    if args.stdout:
+        with render_report(
+            inputs.sample,
+            inputs.quality_report,
+            inputs.sample_statistics,
+            inputs.parameters,
+            inputs.timestamp,
+            inputs.run_id,
+            fast_writer=args.fast_report,
+        ) as workbook:
+            shutil.copyfileobj(workbook, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return 0
+    output_dir = args.output_dir or args.report_inputs.resolve().parent.parent
+    generate_reports(
+        output_dir,
+        inputs.sample,
+        inputs.quality_report,
+        inputs.sample_statistics,
+        inputs.parameters,
+        inputs.timestamp,
+        inputs.run_id,
+        fast_writer=args.fast_report,
+        output_formats=args.output_format,
+    )
+    for name in args.output_format:
+        print(f"Report generated at: {report_output_path(output_dir, name)}")
+    return 0
 
 
 def main() -> int:
     """Run the full sampling workflow from CLI parameters to report output.
 
+    ``main report <file>`` instead rebuilds the outputs of an earlier run
+    (see ``run_report``).
+
     Returns:
         int: Process exit status code (0 indicates success).
     """
 
+    if sys.argv[1:2] == ["report"]:
+        return run_report(sys.argv[2:])
     args = parse_args()
     params = SamplingParameters(
         tolerable_misstatement=args.tolerable,
@@ -118,15 +427,62 @@ def main() -> int:
         high_value_override=args.high_value,
         random_seed=args.seed,
         exclude_zero_amounts=not args.include_zeros,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        include_document_types=args.document_types,
+        exclude_document_types=args.exclude_document_types,
+        amount_min=args.amount_min,
+        amount_max=args.amount_max,
     )
     # Use provided run_id from API, or generate a new UUID
     run_id = args.run_id if args.run_id else str(uuid4())
     configure_logging(run_id)
     log = get_logger("main")
-    log.info(EventCode.RUN_START.value, parameters=params.model_dump())
+    log.info(
+        EventCode.RUN_START.value, parameters=params.model_dump(mode="json")
+    )
     started = time.perf_counter()
     started_dt = datetime.now(timezone.utc)
-    cleaned, quality_report = clean_data(args.input)
+    inputs = resolve_inputs(args.input)
+    if args.preview:
+        return _run_preview(args, inputs, params, run_id)
+    incremental = args.state is not None
+    pipeline = None
+    if args.pipeline:
+        pipeline = ReportPipeline(
+            args.output_dir,
+            params,
+            run_id,
+            source_column=len(inputs) > 1,
+            fast_writer=args.fast_report,
+            output_formats=args.output_format,
+        )
+    piped = args.fast and any(is_stdin(path) for path in inputs)
+    workbook = args.fast and any(is_excel(path) for path in inputs)
+    if incremental:
+        # Cleaning and sampling run together over the unread rows only
+        sample, stats, quality_report = sample_incremental(
+            inputs[0],
+            params,
+            args.state,
+            rejected_path=args.output_dir / REJECTED_FILENAME,
+            block_size=args.block_size,
+        )
+        cleaned: list[CleanedTransaction] = []
+    elif piped or workbook:
+        # Standard input can be read only once and a workbook is parsed
+        # once in --fast mode, so the streaming passes replace the
+        # cleaning pass
+        source = "standard input" if piped else "an Excel workbook"
+        cleaned, quality_report = [], _streamed_quality_report(source)
+    else:
+        cleaned, quality_report = clean_data(
+            inputs,
+            rejected_path=args.output_dir / REJECTED_FILENAME,
+            sql=args.sql,
+            sheet=args.sheet,
+            params=params,
+        )
     log.info(
         EventCode.CLEANING_DONE.value,
         total_rows=len(cleaned),
@@ -136,19 +492,48 @@ def main() -> int:
     cleaning_seconds = cleaning_end - started
 
     sampling_start = time.perf_counter()
-    if args.fast:
+    read_stats = ReadStats()
+    scope_counts: dict[str, int] = {}
+    if incremental:
+        pass  # sampled together with cleaning above
+    elif args.fast:
         sample, stats = generate_sample_streaming(
-            args.input, params, show_progress=args.progress
+            inputs,
+            params,
+            show_progress=args.progress,
+            block_size=args.block_size,
+            prefetch_depth=args.prefetch_depth,
+            read_stats=read_stats,
+            sql=args.sql,
+            sheet=args.sheet,
+            scope_counts=scope_counts,
+            export_path=args.export_population,
+            on_high_value=pipeline.start if pipeline else None,
+            breakdown=args.breakdown,
         )
     else:
-        sample, stats = generate_sample(cleaned, params)
+        sample, stats = generate_sample(
+            cleaned, params, breakdown=args.breakdown
+        )
 
-    quality_report = quality_report.model_copy(
-        update={
-            "excluded_zero_amounts": stats.excluded_zero_amounts,
-            "excluded_due_to_balance": stats.excluded_due_to_balance,
-        }
-    )
+    quality_update = {
+        "excluded_zero_amounts": stats.excluded_zero_amounts,
+        "excluded_due_to_balance": stats.excluded_due_to_balance,
+    }
+    if piped or workbook:
+        scanned = (
+            stats.population_size
+            + stats.excluded_zero_amounts
+            + stats.excluded_due_to_balance
+        )
+        quality_update.update(
+            total_rows_raw=scanned + sum(scope_counts.values()),
+            total_rows_cleaned=scanned,
+            excluded_by_date=scope_counts.get("date", 0),
+            excluded_by_document_type=scope_counts.get("document_type", 0),
+            excluded_by_amount_band=scope_counts.get("amount_band", 0),
+        )
+    quality_report = quality_report.model_copy(update=quality_update)
     sampling_end = time.perf_counter()
     sampling_seconds = sampling_end - sampling_start
     log.info(
@@ -158,8 +543,31 @@ def main() -> int:
     )
     timestamp = datetime.now(timezone.utc)
     report_start = time.perf_counter()
-    report_path = generate_reports(
-        args.output_dir,
+    if pipeline is not None:
+        # Only the rows picked in pass 2 and the closing sheets are left
+        pipeline.finish(sample, quality_report, stats, timestamp)
+    elif not args.skip_report:
+        generate_reports(
+            args.output_dir,
+            sample,
+            quality_report,
+            stats,
+            params,
+            timestamp,
+            run_id,
+            fast_writer=args.fast_report,
+            output_formats=args.output_format,
+        )
+    report_end = time.perf_counter()
+    reporting_seconds = report_end - report_start
+    outputs = {
+        name: str(report_output_path(args.output_dir, name))
+        for name in ([] if args.skip_report else args.output_format)
+    }
+    for path in outputs.values():
+        print(f"Report generated at: {path}")
+    report_inputs = save_report_inputs(
+        sidecar_path(args.output_dir, run_id),
         sample,
         quality_report,
         stats,
@@ -167,10 +575,6 @@ def main() -> int:
         timestamp,
         run_id,
     )
-    report_end = time.perf_counter()
-    reporting_seconds = report_end - report_start
-    log.info(EventCode.REPORT_WRITTEN.value, path=str(report_path))
-    print(f"Report generated at: {report_path}")
     finished_dt = datetime.now(timezone.utc)
     total_duration = time.perf_counter() - started
     # Round durations to 2 decimals
@@ -187,22 +591,148 @@ def main() -> int:
         cleaning_seconds=cleaning_seconds,
         sampling_seconds=sampling_seconds,
         reporting_seconds=reporting_seconds,
-        parameters=params.model_dump(),
+        io_wait_seconds=round(read_stats.io_wait_seconds, 2),
+        parse_seconds=round(read_stats.parse_seconds, 2),
+        parameters=params.model_dump(mode="json"),
         data_quality=quality_report.model_dump(),
         sample_statistics=stats.model_dump(),
         sample_size=len(sample),
-        output_excel=str(report_path),
+        output_excel=outputs.get("xlsx"),
+        outputs=outputs,
+        report_inputs=str(report_inputs),
     )
     runs_dir = args.output_dir / "runs"
     runs_dir.mkdir(parents=True, exist_ok=True)
+    bundle_path = runs_dir / f"{run_id}{BUNDLE_SUFFIX}"
+    if args.bundle:
+        summary.bundle = str(bundle_path)
     summary_path = runs_dir / f"{run_id}.json"
     summary_json = summary.model_dump(mode="json")
     with open(summary_path, "w", encoding="utf-8") as f:
         json.dump(summary_json, f, indent=2)
     log.info(EventCode.RUN_SUMMARY.value, path=str(summary_path))
     print(f"Summary written to: {summary_path}")
+    if args.bundle:
+        artefacts = [Path(path) for path in outputs.values()]
+        # A file left by an earlier run survives runs that never clean
+        # rows, so it is bundled only when this run rejected some
+        rejected = args.output_dir / REJECTED_FILENAME
+        if _rejected_count(quality_report) > 0 and rejected.exists():
+            artefacts.append(rejected)
+        if args.export_population is not None:
+            artefacts.append(args.export_population)
+        artefacts += [report_inputs, summary_path]
+        write_bundle(bundle_path, _bundle_names(artefacts, args.output_dir))
+        print(f"Bundle written to: {bundle_path}")
     return 0
 
 
+def _bundle_names(
+    paths: list[Path], output_dir: Path
+) -> list[tuple[Path, str]]:
+    """Name each run artefact by its path under the output directory.
+
+    Args:
+        paths (list[Path]): Files written by the run.
+        output_dir (Path): Run output directory.
+
+    Returns:
+        list[tuple[Path, str]]: Files with their names in the bundle;
+        files outside ``output_dir`` keep only their file name.
+    """
+    members = []
+    for path in paths:
+        try:
+            name = path.resolve().relative_to(output_dir.resolve())
+        except ValueError:
+            name = Path(path.name)
+        members.append((path, name.as_posix()))
+    return members
+
+
+def _run_preview(
+    args: argparse.Namespace,
+    inputs: list[Path],
+    params: SamplingParameters,
+    run_id: str,
+) -> int:
+    """Write and print the ``--preview`` estimate instead of sampling.
+
+    Args:
+        args (argparse.Namespace): Parsed CLI arguments.
+        inputs (list[Path]): Population files.
+        params (SamplingParameters): Sampling parameters.
+        run_id (str): Run identifier naming the JSON file.
+
+    Returns:
+        int: Process exit status code (0 indicates success).
+    """
+    estimate = estimate_population(
+        inputs,
+        params,
+        blocks=args.preview_blocks,
+        block_size=args.preview_block_size,
+    )
+    preview_dir = args.output_dir / "preview"
+    preview_dir.mkdir(parents=True, exist_ok=True)
+    preview_path = preview_dir / f"{run_id}.json"
+    payload = estimate.model_dump(mode="json")
+    with open(preview_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print(json.dumps(payload, indent=2))
+    print(f"Preview estimate written to: {preview_path}")
+    return 0
+
+
+def _rejected_count(quality_report: DataQualityReport) -> int:
+    """Return how many rows the cleaning pass wrote to the rejected file.
+
+    Args:
+        quality_report (DataQualityReport): Report of the current run.
+
+    Returns:
+        int: Rows neither cleaned nor excluded by the population scope;
+        ``0`` when the cleaning pass was skipped.
+    """
+    return (
+        quality_report.total_rows_raw
+        - quality_report.total_rows_cleaned
+        - quality_report.excluded_by_date
+        - quality_report.excluded_by_document_type
+        - quality_report.excluded_by_amount_band
+    )
+
+
+def _streamed_quality_report(source: str) -> DataQualityReport:
+    """Return the quality report for a population read only by streaming.
+
+    Args:
+        source (str): What the population was read from, for the note.
+
+    Returns:
+        DataQualityReport: Zero counters with a note that field-level
+        checks were skipped; row totals are filled in after sampling.
+    """
+    return DataQualityReport(
+        total_rows_raw=0,
+        total_rows_cleaned=0,
+        missing_transaction_id=0,
+        missing_amount=0,
+        missing_effective_date=0,
+        missing_document_type=0,
+        missing_description=0,
+        invalid_amount_format=0,
+        invalid_date_format=0,
+        duplicate_transaction_ids=0,
+        excluded_due_to_amount=0,
+        excluded_due_to_balance=0,
+        notes=(
+            f"Population read from {source} in streaming mode; "
+            "field-level cleaning checks were not run and rows without "
+            "a valid amount are not counted."
+        ),
+    )
+
+
 if __name__ == "__main__":
     sys.exit(main())
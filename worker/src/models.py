@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Literal
 
@@ -22,6 +22,7 @@ class CleanedTransaction(BaseModel):
     description: str | None = None
     balance_category: Literal["debit", "credit", "zero"] | None = None
     source_row_index: int
+    source_file: str | None = None
     selection_type: Literal["High Value", "Random"] | None = None
 
     @field_validator("amount_abs")
@@ -44,6 +45,12 @@ class SamplingParameters(BaseModel):
     high_value_override: float | None = Field(default=None, gt=0)
     random_seed: int = Field(default=42, ge=0)
     exclude_zero_amounts: bool = True
+    date_from: date | None = None
+    date_to: date | None = None
+    include_document_types: list[str] = Field(default_factory=list)
+    exclude_document_types: list[str] = Field(default_factory=list)
+    amount_min: float | None = Field(default=None, ge=0)
+    amount_max: float | None = Field(default=None, ge=0)
 
     @model_validator(mode="after")
     def validate_relationships(self) -> "SamplingParameters":
@@ -53,8 +60,34 @@ class SamplingParameters(BaseModel):
             raise ValueError(
                 "expected_misstatement must be less than tolerable"
             )
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        if (
+            self.amount_min is not None
+            and self.amount_max is not None
+            and self.amount_min > self.amount_max
+        ):
+            raise ValueError("amount_min must not exceed amount_max")
         return self
 
+    def has_scope_filters(self) -> bool:
+        """Return whether any population scope filter is set.
+
+        Returns:
+            bool: ``True`` when a date range, document type list or amount
+            band narrows the population.
+        """
+        return any(
+            (
+                self.date_from,
+                self.date_to,
+                self.include_document_types,
+                self.exclude_document_types,
+                self.amount_min is not None,
+                self.amount_max is not None,
+            )
+        )
+
     def sampling_interval(self) -> float:
         """Compute the sampling interval per methodology.
 
@@ -68,6 +101,30 @@ class SamplingParameters(BaseModel):
         return span / self.assurance_factor
 
 
+class BreakdownGroup(BaseModel):
+    """Population and sample totals for one value of a breakdown key."""
+
+    key: str
+    count: int = 0
+    amount_abs: float = 0.0
+    high_value_count: int = 0
+    sample_count: int = 0
+    sample_amount_abs: float = 0.0
+
+
+class PopulationBreakdown(BaseModel):
+    """Population totals by document type, balance category and month.
+
+    Each key tracks at most ``max_groups`` values; rows with further
+    values are added to an ``(other)`` group.
+    """
+
+    max_groups: int
+    document_type: list[BreakdownGroup] = Field(default_factory=list)
+    balance_category: list[BreakdownGroup] = Field(default_factory=list)
+    month: list[BreakdownGroup] = Field(default_factory=list)
+
+
 class SampleStatistics(BaseModel):
     """Summary metrics describing the final sample."""
 
@@ -80,6 +137,7 @@ class SampleStatistics(BaseModel):
     coverage_percent: float
     excluded_zero_amounts: int = 0
     excluded_due_to_balance: int = 0
+    breakdown: PopulationBreakdown | None = None
 
 
 class DataQualityReport(BaseModel):
@@ -98,9 +156,99 @@ class DataQualityReport(BaseModel):
     excluded_due_to_amount: int
     excluded_due_to_balance: int
     excluded_zero_amounts: int = 0
+    excluded_by_date: int = 0
+    excluded_by_document_type: int = 0
+    excluded_by_amount_band: int = 0
+    validation_failed: int = 0
     notes: str = ""
 
 
+class EstimateRange(BaseModel):
+    """Point estimate with lower and upper confidence bounds."""
+
+    estimate: float
+    lower: float
+    upper: float
+
+
+class PopulationEstimate(BaseModel):
+    """Approximate population metrics extrapolated from sampled blocks.
+
+    Produced by ``--preview``; every figure is an estimate unless
+    ``exact`` is set (the sampled blocks covered the whole input).
+    """
+
+    is_estimate: bool = True
+    exact: bool = False
+    method: str = "stratified random byte blocks aligned to line starts"
+    confidence_level: float
+    files: list[str]
+    bytes_total: int
+    bytes_sampled: int
+    blocks_sampled: int
+    rows_sampled: int
+    sampling_interval: float
+    rows: EstimateRange
+    population_size: EstimateRange
+    population_balance_abs: EstimateRange
+    high_value_count: EstimateRange
+    random_sample_count: EstimateRange
+    elapsed_seconds: float
+    notes: str = ""
+
+
+class SamplingState(BaseModel):
+    """Progress of an incremental run over an append-only CSV.
+
+    Written after each ``--state`` run so the next one reads only the
+    bytes appended since ``offset``. The prefix and tail digests detect a
+    truncated or rewritten file. The transaction ID Bloom filter is kept
+    in the binary file ``id_sketch_file``, beside the state file.
+    """
+
+    version: int
+    input_path: str
+    parameters: str
+    header: list[str]
+    offset: int
+    ends_with_newline: bool
+    prefix_sha256: str
+    tail_sha256: str
+    rows_read: int
+    cleaned_rows: int
+    rejected_rows: int
+    metrics: dict[str, int]
+    duplicate_ids: int
+    id_sketch_file: str
+    id_sketch_capacity: int
+    population_size: int
+    total_abs: float
+    remaining_abs: float
+    eligible_count: int
+    excluded_zero: int
+    excluded_balance: int
+    high_value: list[CleanedTransaction]
+    candidate_capacity: int
+    candidates: list[tuple[float, CleanedTransaction]]
+    rng_state: list[int]
+
+
+class ReportInputs(BaseModel):
+    """Everything ``generate_reports`` needs, persisted beside the run summary.
+
+    The ``report`` command rebuilds any output from it without reading
+    the population again.
+    """
+
+    version: int
+    run_id: str
+    timestamp: datetime
+    parameters: SamplingParameters
+    quality_report: DataQualityReport
+    sample_statistics: SampleStatistics
+    sample: list[CleanedTransaction]
+
+
 class EventCode(str, Enum):
     """Enumeration of structured logging event codes."""
 
@@ -108,12 +256,20 @@ class EventCode(str, Enum):
     RAW_LOADED = "RAW_LOADED"
     QUALITY_REPORT = "QUALITY_REPORT"
     CLEANING_DONE = "CLEANING_DONE"
+    ROWS_REJECTED = "ROWS_REJECTED"
     STREAM_PASS1_START = "STREAM_PASS1_START"
     STREAM_PASS1_DONE = "STREAM_PASS1_DONE"
     STREAM_PASS2_START = "STREAM_PASS2_START"
     STREAM_PASS2_DONE = "STREAM_PASS2_DONE"
     SAMPLING_DONE = "SAMPLING_DONE"
+    PREVIEW_DONE = "PREVIEW_DONE"
+    STATE_LOADED = "STATE_LOADED"
+    STATE_SAVED = "STATE_SAVED"
+    POPULATION_EXPORTED = "POPULATION_EXPORTED"
+    REPORT_INPUTS_SAVED = "REPORT_INPUTS_SAVED"
+    REPORT_INPUTS_LOADED = "REPORT_INPUTS_LOADED"
     REPORT_WRITTEN = "REPORT_WRITTEN"
+    BUNDLE_WRITTEN = "BUNDLE_WRITTEN"
     RUN_SUMMARY = "RUN_SUMMARY"
 
 
@@ -127,10 +283,15 @@ class RunSummary(BaseModel):
     cleaning_seconds: float
     sampling_seconds: float
     reporting_seconds: float
+    io_wait_seconds: float = 0.0
+    parse_seconds: float = 0.0
     parameters: dict
     data_quality: dict
     sample_statistics: dict
     sample_size: int
-    output_excel: str
+    output_excel: str | None = None
+    outputs: dict[str, str] = Field(default_factory=dict)
+    report_inputs: str | None = None
+    bundle: str | None = None
     methodology: str = "RSM Random Non-Statistical"
     version: str = "1.0.0"
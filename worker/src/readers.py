@@ -0,0 +1,856 @@
+"""Population readers shared by the cleaning and streaming paths."""
+
+from __future__ import annotations
+
+import csv
+import glob
+import io
+import itertools
+import mmap
+import pickle
+import queue
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Generator,
+    Iterable,
+    Iterator,
+    Sequence,
+    cast,
+)
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_PREFETCH_DEPTH = 0
+SPOOL_BATCH_ROWS = 4096
+STDIN = "-"
+COLUMNAR_SUFFIXES = frozenset(
+    {".parquet", ".pq", ".feather", ".arrow", ".ipc"}
+)
+SQLITE_SUFFIXES = frozenset({".db", ".sqlite", ".sqlite3"})
+EXCEL_SUFFIXES = frozenset({".xlsx", ".xlsm"})
+
+POPULATION_SUFFIXES = COLUMNAR_SUFFIXES | EXCEL_SUFFIXES | {".csv"}
+
+_BOM = b"\xef\xbb\xbf"
+# Binary streams read with ``readinto``: unbuffered files, pipes and the
+# proxies below
+ByteStream = io.RawIOBase | io.BufferedIOBase
+_GLOB_CHARS = frozenset("*?[")
+
+
+def is_stdin(path: str | Path) -> bool:
+    """Return whether a population path stands for standard input.
+
+    Args:
+        path (str | Path): Population file path.
+
+    Returns:
+        bool: ``True`` for ``-``.
+    """
+    return str(path) == STDIN
+
+
+def is_columnar(path: Path) -> bool:
+    """Return whether a population path names a columnar file.
+
+    Args:
+        path (Path): Population file path.
+
+    Returns:
+        bool: ``True`` for Parquet or Arrow IPC/Feather suffixes.
+    """
+    return Path(path).suffix.lower() in COLUMNAR_SUFFIXES
+
+
+def is_excel(path: Path) -> bool:
+    """Return whether a population path names an Excel workbook.
+
+    Args:
+        path (Path): Population file path.
+
+    Returns:
+        bool: ``True`` for ``.xlsx`` or ``.xlsm`` suffixes.
+    """
+    return Path(path).suffix.lower() in EXCEL_SUFFIXES
+
+
+def is_sqlite(path: Path) -> bool:
+    """Return whether a population path names a SQLite database.
+
+    Args:
+        path (Path): Population file path.
+
+    Returns:
+        bool: ``True`` for ``.db``, ``.sqlite`` or ``.sqlite3`` suffixes.
+    """
+    return Path(path).suffix.lower() in SQLITE_SUFFIXES
+
+
+def resolve_inputs(specs: str | Path | Sequence[str | Path]) -> list[Path]:
+    """Expand population input specs into an ordered list of files.
+
+    Each spec may be a file, a directory (its CSV and columnar files,
+    sorted by name), a glob pattern (matches sorted by path) or ``-`` for
+    CSV on standard input. Order is preserved across specs and repeated
+    files are kept once.
+
+    Args:
+        specs (str | Path | Sequence[str | Path]): One spec or several.
+
+    Returns:
+        list[Path]: Population files in sampling order.
+
+    Raises:
+        FileNotFoundError: If a directory or pattern matches no files.
+    """
+    if isinstance(specs, (str, Path)):
+        specs = [specs]
+    paths: list[Path] = []
+    for spec in specs:
+        path = Path(spec)
+        if is_stdin(spec):
+            matches = [path]
+        elif path.is_dir():
+            matches = sorted(
+                p
+                for p in path.iterdir()
+                if p.is_file() and p.suffix.lower() in POPULATION_SUFFIXES
+            )
+        elif _GLOB_CHARS.intersection(str(spec)):
+            matches = [
+                Path(p)
+                for p in sorted(glob.glob(str(spec)))
+                if Path(p).is_file()
+            ]
+        else:
+            matches = [path]
+        if not matches:
+            raise FileNotFoundError(f"No population files match {spec}")
+        paths.extend(p for p in matches if p not in paths)
+    return paths
+
+
+def iter_csv_rows(
+    file_path: Path, block_size: int = DEFAULT_BLOCK_SIZE
+) -> Iterator[dict[str, str]]:
+    """Yield CSV rows keyed by header, mirroring ``csv.DictReader``.
+
+    Args:
+        file_path (Path): Population CSV file path.
+        block_size (int): Bytes read per block by the fast tokeniser.
+
+    Returns:
+        Iterator[dict[str, str]]: Raw rows keyed by column header.
+    """
+    records = iter_csv_records(file_path, block_size)
+    header = next(records, None)
+    if header is None:
+        return
+    width = len(header)
+    for record in records:
+        if len(record) == width:
+            yield dict(zip(header, record))
+        else:
+            yield _ragged_row(header, record)
+
+
+class ReadStats:
+    """Reader timings accumulated across streaming passes.
+
+    ``io_wait_seconds`` is time the parsing thread spent blocked on input:
+    inside read calls, copying blocks out of a memory mapping (where page
+    faults land), or waiting on the prefetch queue. Everything else inside
+    a pass counts as parsing.
+    """
+
+    def __init__(self) -> None:
+        self.io_wait_seconds = 0.0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def parse_seconds(self) -> float:
+        """Pass time not spent waiting for I/O."""
+        return max(0.0, self.elapsed_seconds - self.io_wait_seconds)
+
+    def add_concurrent(
+        self, workers: Sequence["ReadStats"], elapsed: float
+    ) -> None:
+        """Add a span in which several readers ran side by side.
+
+        Each worker's wait is measured against its own elapsed time.
+        Summing the waits against wall-clock time could exceed it, so the
+        span adds the workers' overall waiting share of ``elapsed``.
+
+        Args:
+            workers (Sequence[ReadStats]): One worker's timings each.
+            elapsed (float): Wall-clock duration of the span.
+        """
+        busy = sum(worker.elapsed_seconds for worker in workers)
+        waited = sum(worker.io_wait_seconds for worker in workers)
+        self.elapsed_seconds += elapsed
+        if busy > 0:
+            self.io_wait_seconds += elapsed * min(1.0, waited / busy)
+
+    def reset(self) -> None:
+        """Zero both timings."""
+        self.io_wait_seconds = 0.0
+        self.elapsed_seconds = 0.0
+
+
+def _timed_readinto(
+    raw: ByteStream, buffer: Any, stats: ReadStats | None
+) -> int:
+    """Fill ``buffer`` from ``raw``, counting the call as I/O wait."""
+    if stats is None:
+        return raw.readinto(buffer) or 0
+    started = time.perf_counter()
+    n = raw.readinto(buffer) or 0
+    stats.io_wait_seconds += time.perf_counter() - started
+    return n
+
+
+class PrefetchReader(io.RawIOBase):
+    """Read-ahead proxy filling a bounded queue from a background thread.
+
+    The thread reads ``block_size`` blocks (releasing the GIL inside the
+    read syscall) while the consumer parses the previous block. At most
+    ``depth`` blocks are buffered.
+    """
+
+    def __init__(
+        self,
+        raw: ByteStream,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        depth: int = 4,
+        stats: ReadStats | None = None,
+    ) -> None:
+        super().__init__()
+        self._raw = raw
+        self._block_size = block_size
+        self._stats = stats
+        self._queue: queue.Queue[bytes | BaseException] = queue.Queue(
+            maxsize=max(1, depth)
+        )
+        self._stop = threading.Event()
+        self._current = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(
+            target=self._fill, name="csv-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._current:
+            if self._eof:
+                return 0
+            started = time.perf_counter()
+            item = self._queue.get()
+            if self._stats is not None:
+                self._stats.io_wait_seconds += time.perf_counter() - started
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._current = memoryview(item)
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+    def close(self) -> None:
+        """Stop the read-ahead thread; the wrapped file stays open."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        super().close()
+
+    def _fill(self) -> None:
+        """Background loop reading blocks until EOF or close."""
+        try:
+            while not self._stop.is_set():
+                block = self._raw.read(self._block_size) or b""
+                self._put(block)
+                if not block:
+                    return
+        except BaseException as exc:  # surfaced on the consumer side
+            self._put(exc)
+
+    def _put(self, item: bytes | BaseException) -> None:
+        """Queue an item, giving up once the reader is closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def iter_csv_records(
+    file_path: Path,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+    stats: ReadStats | None = None,
+) -> Generator[list[str], None, None]:
+    """Yield CSV records as field lists, header first, skipping blank lines.
+
+    A prefix of the file is sniffed first. When it contains no quotes
+    and no bare carriage returns, blocks are read with ``readinto`` and
+    split in bulk; the ``csv`` module takes over from the first block
+    where a quote appears.
+
+    Args:
+        file_path (Path): Population CSV file path, or ``-`` for standard
+            input (read once and left open).
+        block_size (int): Bytes read per block by the fast tokeniser.
+        prefetch_depth (int): Blocks read ahead on a background thread;
+            ``0`` reads inline.
+        stats (ReadStats | None): Optional accumulator for I/O wait time,
+            spent in inline reads or on the prefetch queue.
+
+    Returns:
+        Generator[list[str], None, None]: Field lists in file order.
+    """
+    if is_stdin(file_path):
+        yield from _iter_stream(
+            _stdin_stream(), block_size, prefetch_depth, stats
+        )
+        return
+    with open(file_path, "rb", buffering=0) as raw:
+        yield from _iter_stream(raw, block_size, prefetch_depth, stats)
+
+
+def _stdin_stream() -> ByteStream:
+    """Return standard input's binary stream (a ``BufferedReader``)."""
+    return cast(io.BufferedIOBase, sys.stdin.buffer)
+
+
+def _iter_stream(
+    raw: ByteStream,
+    block_size: int,
+    prefetch_depth: int,
+    stats: ReadStats | None,
+) -> Generator[list[str], None, None]:
+    """Tokenise a binary stream, reading ahead when ``prefetch_depth > 0``.
+
+    Args:
+        raw (ByteStream): Binary stream positioned at the start.
+        block_size (int): Bytes read per block.
+        prefetch_depth (int): Blocks read ahead on a background thread.
+        stats (ReadStats | None): Optional accumulator for I/O wait time.
+
+    Returns:
+        Generator[list[str], None, None]: Field lists in stream order;
+        closing it stops the read-ahead thread.
+    """
+    if prefetch_depth <= 0:
+        yield from _iter_records(raw, block_size, stats)
+        return
+    with PrefetchReader(raw, block_size, prefetch_depth, stats) as ahead:
+        yield from _iter_records(ahead, block_size)
+
+
+def _iter_records(
+    raw: ByteStream, block_size: int, stats: ReadStats | None = None
+) -> Iterator[list[str]]:
+    """Tokenise a binary stream, falling back to ``csv`` on quoted input.
+
+    Args:
+        raw (ByteStream): Unbuffered binary stream positioned at the start.
+        block_size (int): Bytes read per block.
+        stats (ReadStats | None): Optional accumulator for the time spent
+            in read calls.
+
+    Returns:
+        Iterator[list[str]]: Field lists in stream order.
+    """
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    carry = b""
+    first = True
+
+    while True:
+        n = _timed_readinto(raw, buffer, stats)
+        if not n:
+            break
+        block = carry + view[:n].tobytes()
+        if first:
+            first = False
+            if block.startswith(_BOM):
+                block = block[len(_BOM) :]
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            carry = block
+            continue
+        chunk, carry = block[:cut], block[cut:]
+        if not _is_plain(chunk):
+            yield from _csv_fallback(chunk, carry, raw, stats)
+            return
+        yield from _split_chunk(chunk.decode("utf-8"))
+
+    if carry:
+        if not _is_plain(carry):
+            yield from _csv_fallback(carry, b"", raw, stats)
+            return
+        yield from _split_chunk(carry.decode("utf-8"))
+
+
+def _is_plain(chunk: bytes) -> bool:
+    """Return whether a chunk can be split without the ``csv`` module.
+
+    Args:
+        chunk (bytes): Raw bytes ending on a line boundary (or at EOF).
+
+    Returns:
+        bool: ``True`` when the chunk has no quotes or bare ``\\r``.
+    """
+    if b'"' in chunk:
+        return False
+    return chunk.count(b"\r") == chunk.count(b"\r\n")
+
+
+def _split_chunk(text: str) -> Iterator[list[str]]:
+    """Split decoded, unquoted text into field lists.
+
+    Args:
+        text (str): Whole lines of CSV text without quotes.
+
+    Returns:
+        Iterator[list[str]]: One field list per non-blank line.
+    """
+    for line in text.split("\n"):
+        if line and line[-1] == "\r":
+            line = line[:-1]
+        if line:
+            yield line.split(",")
+
+
+def _csv_fallback(
+    chunk: bytes,
+    carry: bytes,
+    raw: ByteStream,
+    stats: ReadStats | None = None,
+) -> Iterator[list[str]]:
+    """Hand the remainder of the stream to the ``csv`` module.
+
+    Args:
+        chunk (bytes): Already-read whole lines not yet tokenised.
+        carry (bytes): Already-read partial line following ``chunk``.
+        raw (ByteStream): Stream positioned right after ``carry``.
+        stats (ReadStats | None): Optional accumulator for read time.
+
+    Returns:
+        Iterator[list[str]]: Field lists parsed by ``csv.reader``.
+    """
+    head = io.StringIO(chunk.decode("utf-8"), newline="")
+    tail = io.TextIOWrapper(
+        io.BufferedReader(_Remainder(carry, raw, stats)),
+        encoding="utf-8",
+        newline="",
+    )
+    lines: Iterable[str] = itertools.chain(head, tail)
+    for record in csv.reader(lines):
+        if record:
+            yield record
+
+
+class _Remainder(io.RawIOBase):
+    """Raw stream replaying buffered bytes before the rest of a file.
+
+    Closing the proxy leaves the wrapped file open for its owner.
+    """
+
+    def __init__(
+        self,
+        prefix: bytes,
+        raw: ByteStream,
+        stats: ReadStats | None = None,
+    ) -> None:
+        self._prefix = prefix
+        self._raw = raw
+        self._stats = stats
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        return _timed_readinto(self._raw, buffer, self._stats)
+
+
+class CsvPopulation:
+    """CSV population opened once and scanned field-by-field per pass.
+
+    Files are memory-mapped: each pass slices lines from the mapping in
+    blocks and splits only up to the requested column, so the bytes of
+    other columns are never decoded. Lines are kept as raw ``bytes``
+    handles and decoded only when a caller asks for the full record. Both
+    passes share the mapping, leaving repeat reads to the OS page cache.
+    From the first block holding a quote or a bare ``\r``, the rest of
+    the file is parsed by the ``csv`` module, whose field lists serve as
+    handles. A header line that needs the ``csv`` module leaves the file
+    unmapped, read through ``iter_csv_records``.
+
+    A positive ``prefetch_depth`` skips the mapping and reads blocks
+    ahead on a background thread instead, which suits network-attached
+    storage where page faults would stall the parsing thread.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        use_mmap: bool = True,
+        prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+        stats: ReadStats | None = None,
+    ) -> None:
+        self.path = Path(file_path)
+        self.block_size = block_size
+        self.prefetch_depth = prefetch_depth
+        self.stats = stats
+        self.header: list[str] = []
+        self._file: BinaryIO | None = None
+        self._mm: mmap.mmap | None = None
+        self._data_start = 0
+        if use_mmap and prefetch_depth <= 0:
+            self._map()
+        if self._mm is None:
+            records = iter_csv_records(self.path, block_size)
+            self.header = next(records, [])
+            records.close()
+
+    @property
+    def mapped(self) -> bool:
+        """Whether passes read from the memory mapping."""
+        return self._mm is not None
+
+    def __enter__(self) -> "CsvPopulation":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the mapping and file handle."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def iter_fields(
+        self, position: int
+    ) -> Iterator[tuple[str | bytes | None, Any]]:
+        """Yield one field per data row plus a handle to the full row.
+
+        Args:
+            position (int): Column position to extract, ``-1`` for none.
+
+        Returns:
+            Iterator[tuple[str | bytes | None, Any]]: The field (raw bytes
+            when mapped, ``None`` when the row is too short) and a handle
+            accepted by :meth:`record`.
+        """
+        if self._mm is None:
+            records = iter_csv_records(
+                self.path, self.block_size, self.prefetch_depth, self.stats
+            )
+            next(records, None)
+            for record in records:
+                if 0 <= position < len(record):
+                    yield record[position], record
+                else:
+                    yield None, record
+            return
+        for line in self._iter_lines():
+            if isinstance(line, list):  # parsed by the csv module
+                if 0 <= position < len(line):
+                    yield line[position], line
+                else:
+                    yield None, line
+                continue
+            if position < 0:
+                yield None, line
+                continue
+            parts = line.split(b",", position + 1)
+            if position < len(parts):
+                yield parts[position], line
+            else:
+                yield None, line
+
+    def record(self, handle: Any) -> list[str]:
+        """Decode a row handle from :meth:`iter_fields` into its fields.
+
+        Args:
+            handle (Any): Handle yielded alongside a field.
+
+        Returns:
+            list[str]: Field values for the row.
+        """
+        if isinstance(handle, bytes):
+            return handle.decode("utf-8").split(",")
+        return handle
+
+    def _map(self) -> None:
+        """Map the file when it is non-empty and its header is unquoted.
+
+        Only the header line is checked here; the data lines are checked
+        block by block as the passes read them.
+        """
+        self._file = open(self.path, "rb")
+        try:
+            mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            self.close()
+            return
+        pos = len(_BOM) if mm[: len(_BOM)] == _BOM else 0
+        size = len(mm)
+        while pos < size:
+            end = _next_line_end(mm, pos)
+            line = mm[pos:end]
+            pos = end
+            if not _is_plain(line):
+                mm.close()
+                self.close()
+                return
+            line = line.rstrip(b"\r\n")
+            if line:
+                self.header = line.decode("utf-8").split(",")
+                break
+        self._mm = mm
+        self._data_start = pos
+
+    def _iter_lines(self) -> Iterator[bytes | list[str]]:
+        """Yield non-blank data lines sliced from the mapping in blocks.
+
+        Each block is copied out of the mapping once and split into lines
+        in C. Walking newline and comma offsets over the mapping instead
+        would copy only the amount field, but the per-line ``find`` calls
+        cost more in Python than the copy and split they save.
+
+        Returns:
+            Iterator[bytes | list[str]]: Raw lines, then field lists from
+            the ``csv`` module once a block holds a quote or bare ``\r``.
+        """
+        mm = self._mm
+        assert mm is not None
+        size = len(mm)
+        pos = self._data_start
+        while pos < size:
+            end = min(pos + self.block_size, size)
+            if end < size:
+                cut = mm.rfind(b"\n", pos, end)
+                end = cut + 1 if cut >= 0 else _next_line_end(mm, end)
+            if self.stats is None:
+                chunk = mm[pos:end]
+            else:
+                # Page faults are taken while copying out of the mapping
+                started = time.perf_counter()
+                chunk = mm[pos:end]
+                self.stats.io_wait_seconds += time.perf_counter() - started
+            if not _is_plain(chunk):
+                yield from self._parse_from(pos)
+                return
+            for line in chunk.split(b"\n"):
+                if line and line[-1] == 13:
+                    line = line[:-1]
+                if line:
+                    yield line
+            pos = end
+
+    def _parse_from(self, offset: int) -> Iterator[list[str]]:
+        """Parse the file from ``offset`` (a line start) with ``csv``."""
+        with open(self.path, "rb") as raw:
+            raw.seek(offset)
+            yield from _csv_fallback(b"", b"", raw, self.stats)
+
+
+def _next_line_end(mm: mmap.mmap, pos: int) -> int:
+    """Return the offset just past the next newline (or end of file)."""
+    nl = mm.find(b"\n", pos)
+    return len(mm) if nl < 0 else nl + 1
+
+
+def _ragged_row(header: list[str], record: list[str]) -> dict[str, str]:
+    """Key a short or long record the way ``csv.DictReader`` does.
+
+    Args:
+        header (list[str]): Column headers.
+        record (list[str]): Field values for one row.
+
+    Returns:
+        dict[str, str]: Row with missing fields set to ``None`` and any
+        surplus fields collected under the ``None`` key.
+    """
+    row: dict = dict(zip(header, record))
+    width = len(header)
+    if len(record) > width:
+        row[None] = record[width:]
+    else:
+        for key in header[len(record) :]:
+            row[key] = None
+    return row
+
+
+def _to_text(value: Any) -> Any:
+    """Convert a typed cell into the form the cleaner parses.
+
+    Args:
+        value (Any): Python value produced by a typed source.
+
+    Returns:
+        Any: ``""`` for nulls, ``datetime`` for dates, text otherwise.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return str(value)
+
+
+class RowSpool:
+    """Temporary file of pickled row batches, replayed in write order.
+
+    Sources that cannot be read twice (standard input) or are costly to
+    parse twice (workbooks) keep the pass-1 rows still eligible for random
+    selection here, so pass 2 reads the spool instead of the source.
+    """
+
+    def __init__(
+        self, prefix: str = "spool-", batch_rows: int = SPOOL_BATCH_ROWS
+    ) -> None:
+        self.rows = 0
+        self._prefix = prefix
+        self._batch_rows = batch_rows
+        self._file: BinaryIO | None = None
+        self._batch: list[Any] = []
+
+    def append(self, row: Any) -> None:
+        """Add one row, writing a batch once it is full.
+
+        Args:
+            row (Any): Picklable row.
+        """
+        self._batch.append(row)
+        self.rows += 1
+        if len(self._batch) >= self._batch_rows:
+            self._flush()
+
+    def replay(self) -> Iterator[Any]:
+        """Yield every appended row in order.
+
+        Returns:
+            Iterator[Any]: Rows as appended.
+        """
+        self._flush()
+        if self._file is None:
+            return
+        self._file.seek(0)
+        while True:
+            try:
+                batch = pickle.load(self._file)
+            except EOFError:
+                return
+            yield from batch
+
+    def close(self) -> None:
+        """Delete the spool file."""
+        self._batch = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flush(self) -> None:
+        """Append the pending batch to the spool file."""
+        if not self._batch:
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix=self._prefix)
+        else:
+            self._file.seek(0, io.SEEK_END)
+        pickle.dump(self._batch, self._file, pickle.HIGHEST_PROTOCOL)
+        self._batch = []
+
+
+class PipePopulation:
+    """CSV population on a stream that can only be read once.
+
+    Pass 1 reads the stream; the sampler spools the rows still eligible
+    for random selection (their index, parsed amount and field list) to a
+    :class:`RowSpool`, and pass 2 replays the spool. High-value and
+    filtered-out rows are never written, so the spool holds only the
+    random-selection candidates.
+    """
+
+    def __init__(
+        self,
+        stream: ByteStream | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+        stats: ReadStats | None = None,
+    ) -> None:
+        self._records = _iter_stream(
+            _stdin_stream() if stream is None else stream,
+            block_size,
+            prefetch_depth,
+            stats,
+        )
+        self.header: list[str] = next(self._records, [])
+        self.spool = RowSpool(prefix="stdin-spool-")
+        self.consumed = False
+
+    def __enter__(self) -> "PipePopulation":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop reading the stream and delete the spool."""
+        self._records.close()
+        self.spool.close()
+
+    def iter_fields(self, position: int) -> Iterator[tuple[str | None, Any]]:
+        """Yield one field per data row plus the full field list, once.
+
+        Args:
+            position (int): Column position to extract, ``-1`` for none.
+
+        Returns:
+            Iterator[tuple[str | None, Any]]: The field (``None`` when the
+            row is too short) and the row's field list.
+
+        Raises:
+            RuntimeError: If the stream was already read.
+        """
+        if self.consumed:
+            raise RuntimeError("A piped population can only be read once.")
+        self.consumed = True
+        for record in self._records:
+            if 0 <= position < len(record):
+                yield record[position], record
+            else:
+                yield None, record
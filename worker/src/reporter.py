@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import csv
+import json
+import multiprocessing
+import pickle
+import queue
+import tempfile
+import threading
+from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterable, Iterator, Sequence
 
 import xlsxwriter
 from logging_setup import get_logger
@@ -12,6 +20,7 @@ from models import (
     CleanedTransaction,
     DataQualityReport,
     EventCode,
+    PopulationBreakdown,
     SampleStatistics,
     SamplingParameters,
 )
@@ -28,6 +37,33 @@ RSM_LIGHT_BLUE = "e5f5fc"
 
 REPORT_FILENAME = "sample_selection_output.xlsx"
 
+SAMPLE_SHEET = "Sample Selected"
+SAMPLE_FIRST_ROW = 3
+# Excel's row limit less the banner, spacer and header rows
+SAMPLE_ROWS_PER_SHEET = 1_048_576 - SAMPLE_FIRST_ROW
+
+# Sample fields in the order every sink receives them
+SAMPLE_COLUMNS = (
+    "transaction_id",
+    "amount_signed",
+    "amount_abs",
+    "effective_date",
+    "document_type",
+    "description",
+    "balance_category",
+    "selection_type",
+    "source_row_index",
+    "source_file",
+)
+DATE_COLUMN = SAMPLE_COLUMNS.index("effective_date")
+SINK_BATCH_ROWS = 4096
+SINK_QUEUE_BATCHES = 8
+# render_report: workbooks up to this many sample rows are assembled in
+# memory; larger ones stream rows through xlsxwriter's temp files
+IN_MEMORY_MAX_ROWS = 100_000
+# Rendered workbooks stay in memory up to this size, then spill to disk
+REPORT_SPOOL_BYTES = 32 << 20
+
 log = get_logger("reporter")
 
 
@@ -40,9 +76,15 @@ def generate_reports(
     timestamp: datetime,
     run_id: str,
     show_progress: bool = False,
+    fast_writer: bool = False,
+    output_formats: Sequence[str] = ("xlsx",),
 ) -> Path:
     """Generate Excel report per methodology requirements.
 
+    Every format in ``output_formats`` gets its own ``ReportSink``; the
+    sample is turned into rows once and the sinks write them concurrently
+    (see ``_SinkFeeder``).
+
     Args:
         output_dir (Path): Directory that will receive the Excel report.
         sample (list[CleanedTransaction]): Selected sample transactions.
@@ -52,26 +94,842 @@ def generate_reports(
         timestamp (datetime): Timestamp applied to workbook metadata.
         run_id (str): Unique identifier for the execution run.
         show_progress (bool): Whether to display progress bars while writing.
+        fast_writer (bool): Write sample rows in bulk with column formats
+            and real Excel dates (see ``_write_sample_rows_fast``).
+        output_formats (Sequence[str]): Keys of ``OUTPUT_SINKS`` to write.
+
+    Returns:
+        Path: Filesystem path to the first requested output, the Excel
+        workbook by default.
+
+    Raises:
+        ValueError: If no format, or an unknown one, is requested.
+    """
+    sinks = _build_sinks(
+        output_dir, output_formats, params, run_id, fast_writer
+    )
+    for sink in sinks:
+        sink.set_results(quality_report, sample_stats, timestamp)
+    _feed_sinks(sinks, sample, show_progress)
+    _log_outputs(sinks)
+    return sinks[0].path
+
+
+def render_report(
+    sample: list[CleanedTransaction],
+    quality_report: DataQualityReport,
+    sample_stats: SampleStatistics,
+    params: SamplingParameters,
+    timestamp: datetime,
+    run_id: str,
+    fast_writer: bool = False,
+    spool_bytes: int = REPORT_SPOOL_BYTES,
+) -> IO[bytes]:
+    """Build the Excel workbook in a buffer rather than in the output dir.
+
+    Samples of up to ``IN_MEMORY_MAX_ROWS`` rows use xlsxwriter's
+    ``in_memory`` mode and touch no disk at all. The finished workbook is
+    held in a spooled temporary file that moves to disk only past
+    ``spool_bytes``.
+
+    Args:
+        sample (list[CleanedTransaction]): Selected sample transactions.
+        quality_report (DataQualityReport): Data quality statistics.
+        sample_stats (SampleStatistics): Calculated sampling metrics.
+        params (SamplingParameters): Parameters used to drive sampling.
+        timestamp (datetime): Timestamp applied to workbook metadata.
+        run_id (str): Unique identifier for the execution run.
+        fast_writer (bool): Use the bulk Sample Selected writer.
+        spool_bytes (int): Workbook size kept in memory.
+
+    Returns:
+        IO[bytes]: The ``.xlsx`` bytes, positioned at the start; the
+        caller closes it.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    sink = XlsxSink(
+        Path(REPORT_FILENAME), params, run_id, fast_writer, output=output
+    )
+    sink.set_results(quality_report, sample_stats, timestamp)
+    try:
+        _feed_sinks([sink], sample)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+
+class ReportPipeline:
+    """Report writer that starts while the streaming sampler still runs.
+
+    ``start`` is the sampler's ``on_high_value`` hook: once pass 1 has
+    picked the high-value rows and fixed the sample size, the sinks are
+    opened in a separate process, which writes those rows while pass 2
+    selects the random rows. Both sides are CPU-bound Python, so threads
+    would only take turns on the GIL. ``finish`` sends the random rows
+    and the final statistics; the workbook's summary and parameters
+    sheets are written last. The coverage banner on the sample sheets is
+    written before the statistics exist, so it is a formula over them.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        params: SamplingParameters,
+        run_id: str,
+        source_column: bool = False,
+        show_progress: bool = False,
+        fast_writer: bool = False,
+        output_formats: Sequence[str] = ("xlsx",),
+    ) -> None:
+        """Validate the formats; nothing is written before ``start``.
+
+        Args:
+            output_dir (Path): Directory that will receive the outputs.
+            params (SamplingParameters): Parameters used to drive sampling.
+            run_id (str): Unique identifier for the execution run.
+            source_column (bool): Whether rows carry a source file, i.e.
+                the population has several input files.
+            show_progress (bool): Whether to show a progress bar.
+            fast_writer (bool): Use the bulk Sample Selected writer.
+            output_formats (Sequence[str]): Keys of ``OUTPUT_SINKS``.
+
+        Raises:
+            ValueError: If no format, or an unknown one, is requested.
+        """
+        self.sinks = _build_sinks(
+            output_dir,
+            output_formats,
+            params,
+            run_id,
+            fast_writer,
+            coverage_formula=True,
+        )
+        self.source_column = source_column
+        self.show_progress = show_progress
+        self.row_count = 0
+        self._process: Any = None
+        self._inbox: Any = None
+        self._outbox: Any = None
+        self._early: threading.Thread | None = None
+        self._early_error: BaseException | None = None
+        self._written = 0
+
+    def start(
+        self, high_value: list[CleanedTransaction], sample_size: int
+    ) -> None:
+        """Start the writer process and send it the high-value rows.
+
+        Args:
+            high_value (list[CleanedTransaction]): Rows at the head of the
+                sample, selected in streaming pass 1.
+            sample_size (int): Final number of sample rows.
+        """
+        context = multiprocessing.get_context("spawn")
+        self._inbox = context.Queue(maxsize=SINK_QUEUE_BATCHES)
+        self._outbox = context.Queue()
+        self._process = context.Process(
+            target=_run_sinks_process,
+            args=(
+                self.sinks,
+                sample_size,
+                self.source_column,
+                self._inbox,
+                self._outbox,
+            ),
+            name="report-writer",
+            daemon=True,
+        )
+        self._process.start()
+        self.row_count = sample_size
+        self._written = len(high_value)
+        # Sent from a thread so pass 2 starts without waiting for the queue
+        self._early = threading.Thread(
+            target=self._send_early,
+            args=(high_value,),
+            name="report-high-value",
+            daemon=True,
+        )
+        self._early.start()
+
+    def finish(
+        self,
+        sample: list[CleanedTransaction],
+        quality_report: DataQualityReport,
+        sample_stats: SampleStatistics,
+        timestamp: datetime,
+    ) -> Path:
+        """Send the rest of the sample and wait for every output.
+
+        Without an earlier ``start`` (a sampler that has no separate
+        high-value pass) the whole sample is sent here. If anything fails
+        on this side, the writer process is told to abort and deletes the
+        outputs instead of finishing them.
+
+        Args:
+            sample (list[CleanedTransaction]): The final sample, starting
+                with the rows given to ``start``.
+            quality_report (DataQualityReport): Data quality statistics.
+            sample_stats (SampleStatistics): Calculated sampling metrics.
+            timestamp (datetime): Timestamp applied to workbook metadata.
+
+        Returns:
+            Path: Filesystem path to the first requested output.
+
+        Raises:
+            ValueError: If the sample does not have the size announced to
+                ``start``.
+            BaseException: The first error raised by a sink.
+        """
+        if self._process is None:
+            self.start([], len(sample))
+        aborted = True
+        try:
+            if self._early is not None:
+                self._early.join()
+            if self._early_error is not None:
+                raise self._early_error
+            if len(sample) != self.row_count:
+                raise ValueError(
+                    f"Sample has {len(sample)} rows, expected "
+                    f"{self.row_count}"
+                )
+            self._send(("results", quality_report, sample_stats, timestamp))
+            rest = sample[self._written :]
+            for batch in _row_batches(
+                rest
+                if not self.show_progress
+                else tqdm(rest, desc="Writing sample rows", unit="row")
+            ):
+                self._send(("rows", batch))
+            aborted = False
+        finally:
+            if aborted:
+                self._send(("abort",))
+            self._send(None)
+            error = self._receive()
+            if self._process is not None:
+                self._process.join()
+        if error is not None:
+            raise error
+        _log_outputs(self.sinks)
+        return self.sinks[0].path
+
+    def _send_early(self, high_value: list[CleanedTransaction]) -> None:
+        try:
+            for batch in _row_batches(high_value):
+                self._send(("rows", batch))
+        except BaseException as exc:  # surfaced by finish
+            self._early_error = exc
+
+    def _send(self, message: tuple[Any, ...] | None) -> None:
+        """Queue a message, failing if the writer process has died."""
+        while True:
+            try:
+                self._inbox.put(message, timeout=0.5)
+                return
+            except queue.Full:
+                self._check_alive()
+
+    def _receive(self) -> BaseException | None:
+        """Wait for the writer process to report how the sinks closed."""
+        while True:
+            try:
+                return self._outbox.get(timeout=0.5)
+            except queue.Empty:
+                self._check_alive()
+
+    def _check_alive(self) -> None:
+        if not self._process.is_alive():
+            raise RuntimeError(
+                "Report writer process exited with code "
+                f"{self._process.exitcode}"
+            )
+
+
+def report_output_path(output_dir: Path, output_format: str) -> Path:
+    """Return where ``generate_reports`` writes one output format.
+
+    Args:
+        output_dir (Path): Report output directory.
+        output_format (str): Key of ``OUTPUT_SINKS``.
 
     Returns:
-        Path: Filesystem path to the generated Excel workbook.
+        Path: The report filename with the format's suffix.
+    """
+    return (output_dir / REPORT_FILENAME).with_suffix(
+        OUTPUT_SINKS[output_format].suffix
+    )
+
+
+class ReportSink(ABC):
+    """Destination for the sample rows, run on its own writer thread.
+
+    ``open`` is called first, then ``write_batch`` once per batch of
+    ``SAMPLE_COLUMNS`` tuples, then ``close``. Batches are shared between
+    sinks and must not be modified. ``set_results`` is called before
+    ``close``, possibly after the first batches.
     """
+
+    format = ""
+    suffix = ""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def open(self, row_count: int, source_column: bool) -> None:
+        """Create the output before the first batch.
+
+        Args:
+            row_count (int): Number of sample rows that will follow.
+            source_column (bool): Whether any row has a source file.
+        """
+
+    @abstractmethod
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        """Write one batch of rows.
+
+        Args:
+            rows (list[tuple[Any, ...]]): Values in ``SAMPLE_COLUMNS`` order.
+        """
+
+    def set_results(
+        self,
+        quality_report: DataQualityReport,
+        sample_stats: SampleStatistics,
+        timestamp: datetime,
+    ) -> None:
+        """Receive the run's final statistics.
+
+        Args:
+            quality_report (DataQualityReport): Data quality statistics.
+            sample_stats (SampleStatistics): Calculated sampling metrics.
+            timestamp (datetime): Report timestamp.
+        """
+
+    def close(self) -> None:
+        """Finish and close the output."""
+
+
+class XlsxSink(ReportSink):
+    """The methodology workbook: summary, sample sheets and parameters.
+
+    The Population Summary is the first sheet but is written on
+    ``close``, once the statistics are final. With ``coverage_formula``
+    the sample sheets are started before then, so their coverage banner
+    is a formula rather than ``coverage_percent``. With ``output`` the
+    workbook is written to that file object instead of ``path``.
+    ``constant_memory=False`` keeps every cell in memory until ``close``
+    (only the report benchmark turns it off).
+    """
+
+    format = "xlsx"
+    suffix = ".xlsx"
+
+    def __init__(
+        self,
+        path: Path,
+        params: SamplingParameters,
+        run_id: str,
+        fast_writer: bool = False,
+        coverage_formula: bool = False,
+        output: IO[bytes] | None = None,
+        constant_memory: bool = True,
+    ) -> None:
+        super().__init__(path)
+        self.output = output
+        self.constant_memory = constant_memory
+        self.params = params
+        self.run_id = run_id
+        self.fast_writer = fast_writer
+        self.coverage_formula = coverage_formula
+        self.quality_report: DataQualityReport | None = None
+        self.sample_stats: SampleStatistics | None = None
+        self.timestamp: datetime | None = None
+
+    def set_results(
+        self,
+        quality_report: DataQualityReport,
+        sample_stats: SampleStatistics,
+        timestamp: datetime,
+    ) -> None:
+        self.quality_report = quality_report
+        self.sample_stats = sample_stats
+        self.timestamp = timestamp
+
+    def open(self, row_count: int, source_column: bool) -> None:
+        if self.output is None:
+            self._workbook = xlsxwriter.Workbook(
+                str(self.path),
+                {
+                    "constant_memory": self.constant_memory,
+                    "remove_timezone": True,
+                },
+            )
+        else:
+            # in_memory turns constant_memory off, so keep it to small samples
+            in_memory = row_count <= IN_MEMORY_MAX_ROWS
+            self._workbook = xlsxwriter.Workbook(
+                self.output,
+                {
+                    "constant_memory": self.constant_memory and not in_memory,
+                    "in_memory": in_memory,
+                    "remove_timezone": True,
+                },
+            )
+        self._formats = _create_workbook_formats(self._workbook)
+        self._summary = self._workbook.add_worksheet("Population Summary")
+        self._shards = _sample_shards(row_count)
+        self._pending = iter(self._shards)
+        self._source_column = source_column
+        self._ws: Any = None
+        self._row = SAMPLE_FIRST_ROW
+        self._left = 0
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        start = 0
+        while start < len(rows):
+            if not self._left:
+                self._next_sheet(next(self._pending))
+            chunk = rows[start : start + self._left]
+            if self.fast_writer:
+                _write_sample_rows_fast(self._ws, chunk, self._row)
+            else:
+                _write_sample_rows(self._ws, self._formats, chunk, self._row)
+            self._row += len(chunk)
+            self._left -= len(chunk)
+            start += len(chunk)
+
+    def close(self) -> None:
+        if (
+            self.quality_report is None
+            or self.sample_stats is None
+            or self.timestamp is None
+        ):
+            raise RuntimeError("The workbook needs set_results before close")
+        # An empty sample still gets its (empty) Sample Selected sheet
+        for shard in self._pending:
+            self._next_sheet(shard)
+        _write_population_summary_sheet(
+            self._summary,
+            self._formats,
+            self.sample_stats,
+            self.params,
+            self.quality_report,
+            self.run_id,
+            self.timestamp,
+            self._shards,
+        )
+        if self.sample_stats.breakdown is not None:
+            _write_population_breakdown_sheet(
+                self._workbook, self._formats, self.sample_stats.breakdown
+            )
+        _write_parameters_used_sheet(
+            self._workbook,
+            self._formats,
+            self.params,
+            self.timestamp,
+            self.run_id,
+        )
+        self._workbook.close()
+
+    def _next_sheet(self, shard: tuple[str, int, int]) -> None:
+        """Start the sample sheet for the next shard of rows."""
+        name, start, stop = shard
+        if self.coverage_formula:
+            coverage: float | str = _coverage_formula(self._shards)
+        elif self.sample_stats is not None:
+            coverage = self.sample_stats.coverage_percent / 100.0
+        else:
+            raise RuntimeError("The workbook needs set_results first")
+        self._ws = _write_sample_selected_sheet(
+            self._workbook,
+            self._formats,
+            coverage,
+            stop - start,
+            self._source_column,
+            self.fast_writer,
+            name=name,
+        )
+        self._row = SAMPLE_FIRST_ROW
+        self._left = stop - start
+
+
+class CsvSink(ReportSink):
+    """Sample rows as CSV with ``SAMPLE_COLUMNS`` headers and ISO dates."""
+
+    format = "csv"
+    suffix = ".csv"
+
+    def open(self, row_count: int, source_column: bool) -> None:
+        self._handle: IO[str] = open(
+            self.path, "w", encoding="utf-8", newline=""
+        )
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(SAMPLE_COLUMNS)
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        self._writer.writerows(_iso_dates(values) for values in rows)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class JsonLinesSink(ReportSink):
+    """One JSON object per sample row, keyed by ``SAMPLE_COLUMNS``."""
+
+    format = "jsonl"
+    suffix = ".jsonl"
+
+    def open(self, row_count: int, source_column: bool) -> None:
+        self._handle: IO[str] = open(self.path, "w", encoding="utf-8")
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        self._handle.writelines(
+            json.dumps(dict(zip(SAMPLE_COLUMNS, _iso_dates(values)))) + "\n"
+            for values in rows
+        )
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class ParquetSink(ReportSink):
+    """Sample rows as a Parquet file, one row group per batch."""
+
+    format = "parquet"
+    suffix = ".parquet"
+
+    def open(self, row_count: int, source_column: bool) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise ImportError(
+                "Parquet output requires pyarrow (pip install pyarrow)"
+            ) from exc
+        text = pa.string()
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("transaction_id", text),
+                ("amount_signed", pa.float64()),
+                ("amount_abs", pa.float64()),
+                ("effective_date", pa.timestamp("us")),
+                ("document_type", text),
+                ("description", text),
+                ("balance_category", text),
+                ("selection_type", text),
+                ("source_row_index", pa.int64()),
+                ("source_file", text),
+            ]
+        )
+        self._writer = pq.ParquetWriter(str(self.path), self._schema)
+
+    def write_batch(self, rows: list[tuple[Any, ...]]) -> None:
+        arrays = [
+            self._pa.array(column, type=field.type)
+            for column, field in zip(zip(*rows), self._schema)
+        ]
+        self._writer.write_batch(
+            self._pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+OUTPUT_SINKS: dict[str, type[ReportSink]] = {
+    sink.format: sink
+    for sink in (XlsxSink, CsvSink, JsonLinesSink, ParquetSink)
+}
+
+
+def _build_sinks(
+    output_dir: Path,
+    output_formats: Sequence[str],
+    params: SamplingParameters,
+    run_id: str,
+    fast_writer: bool,
+    coverage_formula: bool = False,
+) -> list[ReportSink]:
+    """Create one sink per requested format, in order, without duplicates.
+
+    Args:
+        output_dir (Path): Directory that will receive the outputs.
+        output_formats (Sequence[str]): Keys of ``OUTPUT_SINKS``.
+        params (SamplingParameters): Parameters used to drive sampling.
+        run_id (str): Unique identifier for the execution run.
+        fast_writer (bool): Use the bulk Sample Selected writer.
+        coverage_formula (bool): Write the workbook's coverage banner as
+            a formula (see ``XlsxSink``).
+
+    Returns:
+        list[ReportSink]: Unopened sinks.
+
+    Raises:
+        ValueError: If no format, or an unknown one, is requested.
+    """
+    formats = list(dict.fromkeys(output_formats))
+    unknown = [name for name in formats if name not in OUTPUT_SINKS]
+    if unknown or not formats:
+        raise ValueError(
+            f"Unknown output formats {unknown}; "
+            f"choose from {', '.join(OUTPUT_SINKS)}"
+        )
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / REPORT_FILENAME
+    sinks: list[ReportSink] = []
+    for name in formats:
+        path = report_output_path(output_dir, name)
+        if name == "xlsx":
+            sinks.append(
+                XlsxSink(path, params, run_id, fast_writer, coverage_formula)
+            )
+        else:
+            sinks.append(OUTPUT_SINKS[name](path))
+    return sinks
 
-    _write_excel_report(
-        output_path,
-        sample,
-        quality_report,
-        sample_stats,
-        params,
-        timestamp,
-        run_id,
-        show_progress=show_progress,
+
+def _log_outputs(sinks: list[ReportSink]) -> None:
+    for sink in sinks:
+        log.info(
+            EventCode.REPORT_WRITTEN.value,
+            path=str(sink.path),
+            format=sink.format,
+        )
+
+
+def _coverage_formula(shards: list[tuple[str, int, int]]) -> str:
+    """Coverage as a formula over the sample sheets' Amount Abs columns.
+
+    Args:
+        shards (list[tuple[str, int, int]]): Sample sheets and row ranges.
+
+    Returns:
+        str: Sample total over the summary's Total Population Value, or
+        0 for an empty population, matching ``coverage_percent / 100``.
+    """
+    ranges = ",".join(
+        f"'{name}'!C{SAMPLE_FIRST_ROW + 1}:C{SAMPLE_FIRST_ROW + stop - start}"
+        for name, start, stop in shards
+        if stop > start
+    )
+    total = "'Population Summary'!B2"
+    if not ranges:
+        return "=0"
+    return f"=IF({total}>0,SUM({ranges})/{total},0)"
+
+
+def _iso_dates(values: tuple[Any, ...]) -> tuple[Any, ...]:
+    """Return a sample row with its effective date as ISO 8601 text."""
+    date = values[DATE_COLUMN]
+    if date is None:
+        return values
+    return (
+        values[:DATE_COLUMN] + (date.isoformat(),) + values[DATE_COLUMN + 1 :]
     )
 
-    log.info(EventCode.REPORT_WRITTEN.value, path=str(output_path))
-    return output_path
+
+def _sample_values(txn: CleanedTransaction) -> tuple[Any, ...]:
+    """Return one transaction's values in ``SAMPLE_COLUMNS`` order."""
+    return (
+        txn.transaction_id,
+        txn.amount_signed,
+        txn.amount_abs,
+        txn.effective_date,
+        txn.document_type,
+        txn.description,
+        txn.balance_category,
+        txn.selection_type,
+        txn.source_row_index,
+        txn.source_file,
+    )
+
+
+class _SinkFeeder:
+    """Fan sample rows out to sinks, each on its own writer thread.
+
+    Each sink drains a bounded queue of row batches, so the rows are
+    built once however many formats are requested and a slow writer only
+    holds ``SINK_QUEUE_BATCHES`` batches back. ``feed`` may be called
+    several times (from one thread at a time); ``close`` ends the
+    outputs and raises the first sink error, if any.
+    """
+
+    def __init__(
+        self, sinks: list[ReportSink], row_count: int, source_column: bool
+    ) -> None:
+        self.row_count = row_count
+        self._errors: list[BaseException] = []
+        self._queues: list[queue.Queue[list[tuple[Any, ...]] | None]] = []
+        self._threads = []
+        for sink in sinks:
+            batches: queue.Queue[list[tuple[Any, ...]] | None] = queue.Queue(
+                maxsize=SINK_QUEUE_BATCHES
+            )
+            thread = threading.Thread(
+                target=_drain_sink,
+                args=(sink, batches, row_count, source_column, self._errors),
+                name=f"report-{sink.format}",
+                daemon=True,
+            )
+            thread.start()
+            self._queues.append(batches)
+            self._threads.append(thread)
+
+    def feed(self, sample: Iterable[CleanedTransaction]) -> None:
+        """Queue rows for every sink, in batches of ``SINK_BATCH_ROWS``.
+
+        Args:
+            sample (Iterable[CleanedTransaction]): Next sample rows.
+        """
+        for batch in _row_batches(sample):
+            self.write_rows(batch)
+
+    def write_rows(self, batch: list[tuple[Any, ...]]) -> None:
+        """Queue one batch of ``SAMPLE_COLUMNS`` tuples for every sink.
+
+        Args:
+            batch (list[tuple[Any, ...]]): Rows shared by all sinks.
+        """
+        self._put(batch)
+
+    def close(self) -> None:
+        """Close every sink and wait for the writer threads.
+
+        Raises:
+            BaseException: The first error raised by a sink.
+        """
+        self._put(None)
+        for thread in self._threads:
+            thread.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def _put(self, batch: list[tuple[Any, ...]] | None) -> None:
+        for batches in self._queues:
+            batches.put(batch)
+
+
+def _row_batches(
+    sample: Iterable[CleanedTransaction],
+) -> Iterator[list[tuple[Any, ...]]]:
+    """Yield the sample as lists of up to ``SINK_BATCH_ROWS`` value tuples."""
+    batch: list[tuple[Any, ...]] = []
+    for txn in sample:
+        batch.append(_sample_values(txn))
+        if len(batch) == SINK_BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _run_sinks_process(
+    sinks: list[ReportSink],
+    row_count: int,
+    source_column: bool,
+    inbox: Any,
+    outbox: Any,
+) -> None:
+    """Writer process of ``ReportPipeline``: apply messages until ``None``.
+
+    ``("rows", batch)`` goes to every sink and ``("results", ...)`` to
+    ``set_results``. ``("abort",)`` stops the run: the sinks are closed
+    and their files deleted, so no truncated output is left behind. The
+    first sink error, or ``None``, is sent back once the sinks are closed.
+    """
+    feeder = _SinkFeeder(sinks, row_count, source_column)
+    error: BaseException | None = None
+    aborted = False
+    message: Any = ()
+    try:
+        while (message := inbox.get()) is not None:
+            if message[0] == "abort":
+                aborted = True
+                break
+            if message[0] == "rows":
+                feeder.write_rows(message[1])
+            else:
+                for sink in sinks:
+                    sink.set_results(*message[1:])
+    except BaseException as exc:
+        error = exc
+    finally:
+        try:
+            feeder.close()
+        except BaseException as exc:
+            error = error or exc
+        # Drain to the end marker so the parent never blocks on a put
+        while (error is not None or aborted) and message is not None:
+            message = inbox.get()
+    if aborted:
+        # The parent raises its own error; a closing error is moot
+        error = None
+        for sink in sinks:
+            sink.path.unlink(missing_ok=True)
+    try:
+        pickle.dumps(error)
+    except Exception:
+        error = RuntimeError(repr(error))
+    outbox.put(error)
+
+
+def _feed_sinks(
+    sinks: list[ReportSink],
+    sample: list[CleanedTransaction],
+    show_progress: bool = False,
+) -> None:
+    """Write the sample to every sink from a single pass over it.
+
+    Args:
+        sinks (list[ReportSink]): Outputs to write, with their results set.
+        sample (list[CleanedTransaction]): Selected sample transactions.
+        show_progress (bool): Whether to show a progress bar.
+
+    Raises:
+        BaseException: The first error raised by a sink, once every
+            writer thread has stopped.
+    """
+    feeder = _SinkFeeder(
+        sinks, len(sample), any(txn.source_file for txn in sample)
+    )
+    try:
+        feeder.feed(
+            sample
+            if not show_progress
+            else tqdm(sample, desc="Writing sample rows", unit="row")
+        )
+    finally:
+        feeder.close()
+
+
+def _drain_sink(
+    sink: ReportSink,
+    batches: queue.Queue[list[tuple[Any, ...]] | None],
+    row_count: int,
+    source_column: bool,
+    errors: list[BaseException],
+) -> None:
+    """Writer thread: feed queued batches to ``sink`` until ``None``.
+
+    A failing sink keeps emptying its queue so the producer never blocks.
+    """
+    finished = False
+    try:
+        sink.open(row_count, source_column)
+        while True:
+            rows = batches.get()
+            if rows is None:
+                finished = True
+                break
+            sink.write_batch(rows)
+        sink.close()
+    except BaseException as exc:  # surfaced by _SinkFeeder.close
+        errors.append(exc)
+        while not finished:
+            finished = batches.get() is None
 
 
 def _write_excel_report(
@@ -83,6 +941,8 @@ def _write_excel_report(
     timestamp: datetime,
     run_id: str,
     show_progress: bool = False,
+    fast_writer: bool = False,
+    constant_memory: bool = True,
 ) -> None:
     """Write complete Excel report with all sheets.
 
@@ -95,25 +955,38 @@ def _write_excel_report(
         timestamp (datetime): Generation timestamp.
         run_id (str): Unique run identifier.
         show_progress (bool): Whether to show progress bars.
+        fast_writer (bool): Use the bulk, column-formatted row writer.
+        constant_memory (bool): Flush each row to disk as it is written
+            rather than holding the whole workbook in memory.
     """
-    workbook = xlsxwriter.Workbook(str(output_path), {"constant_memory": True})
-    formats = _create_workbook_formats(workbook)
-
-    _write_population_summary_sheet(
-        workbook,
-        formats,
-        sample_stats,
+    sink = XlsxSink(
+        output_path,
         params,
-        quality_report,
         run_id,
-        timestamp,
+        fast_writer=fast_writer,
+        constant_memory=constant_memory,
     )
-    _write_sample_selected_sheet(
-        workbook, formats, sample, sample_stats, show_progress
-    )
-    _write_parameters_used_sheet(workbook, formats, params, timestamp, run_id)
+    sink.set_results(quality_report, sample_stats, timestamp)
+    _feed_sinks([sink], sample, show_progress)
+
+
+def _sample_shards(count: int) -> list[tuple[str, int, int]]:
+    """Split the sample into sheets that fit Excel's row limit.
+
+    Args:
+        count (int): Number of sample rows.
 
-    workbook.close()
+    Returns:
+        list[tuple[str, int, int]]: Sheet name with the start and stop
+        positions of its rows; ``Sample Selected`` first, then
+        ``Sample Selected (2)``, ``(3)`` and so on.
+    """
+    per_sheet = SAMPLE_ROWS_PER_SHEET
+    shards = []
+    for number, start in enumerate(range(0, max(count, 1), per_sheet), 1):
+        name = SAMPLE_SHEET if number == 1 else f"{SAMPLE_SHEET} ({number})"
+        shards.append((name, start, min(start + per_sheet, count)))
+    return shards
 
 
 def _create_workbook_formats(workbook: xlsxwriter.Workbook) -> dict[str, Any]:
@@ -164,30 +1037,36 @@ def _create_workbook_formats(workbook: xlsxwriter.Workbook) -> dict[str, Any]:
             {"bg_color": RSM_LIGHT_BLUE, "border": 1}
         ),
         "normal_row": workbook.add_format({"border": 1}),
+        "column_number": workbook.add_format({"num_format": "#,##0.00"}),
+        "column_integer": workbook.add_format({"num_format": "#,##0"}),
+        "column_date": workbook.add_format({"num_format": "yyyy-mm-dd hh:mm"}),
     }
 
 
 def _write_population_summary_sheet(
-    workbook: xlsxwriter.Workbook,
+    ws: Any,
     formats: dict[str, Any],
     sample_stats: SampleStatistics,
     params: SamplingParameters,
     quality_report: DataQualityReport,
     run_id: str,
     timestamp: datetime,
+    shards: list[tuple[str, int, int]] | None = None,
 ) -> None:
     """Write the Population Summary sheet.
 
     Args:
-        workbook (xlsxwriter.Workbook): Workbook currently being authored.
+        ws (Any): The Population Summary worksheet, added first so it
+            leads the workbook.
         formats (dict[str, Any]): Dictionary of reusable formats.
         sample_stats (SampleStatistics): Sample statistics to summarize.
         params (SamplingParameters): Parameters used in the run.
         quality_report (DataQualityReport): Data quality findings.
         run_id (str): Unique run identifier to display.
         timestamp (datetime): Generation timestamp for metadata.
+        shards (list[tuple[str, int, int]] | None): Sample sheets with
+            their row ranges, listed in an index below the metrics.
     """
-    ws = workbook.add_worksheet("Population Summary")
     ws.set_column("A:A", 30)
     ws.set_column("B:B", 70)
 
@@ -201,6 +1080,13 @@ def _write_population_summary_sheet(
         f"Zero Excluded: {quality_report.excluded_zero_amounts}; "
         f"Balance Excluded: {quality_report.excluded_due_to_balance}"
     )
+    if params.has_scope_filters():
+        quality_summary += (
+            f"; Date Excluded: {quality_report.excluded_by_date}; "
+            "Document Type Excluded: "
+            f"{quality_report.excluded_by_document_type}; "
+            f"Amount Band Excluded: {quality_report.excluded_by_amount_band}"
+        )
 
     rows = [
         (
@@ -236,36 +1122,57 @@ def _write_population_summary_sheet(
         else:
             ws.write(r, 1, value, formats[fmt_name])
 
+    if shards:
+        first = len(rows) + 2
+        ws.write(first, 0, "Sample Sheet", formats["header_blue"])
+        ws.write(first, 1, "Sample Rows", formats["header_blue"])
+        total = shards[-1][2]
+        for r, (name, start, stop) in enumerate(shards, start=first + 1):
+            rows_text = (
+                f"Items {start + 1:,} to {stop:,} of {total:,}"
+                if stop > start
+                else "No items"
+            )
+            ws.write(r, 0, name, formats["label"])
+            ws.write(r, 1, rows_text, formats["value_wrap"])
+
 
 def _write_sample_selected_sheet(
     workbook: xlsxwriter.Workbook,
     formats: dict[str, Any],
-    sample: list[CleanedTransaction],
-    sample_stats: SampleStatistics,
-    show_progress: bool,
-) -> None:
-    """Write the Sample Selected sheet.
+    coverage: float | str,
+    row_count: int,
+    source_column: bool,
+    fast_writer: bool = False,
+    name: str = SAMPLE_SHEET,
+) -> Any:
+    """Start one Sample Selected sheet: banner, headers and column setup.
 
     Args:
         workbook (xlsxwriter.Workbook): Workbook being written.
         formats (dict[str, Any]): Formatting dictionary for styles.
-        sample (list[CleanedTransaction]): Sampled transactions to tabulate.
-        sample_stats (SampleStatistics): Summary stats for banner sections.
-        show_progress (bool): Whether to display tqdm progress bars.
+        coverage (float | str): Banner coverage as a fraction, or a
+            formula when the statistics are not final yet.
+        row_count (int): Sample rows this sheet will hold.
+        source_column (bool): Whether to add the Source File column.
+        fast_writer (bool): Prepare for ``_write_sample_rows_fast``.
+        name (str): Worksheet name (shards after the first are numbered).
+
+    Returns:
+        Any: The worksheet, ready for its rows from ``SAMPLE_FIRST_ROW``.
     """
-    ws = workbook.add_worksheet("Sample Selected")
+    ws = workbook.add_worksheet(name)
     ws.set_column("A:A", 18)
     ws.set_column("B:C", 14)
     ws.set_column("D:D", 22)
     ws.set_column("E:E", 18)
     ws.set_column("F:F", 40)
     ws.set_column("G:I", 14)
+    ws.set_column("J:J", 30)
 
     # Banner
     ws.write(0, 0, "Coverage %", formats["banner"])
-    ws.write_number(
-        0, 1, sample_stats.coverage_percent / 100.0, formats["percent"]
-    )
+    ws.write(0, 1, coverage, formats["percent"])
 
     # Spacer
     ws.write(1, 0, "")
@@ -282,50 +1189,189 @@ def _write_sample_selected_sheet(
         "Selection Type",
         "Source Row Index",
     ]
+    if source_column:
+        headers.append("Source File")
     for c, h in enumerate(headers):
         ws.write(2, c, h, formats["header_blue"])
 
-    _write_sample_rows(ws, formats, sample, show_progress)
+    if fast_writer:
+        _format_sample_columns(ws, formats, row_count, len(headers))
+    return ws
 
 
 def _write_sample_rows(
     ws: Any,
     formats: dict[str, Any],
-    sample: list[CleanedTransaction],
-    show_progress: bool,
+    rows: list[tuple[Any, ...]],
+    first_row: int = SAMPLE_FIRST_ROW,
 ) -> None:
     """Write sample transaction rows to worksheet.
 
     Args:
         ws (Any): Worksheet object to mutate.
         formats (dict[str, Any]): Formatting map for alternating rows.
-        sample (list[CleanedTransaction]): Sample transactions to write.
-        show_progress (bool): Whether to show progress bars.
+        rows (list[tuple[Any, ...]]): Values in ``SAMPLE_COLUMNS`` order.
+        first_row (int): Worksheet row of the first value tuple.
     """
-    iterator = (
-        sample
-        if not show_progress
-        else tqdm(sample, desc="Writing sample rows", unit="row")
-    )
-
-    for idx, txn in enumerate(iterator, start=3):
+    for idx, values in enumerate(rows, start=first_row):
+        (
+            transaction_id,
+            amount_signed,
+            amount_abs,
+            effective_date,
+            document_type,
+            description,
+            balance_category,
+            selection_type,
+            source_row_index,
+            source_file,
+        ) = values
         row_fmt = (
-            formats["alt_row"] if (idx - 3) % 2 == 0 else formats["normal_row"]
+            formats["alt_row"]
+            if (idx - SAMPLE_FIRST_ROW) % 2 == 0
+            else formats["normal_row"]
         )
-        ws.write(idx, 0, txn.transaction_id or "", row_fmt)
-        ws.write_number(idx, 1, txn.amount_signed or 0.0, formats["number"])
-        ws.write_number(idx, 2, txn.amount_abs or 0.0, formats["number"])
+        ws.write(idx, 0, transaction_id or "", row_fmt)
+        ws.write_number(idx, 1, amount_signed or 0.0, formats["number"])
+        ws.write_number(idx, 2, amount_abs or 0.0, formats["number"])
         ws.write(
             idx,
             3,
-            txn.effective_date.isoformat() if txn.effective_date else "",
+            effective_date.isoformat() if effective_date else "",
             row_fmt,
         )
-        ws.write(idx, 4, txn.document_type or "", row_fmt)
-        ws.write(idx, 5, txn.description or "", row_fmt)
-        ws.write(idx, 6, txn.balance_category or "", row_fmt)
-        ws.write(idx, 7, txn.selection_type or "", row_fmt)
-        ws.write_number(idx, 8, txn.source_row_index, formats["integer"])
+        ws.write(idx, 4, document_type or "", row_fmt)
+        ws.write(idx, 5, description or "", row_fmt)
+        ws.write(idx, 6, balance_category or "", row_fmt)
+        ws.write(idx, 7, selection_type or "", row_fmt)
+        ws.write_number(idx, 8, source_row_index, formats["integer"])
+        if source_file:
+            ws.write(idx, 9, source_file, row_fmt)
+
+
+def _format_sample_columns(
+    ws: Any, formats: dict[str, Any], row_count: int, width: int
+) -> None:
+    """Set the column formats and row striping used by the bulk writer.
+
+    Number and date formats are set once per column, and the borders and
+    alternate-row shading come from conditional formats over the data
+    range, so ``_write_sample_rows_fast`` writes values only.
+
+    Args:
+        ws (Any): Worksheet object to mutate.
+        formats (dict[str, Any]): Formatting map.
+        row_count (int): Number of sample rows on the sheet.
+        width (int): Number of columns in the table.
+    """
+    ws.set_column("B:C", 14, formats["column_number"])
+    ws.set_column("D:D", 22, formats["column_date"])
+    ws.set_column("I:I", 14, formats["column_integer"])
+    if row_count:
+        last = SAMPLE_FIRST_ROW - 1 + row_count
+        ws.conditional_format(
+            SAMPLE_FIRST_ROW,
+            0,
+            last,
+            width - 1,
+            {
+                "type": "formula",
+                "criteria": "=MOD(ROW(),2)=0",
+                "format": formats["alt_row"],
+            },
+        )
+        ws.conditional_format(
+            SAMPLE_FIRST_ROW,
+            0,
+            last,
+            width - 1,
+            {
+                "type": "formula",
+                "criteria": "=MOD(ROW(),2)=1",
+                "format": formats["normal_row"],
+            },
+        )
+
+
+def _write_sample_rows_fast(
+    ws: Any, rows: list[tuple[Any, ...]], first_row: int = SAMPLE_FIRST_ROW
+) -> None:
+    """Write sample rows in bulk, one ``write_row`` call per row.
+
+    Datetimes go through ``write_datetime`` as real Excel dates; the
+    formatting was set up by ``_format_sample_columns``.
+
+    Args:
+        ws (Any): Worksheet object to mutate.
+        rows (list[tuple[Any, ...]]): Values in ``SAMPLE_COLUMNS`` order.
+        first_row (int): Worksheet row of the first value tuple.
+    """
+    for idx, values in enumerate(rows, start=first_row):
+        ws.write_row(idx, 0, values)
+
+
+def _write_population_breakdown_sheet(
+    workbook: xlsxwriter.Workbook,
+    formats: dict[str, Any],
+    breakdown: PopulationBreakdown,
+) -> None:
+    """Write the Population Breakdown sheet, one table per grouping.
+
+    Args:
+        workbook (xlsxwriter.Workbook): Workbook being populated.
+        formats (dict[str, Any]): Formatting dictionary.
+        breakdown (PopulationBreakdown): Population totals per group.
+    """
+    ws = workbook.add_worksheet("Population Breakdown")
+    ws.set_column("A:A", 30)
+    ws.set_column("B:G", 18)
+
+    headers = [
+        "Count",
+        "Amount Abs",
+        "High Value Count",
+        "Sample Count",
+        "Sample Amount Abs",
+        "Coverage %",
+    ]
+    tables = [
+        ("Document Type", breakdown.document_type),
+        ("Balance Category", breakdown.balance_category),
+        ("Month", breakdown.month),
+    ]
+    r = 0
+    for title, groups in tables:
+        ws.write(r, 0, title, formats["header_green"])
+        for c, header in enumerate(headers, start=1):
+            ws.write(r, c, header, formats["header_green"])
+        r += 1
+        for group in groups:
+            ws.write(r, 0, group.key, formats["label"])
+            ws.write(r, 1, group.count, formats["integer"])
+            ws.write(r, 2, group.amount_abs, formats["number"])
+            ws.write(r, 3, group.high_value_count, formats["integer"])
+            ws.write(r, 4, group.sample_count, formats["integer"])
+            ws.write(r, 5, group.sample_amount_abs, formats["number"])
+            ws.write(
+                r,
+                6,
+                (
+                    group.sample_amount_abs / group.amount_abs
+                    if group.amount_abs
+                    else 0.0
+                ),
+                formats["percent"],
+            )
+            r += 1
+        r += 1
+
+    ws.write(
+        r,
+        0,
+        f"Groups beyond the first {breakdown.max_groups:,} per table "
+        "are combined as (other).",
+        formats["label"],
+    )
 
 
 def _write_parameters_used_sheet(
@@ -367,6 +1413,7 @@ def _write_parameters_used_sheet(
             "value_wrap",
         ),
         ("Random Seed", params.random_seed, "integer"),
+        ("Population Scope", _describe_scope(params), "value_wrap"),
         ("Timestamp (UTC)", timestamp.isoformat(), "value_wrap"),
         ("Run Identifier", run_id, "value_wrap"),
         ("Methodology", "RSM Random Non-Statistical", "value_wrap"),
@@ -376,3 +1423,37 @@ def _write_parameters_used_sheet(
     for r, (label, value, fmt_name) in enumerate(param_rows, start=1):
         ws.write(r, 0, label, formats["label"])
         ws.write(r, 1, value, formats[fmt_name])
+
+
+def _describe_scope(params: SamplingParameters) -> str:
+    """Summarise the population scope filters for the parameters sheet.
+
+    Args:
+        params (SamplingParameters): Input parameters guiding sampling.
+
+    Returns:
+        str: One clause per active filter, or ``"Entire population"``.
+    """
+    parts = []
+    if params.date_from or params.date_to:
+        start = params.date_from.isoformat() if params.date_from else "start"
+        end = params.date_to.isoformat() if params.date_to else "end"
+        parts.append(f"Dates {start} to {end}")
+    if params.include_document_types:
+        parts.append(
+            "Document types " + ", ".join(params.include_document_types)
+        )
+    if params.exclude_document_types:
+        parts.append(
+            "Excluding document types "
+            + ", ".join(params.exclude_document_types)
+        )
+    if params.amount_min is not None or params.amount_max is not None:
+        low = "0" if params.amount_min is None else f"{params.amount_min:,.2f}"
+        high = (
+            "no limit"
+            if params.amount_max is None
+            else f"{params.amount_max:,.2f}"
+        )
+        parts.append(f"Absolute amounts {low} to {high}")
+    return "; ".join(parts) or "Entire population"
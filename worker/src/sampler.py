@@ -2,20 +2,26 @@
 
 from __future__ import annotations
 
-import csv
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Iterator, Literal, NamedTuple, Sequence
 
 from tqdm import tqdm
 
+from .breakdown import BreakdownAccumulator
 from .cleaner import (
+    PopulationScope,
     _clean_string,
     _derive_balance,
     _normalize_row,
     _parse_amount,
     _parse_date,
+    _resolve_columns,
 )
+from .export import PopulationExport, open_export
 from .logging_setup import get_logger
 from .models import (
     CleanedTransaction,
@@ -23,19 +29,36 @@ from .models import (
     SampleStatistics,
     SamplingParameters,
 )
+from .readers import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_PREFETCH_DEPTH,
+    CsvPopulation,
+    PipePopulation,
+    ReadStats,
+    is_columnar,
+    is_excel,
+    is_sqlite,
+    is_stdin,
+)
 
 log = get_logger("sampler")
 
+SCAN_WORKERS = 4
+SCOPE_REASONS = ("date", "document_type", "amount_band")
+
 
 def generate_sample(
     cleaned: list[CleanedTransaction],
     params: SamplingParameters,
+    breakdown: bool = False,
 ) -> tuple[list[CleanedTransaction], SampleStatistics]:
     """Generate an audit-ready sample per methodology.
 
     Args:
         cleaned (list[CleanedTransaction]): List of cleaned transactions.
         params (SamplingParameters): Sampling parameters validated via Pydantic.
+        breakdown (bool): Also total the population by document type,
+            balance category and month (``SampleStatistics.breakdown``).
 
     Returns:
         tuple[list[CleanedTransaction], SampleStatistics]: Sample selections and summary statistics.
@@ -69,12 +92,23 @@ def generate_sample(
     log.info("random_sample_selected", count=len(random_sample))
 
     sample = _combine_samples(high_value, random_sample)
+    groups = None
+    if breakdown:
+        groups = BreakdownAccumulator(interval)
+        for txn in filtered:
+            groups.add(
+                txn.document_type,
+                txn.balance_category,
+                txn.effective_date,
+                txn.amount_abs or 0.0,
+            )
     stats = _build_statistics(
         filtered,
         sample,
         interval,
         zero_filtered,
         balance_filtered,
+        groups,
     )
 
     log.info(
@@ -87,9 +121,20 @@ def generate_sample(
 
 
 def generate_sample_streaming(
-    input_csv: Path,
+    input_csv: Path | Sequence[Path],
     params: SamplingParameters,
     show_progress: bool = False,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+    read_stats: ReadStats | None = None,
+    sql: str | None = None,
+    sheet: str | None = None,
+    scope_counts: dict[str, int] | None = None,
+    export_path: Path | None = None,
+    on_high_value: (
+        Callable[[list[CleanedTransaction], int], None] | None
+    ) = None,
+    breakdown: bool = False,
 ) -> tuple[list[CleanedTransaction], SampleStatistics]:
     """High-performance streaming sampler over the input CSV.
 
@@ -99,155 +144,930 @@ def generate_sample_streaming(
     - Pass 2: Reservoir sampling over the remaining population to select
       the random items.
 
+    Balance and zero filters are applied to the amount field alone,
+    located by header position, so rows that cannot enter the population
+    are skipped before any row structure is built. Date range, document
+    type and amount band filters (see ``PopulationScope``) run next, and
+    decode the document type and date fields only when they are set.
+
+    Parquet and Arrow IPC/Feather inputs read only the amount column in
+    record batches, and full rows are fetched for the selected indices
+    alone.
+
+    Several files are sampled as one population. Pass 1 scans them
+    concurrently and combines the totals; pass 2 runs one reservoir over
+    the union in file order, so the selection matches sampling the files
+    concatenated. Selected rows report their ``source_file``.
+
+    A SQLite database is sampled inside SQLite instead: filters and the
+    high-value test run as ``WHERE`` clauses and the random items come from
+    a seeded sample of row positions, selecting exactly what the in-memory
+    sampler selects for the same rows.
+
+    An input of ``-`` reads CSV from standard input. The stream is read
+    once: pass 1 spools the rows eligible for random selection to a
+    temporary file and pass 2 replays it.
+
+    With ``export_path``, pass 2 also writes every row with a valid amount
+    to a CSV (or Parquet) file, flagged with its selection type or
+    exclusion reason (see ``_export_pass``). Excel and standard input
+    spool every such row in pass 1 so the source is still read once.
+
+    With ``breakdown``, pass 1 also decodes each population row's
+    document type and date to total the population by document type,
+    balance category and month (see ``BreakdownAccumulator``).
+
     Args:
-        input_csv (Path): Population CSV file path.
+        input_csv (Path | Sequence[Path]): Population CSV (or columnar)
+            file path, or several making up one population.
         params (SamplingParameters): Sampling parameters validated via Pydantic.
         show_progress (bool): Whether to show tqdm progress indicators.
+        block_size (int): Bytes per block read from the CSV.
+        prefetch_depth (int): Blocks read ahead on a background thread;
+            ``0`` memory-maps the file instead.
+        read_stats (ReadStats | None): Optional accumulator for time spent
+            waiting on I/O versus parsing.
+        sql (str | None): Table name or query for SQLite inputs.
+        sheet (str | None): Worksheet name or 1-based position for Excel
+            inputs; ``None`` reads the active sheet.
+        scope_counts (dict[str, int] | None): Optional accumulator for rows
+            outside the population scope, keyed ``date``,
+            ``document_type`` and ``amount_band``.
+        export_path (Path | None): Optional annotated population export.
+        on_high_value (Callable[[list[CleanedTransaction], int], None] | None):
+            Called after pass 1 with the high-value rows, which lead the
+            returned sample, and the final sample size, so a report can
+            start while pass 2 runs. Not called for SQLite inputs.
+        breakdown (bool): Fill ``SampleStatistics.breakdown``.
 
     Returns:
         tuple[list[CleanedTransaction], SampleStatistics]: Sampled transactions and statistics.
+
+    Raises:
+        ValueError: If the population is empty after filtering, or an
+            export or breakdown is requested for a SQLite input.
     """
+    paths = [input_csv] if isinstance(input_csv, Path) else list(input_csv)
+    if any(is_sqlite(path) for path in paths):
+        if len(paths) > 1:
+            raise ValueError("A SQLite population must be the only input.")
+        if export_path is not None:
+            raise ValueError("SQLite inputs cannot be exported.")
+        if breakdown:
+            raise ValueError("SQLite inputs have no population breakdown.")
+        return _generate_sample_sqlite(paths[0], params, sql, scope_counts)
+    multi_file = len(paths) > 1
+    scope = PopulationScope.from_params(params)
     interval = params.sampling_interval()
-    log.info("stream_pass1_start", interval=interval)
-
-    total_abs = 0.0
-    population_size = 0
-    high_value: list[CleanedTransaction] = []
-    excluded_zero = 0
-    excluded_balance = 0
-
-    # Pass 1: compute totals and collect high value
-    with open(input_csv, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        iterator = reader
-        if show_progress:
-            iterator = tqdm(
-                reader, desc="Pass 1: scanning population", unit="row"
+    log.info("stream_pass1_start", interval=interval, files=len(paths))
+
+    started = time.perf_counter()
+    file_stats = [ReadStats() for _ in paths]
+    with ExitStack() as stack:
+        streams = [
+            stack.enter_context(
+                _StreamFile(
+                    path,
+                    str(path) if multi_file else None,
+                    block_size,
+                    prefetch_depth,
+                    stats,
+                    sheet,
+                    scope,
+                    keep_excluded=export_path is not None,
+                )
             )
-        for idx, raw in enumerate(iterator):
-            norm = _normalize_row(raw)
-            amt = _parse_amount(norm.get("amount", ""))
-            if amt["value"] is None:
-                continue
-            signed = amt["value"]
-            abs_val = abs(signed)
-            balance_cat = _derive_balance(signed)
-            include, reason = _apply_balance_filters(
-                abs_val, balance_cat, params
+            for path, stats in zip(paths, file_stats)
+        ]
+
+        # Pass 1: compute totals and collect high value, one file per worker
+        def scan(stream: _StreamFile, stats: ReadStats) -> _PassOneTotals:
+            scan_started = time.perf_counter()
+            try:
+                return _scan_population(
+                    stream, params, interval, show_progress, breakdown
+                )
+            finally:
+                stats.elapsed_seconds += time.perf_counter() - scan_started
+
+        workers = min(len(streams), SCAN_WORKERS)
+        if workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="pass1-scan"
+            ) as executor:
+                totals = list(executor.map(scan, streams, file_stats))
+        else:
+            totals = [
+                scan(stream, stats)
+                for stream, stats in zip(streams, file_stats)
+            ]
+        # Files were scanned side by side: weigh each one's I/O wait by
+        # its own scan time, then start pass 2's timings afresh
+        if read_stats is not None:
+            read_stats.add_concurrent(
+                file_stats, time.perf_counter() - started
             )
-            if not include:
-                if reason == "zero":
-                    excluded_zero += 1
-                else:
-                    excluded_balance += 1
-                continue
-            population_size += 1
-            total_abs += abs_val
-            date = _parse_date(norm.get("effective_date", ""))["value"]
-            if abs_val > interval:
-                txn = CleanedTransaction(
-                    transaction_id=_clean_string(norm.get("transaction_id")),
-                    amount_signed=signed,
-                    amount_abs=abs_val,
-                    effective_date=date,
-                    document_type=_clean_string(norm.get("document_type")),
-                    description=_clean_string(norm.get("description")),
-                    balance_category=balance_cat,
-                    selection_type="High Value",
-                    source_row_index=idx,
+        for stats in file_stats:
+            stats.reset()
+        pass_two_started = time.perf_counter()
+
+        population_size = sum(t.population_size for t in totals)
+        total_abs = sum(t.total_abs for t in totals)
+        excluded_zero = sum(t.excluded_zero for t in totals)
+        excluded_balance = sum(t.excluded_balance for t in totals)
+        high_value = [txn for t in totals for txn in t.high_value]
+        groups: BreakdownAccumulator | None = None
+        for t in totals:
+            if groups is None:
+                groups = t.breakdown
+            elif t.breakdown is not None:
+                groups.merge(t.breakdown)
+        scoped = _sum_scope_counts(t.scope_counts for t in totals)
+        if scope_counts is not None:
+            for reason, count in scoped.items():
+                scope_counts[reason] = scope_counts.get(reason, 0) + count
+
+        if population_size == 0:
+            raise ValueError(
+                "Population is empty after applying balance filters."
+            )
+
+        # Remaining balance excludes high value
+        remaining_abs = total_abs - sum(
+            t.amount_abs or 0.0 for t in high_value
+        )
+        random_size = _random_target(remaining_abs, interval)
+        log.info(
+            EventCode.STREAM_PASS1_DONE.value,
+            population_size=population_size,
+            total_abs=total_abs,
+            high_value_count=len(high_value),
+            random_target=random_size,
+            zero_filtered=excluded_zero,
+            balance_filtered=excluded_balance,
+            scope_filtered=scoped,
+        )
+        k = max(0, random_size)
+        if on_high_value is not None:
+            eligible = population_size - len(high_value)
+            on_high_value(high_value, len(high_value) + min(k, eligible))
+
+        # Pass 2: reservoir sampling over non-high-value items, files in
+        # order. Slots hold the raw row handle only; fields are decoded and
+        # parsed once the sample is final.
+        log.info(EventCode.STREAM_PASS2_START.value)
+        slots: list[tuple[int, int, Any, float]] = []
+        seen = 0
+
+        if export_path is not None:
+            with open_export(export_path) as export:
+                slots = _export_pass(
+                    streams,
+                    params,
+                    interval,
+                    k,
+                    population_size - len(high_value),
+                    export,
+                    show_progress,
                 )
-                high_value.append(txn)
+            log.info(
+                EventCode.POPULATION_EXPORTED.value,
+                path=str(export_path),
+                rows=export.rows,
+            )
+        elif k > 0:
+            rng = random.Random(params.random_seed)
+            for index, stream in enumerate(streams):
+                amounts = _progress(
+                    stream.iter_amounts(),
+                    "Pass 2: selecting random",
+                    show_progress,
+                    stream.num_rows,
+                )
+                for idx, signed, handle in amounts:
+                    if signed is None:
+                        continue
+                    abs_val = abs(signed)
+                    balance_cat = _derive_balance(signed)
+                    include, _ = _apply_balance_filters(
+                        abs_val, balance_cat, params
+                    )
+                    if not include:
+                        continue
+                    if abs_val > interval:
+                        continue
+                    seen += 1
+                    if len(slots) < k:
+                        slots.append((index, idx, handle, signed))
+                    else:
+                        j = rng.randint(0, seen - 1)
+                        if j < k:
+                            slots[j] = (index, idx, handle, signed)
+
+        reservoir: list[Any] = [None] * len(slots)
+        for index, stream in enumerate(streams):
+            positions = [
+                pos for pos, slot in enumerate(slots) if slot[0] == index
+            ]
+            picked = stream.transactions(
+                [slots[pos][1:] for pos in positions], "Random"
+            )
+            for pos, txn in zip(positions, picked):
+                reservoir[pos] = txn
+    if read_stats is not None:
+        # Pass 2 reads the files one after another on this thread
+        read_stats.elapsed_seconds += time.perf_counter() - pass_two_started
+        read_stats.io_wait_seconds += sum(
+            s.io_wait_seconds for s in file_stats
+        )
+    return _finish_streaming(
+        high_value,
+        reservoir,
+        population_size,
+        total_abs,
+        interval,
+        excluded_zero,
+        excluded_balance,
+        groups,
+    )
 
-    if population_size == 0:
-        raise ValueError("Population is empty after applying balance filters.")
 
-    # Remaining balance excludes high value
-    remaining_abs = total_abs - sum(t.amount_abs for t in high_value)
-    tentative_size = remaining_abs / interval if interval > 0 else 0
-    random_size = int(tentative_size + 0.9999)
-    log.info(
-        EventCode.STREAM_PASS1_DONE.value,
-        population_size=population_size,
-        total_abs=total_abs,
-        high_value_count=len(high_value),
-        random_target=random_size,
-        zero_filtered=excluded_zero,
-        balance_filtered=excluded_balance,
-    )
+def _generate_sample_sqlite(
+    input_path: Path,
+    params: SamplingParameters,
+    sql: str | None,
+    scope_counts: dict[str, int] | None = None,
+) -> tuple[list[CleanedTransaction], SampleStatistics]:
+    """Sampler over a SQLite table or query with filters pushed into SQL.
 
-    # Pass 2: reservoir sampling over non-high-value items
-    log.info(EventCode.STREAM_PASS2_START.value)
-    reservoir: list[CleanedTransaction] = []
-    k = max(0, random_size)
-    seen = 0
+    Amounts are parsed once into a temporary table; totals, exclusions and
+    the high-value selection are SQL aggregates and ``WHERE`` clauses. The
+    random items are drawn as positions, exactly as ``generate_sample``
+    draws them from the remaining population, so the sample and
+    statistics match the in-memory path for the same rows.
 
-    if k > 0:
-        with open(input_csv, "r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.DictReader(f)
+    Args:
+        input_path (Path): SQLite database path.
+        params (SamplingParameters): Sampling parameters validated via Pydantic.
+        sql (str | None): Table name or query; ``None`` reads the only table.
+        scope_counts (dict[str, int] | None): Optional accumulator for rows
+            outside the population scope.
+
+    Returns:
+        tuple[list[CleanedTransaction], SampleStatistics]: Sampled transactions and statistics.
+    """
+    from .sqlite_source import SqlitePopulation
+
+    interval = params.sampling_interval()
+    log.info("stream_pass1_start", interval=interval, sqlite=True)
+
+    with SqlitePopulation(input_path, sql) as source:
+        totals = source.population_totals(params, interval)
+        if totals["population_size"] == 0:
+            raise ValueError(
+                "Population is empty after applying balance filters."
+            )
+        high_value_idx = source.high_value_indices(params, interval)
+        scoped = {
+            reason: totals[f"excluded_{reason}"] for reason in SCOPE_REASONS
+        }
+        if scope_counts is not None:
+            for reason, count in scoped.items():
+                scope_counts[reason] = scope_counts.get(reason, 0) + count
+
+        remaining_size = totals["remaining_size"]
+        random_size = 0
+        if remaining_size and totals["remaining_abs"]:
+            random_size = min(
+                _random_target(totals["remaining_abs"], interval),
+                remaining_size,
+            )
+        log.info(
+            EventCode.STREAM_PASS1_DONE.value,
+            population_size=totals["population_size"],
+            total_abs=totals["population_abs"],
+            high_value_count=len(high_value_idx),
+            random_target=random_size,
+            zero_filtered=totals["excluded_zero"],
+            balance_filtered=totals["excluded_balance"],
+            scope_filtered=scoped,
+        )
+
+        log.info(EventCode.STREAM_PASS2_START.value)
+        random_idx: list[int] = []
+        if random_size > 0:
             rng = random.Random(params.random_seed)
-            iterator = reader
-            if show_progress:
-                iterator = tqdm(
-                    reader, desc="Pass 2: selecting random", unit="row"
+            positions = rng.sample(range(remaining_size), random_size)
+            random_idx = source.remaining_indices(params, interval, positions)
+        rows = source.take_rows(high_value_idx + random_idx)
+
+    def _materialise(
+        idx: int, selection_type: Literal["High Value", "Random"]
+    ) -> CleanedTransaction:
+        norm = rows[idx]
+        signed = _parse_amount(norm.get("amount", ""))["value"]
+        return _streamed_transaction(idx, norm, signed, selection_type)
+
+    return _finish_streaming(
+        [_materialise(i, "High Value") for i in high_value_idx],
+        [_materialise(i, "Random") for i in random_idx],
+        totals["population_size"],
+        totals["population_abs"],
+        interval,
+        totals["excluded_zero"],
+        totals["excluded_balance"],
+    )
+
+
+class _PassOneTotals:
+    """Population totals and high-value picks from one file's pass 1."""
+
+    def __init__(self) -> None:
+        self.population_size = 0
+        self.total_abs = 0.0
+        self.excluded_zero = 0
+        self.excluded_balance = 0
+        self.scope_counts: dict[str, int] = {}
+        self.high_value: list[CleanedTransaction] = []
+        self.breakdown: BreakdownAccumulator | None = None
+
+
+def _sum_scope_counts(counts: Iterator[dict[str, int]]) -> dict[str, int]:
+    """Add per-file scope exclusion counts by reason."""
+    total = dict.fromkeys(SCOPE_REASONS, 0)
+    for per_file in counts:
+        for reason, count in per_file.items():
+            total[reason] += count
+    return total
+
+
+def _scan_population(
+    stream: "_StreamFile",
+    params: SamplingParameters,
+    interval: float,
+    show_progress: bool,
+    breakdown: bool = False,
+) -> _PassOneTotals:
+    """Run pass 1 over one population file.
+
+    Args:
+        stream (_StreamFile): Open population file.
+        params (SamplingParameters): Sampling parameters validated via Pydantic.
+        interval (float): Sampling interval.
+        show_progress (bool): Whether to show tqdm progress indicators.
+        breakdown (bool): Total the population rows by group as well.
+
+    Returns:
+        _PassOneTotals: Totals, exclusion counts and high-value selections.
+    """
+    totals = _PassOneTotals()
+    picks: list[tuple[int, Any, float]] = []
+    spool_all = stream.keep_excluded
+    groups = totals.breakdown = (
+        BreakdownAccumulator(interval) if breakdown else None
+    )
+    amounts = _progress(
+        stream.iter_amounts(),
+        "Pass 1: scanning population",
+        show_progress,
+        stream.num_rows,
+    )
+    for idx, signed, handle in amounts:
+        if signed is None:
+            continue
+        if spool_all:
+            # The export pass needs every row with an amount again
+            stream.spool(idx, signed, handle)
+            if type(handle) is _Excluded:
+                continue
+        abs_val = abs(signed)
+        balance_cat = _derive_balance(signed)
+        include, reason = _apply_balance_filters(abs_val, balance_cat, params)
+        if not include:
+            if reason == "zero":
+                totals.excluded_zero += 1
+            else:
+                totals.excluded_balance += 1
+            continue
+        totals.population_size += 1
+        totals.total_abs += abs_val
+        if groups is not None:
+            groups.add_raw(
+                *stream.row_fields(idx, handle), balance_cat, abs_val
+            )
+        if abs_val > interval:
+            picks.append((idx, handle, signed))
+        elif not spool_all:
+            stream.spool(idx, signed, handle)
+    totals.high_value = stream.transactions(picks, "High Value")
+    totals.scope_counts = dict(stream.scope_counts)
+    return totals
+
+
+class _Excluded(NamedTuple):
+    """Handle of a row outside the population scope, kept for the export."""
+
+    handle: Any
+    reason: str
+
+
+class _StreamFile:
+    """One population file opened for amount-only streaming passes.
+
+    CSV files yield raw row handles that are decoded on demand; columnar
+    files yield row indices whose rows are fetched in one batch; Excel
+    workbooks and standard input yield field lists and replay a pass-1
+    spool in pass 2. Either way, selected rows come back keyed by
+    canonical column name.
+
+    With a population scope, every scan drops out-of-scope rows and
+    counts them in ``scope_counts``; spool replays hold in-scope rows only.
+    With ``keep_excluded`` the out-of-scope rows are still yielded, their
+    handle wrapped in ``_Excluded`` with the reason.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        source_file: str | None,
+        block_size: int,
+        prefetch_depth: int,
+        stats: ReadStats | None,
+        sheet: str | None = None,
+        scope: PopulationScope | None = None,
+        keep_excluded: bool = False,
+    ) -> None:
+        self.source_file = source_file
+        self.num_rows: int | None = None
+        self.scope = scope
+        self.keep_excluded = keep_excluded
+        self._export_rows: Iterator[tuple[int, dict[str, Any]]] | None = None
+        self._field_rows: Iterator[tuple[int, tuple[Any, Any]]] | None = None
+        self.scope_counts = dict.fromkeys(SCOPE_REASONS, 0)
+        self._scans = 0
+        self._csv: CsvPopulation | None = None
+        self._columnar: Any = None
+        self._excel: Any = None
+        self._pipe: PipePopulation | None = None
+        if is_columnar(path):
+            from .columnar import ColumnarPopulation
+
+            self._columnar = ColumnarPopulation(path)
+            self.num_rows = self._columnar.num_rows
+            self._columns = {}
+        elif is_excel(path):
+            from .excel_source import ExcelPopulation
+
+            self._excel = ExcelPopulation(path, sheet)
+            self._columns = self._excel.columns
+        elif is_stdin(path):
+            self._pipe = PipePopulation(
+                block_size=block_size,
+                prefetch_depth=prefetch_depth,
+                stats=stats,
+            )
+            self._columns = _resolve_columns(self._pipe.header)
+            self._amount_pos = self._columns.get("amount", -1)
+        else:
+            self._csv = CsvPopulation(
+                path,
+                block_size=block_size,
+                prefetch_depth=prefetch_depth,
+                stats=stats,
+            )
+            self._columns = _resolve_columns(self._csv.header)
+            self._amount_pos = self._columns.get("amount", -1)
+
+    def __enter__(self) -> "_StreamFile":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying reader."""
+        for source in (self._csv, self._columnar, self._excel, self._pipe):
+            if source is not None:
+                source.close()
+
+    def iter_amounts(self) -> Iterator[tuple[int, float | None, Any]]:
+        """Yield each row's index and signed amount with a row handle.
+
+        Returns:
+            Iterator[tuple[int, float | None, Any]]: Row index, amount
+            (``None`` when missing or invalid) and row handle, in file
+            order.
+        """
+        self._scans += 1
+        if self._excel is not None:
+            rows = self._excel.iter_amounts()
+            replayed = self._scans > 1
+        elif self._pipe is not None and self._pipe.consumed:
+            return self._pipe.spool.replay()
+        elif self._columnar is not None:
+            rows = (
+                (idx, signed, idx)
+                for idx, signed in enumerate(self._columnar.iter_amounts())
+            )
+            replayed = False
+        else:
+            source = self._pipe if self._pipe is not None else self._csv
+            assert source is not None
+            fields = source.iter_fields(self._amount_pos)
+            rows = (
+                (idx, _field_amount(field), handle)
+                for idx, (field, handle) in enumerate(fields)
+            )
+            replayed = False
+        if self.scope is None or replayed:
+            return rows
+        return self._in_scope(rows, self.scope)
+
+    def _in_scope(
+        self,
+        rows: Iterator[tuple[int, float | None, Any]],
+        scope: PopulationScope,
+    ) -> Iterator[tuple[int, float | None, Any]]:
+        """Drop rows outside the population scope, counting them.
+
+        Args:
+            rows (Iterator[tuple[int, float | None, Any]]): Scanned rows.
+            scope (PopulationScope): Filters the rows are checked against.
+
+        Returns:
+            Iterator[tuple[int, float | None, Any]]: In-scope rows and rows
+            without a valid amount, in file order.
+        """
+        counts = self.scope_counts = dict.fromkeys(SCOPE_REASONS, 0)
+        columnar_fields = None
+        if self._columnar is not None and scope.needs_fields:
+            columnar_fields = zip(
+                self._columnar.iter_values("document_type"),
+                self._columnar.iter_values("effective_date"),
+            )
+        for idx, signed, handle in rows:
+            current = (
+                None if columnar_fields is None else next(columnar_fields)
+            )
+            if signed is None:
+                yield idx, signed, handle
+                continue
+            reason = scope.amount_reason(signed)
+            if reason is None and scope.needs_fields:
+                reason = scope.field_reason(
+                    *(current or self._scope_fields(handle))
                 )
-            for idx, raw in enumerate(iterator):
-                norm = _normalize_row(raw)
-                amt = _parse_amount(norm.get("amount", ""))
-                if amt["value"] is None:
-                    continue
-                signed = amt["value"]
+            if reason is None:
+                yield idx, signed, handle
+            else:
+                counts[reason] += 1
+                if self.keep_excluded:
+                    yield idx, signed, _Excluded(handle, reason)
+
+    def _scope_fields(self, handle: Any) -> tuple[Any, Any]:
+        """Return a row's raw document type and effective date.
+
+        Args:
+            handle (Any): CSV row handle or field list.
+
+        Returns:
+            tuple[Any, Any]: Document type and date cells (``""`` when the
+            column is absent or the row is short).
+        """
+        record = self._csv.record(handle) if self._csv is not None else handle
+        values = []
+        for name in ("document_type", "effective_date"):
+            position = self._columns.get(name, -1)
+            inside = 0 <= position < len(record)
+            values.append(record[position] if inside else "")
+        return values[0], values[1]
+
+    def row_fields(self, idx: int, handle: Any) -> tuple[Any, Any]:
+        """Return a row's raw document type and effective date in pass 1.
+
+        Columnar files read the two columns alongside the amount scan, so
+        calls must come in increasing ``idx`` order.
+
+        Args:
+            idx (int): Row index within the file.
+            handle (Any): Row handle from ``iter_amounts``.
+
+        Returns:
+            tuple[Any, Any]: Document type and date cells.
+        """
+        if self._columnar is None:
+            return self._scope_fields(handle)
+        if self._field_rows is None:
+            self._field_rows = enumerate(
+                zip(
+                    self._columnar.iter_values("document_type"),
+                    self._columnar.iter_values("effective_date"),
+                )
+            )
+        for position, fields in self._field_rows:
+            if position == idx:
+                return fields
+        raise IndexError(f"Row {idx} is past the end of the file")
+
+    def export_row(self, idx: int, handle: Any) -> dict[str, Any]:
+        """Return one row keyed by canonical column name, in scan order.
+
+        Columnar files read their full rows alongside the amount scan, so
+        calls must come in increasing ``idx`` order.
+
+        Args:
+            idx (int): Row index within the file.
+            handle (Any): Row handle from ``iter_amounts``.
+
+        Returns:
+            dict[str, Any]: Row keyed like ``_normalize_row`` output.
+        """
+        if self._csv is not None:
+            return _record_row(self._csv.record(handle), self._columns)
+        if self._columnar is None:
+            return _record_row(handle, self._columns)
+        if self._export_rows is None:
+            self._export_rows = enumerate(self._columnar.iter_rows())
+        for position, row in self._export_rows:
+            if position == idx:
+                return _normalize_row(row)
+        raise IndexError(f"Row {idx} is past the end of the file")
+
+    def spool(self, idx: int, signed: float, handle: Any) -> None:
+        """Offer a pass-1 row that stays eligible for random selection.
+
+        Only sources that are costly to read twice keep it; the others
+        simply rescan in pass 2.
+
+        Args:
+            idx (int): Row index within the file.
+            signed (float): Parsed signed amount.
+            handle (Any): Row handle from ``iter_amounts``.
+        """
+        if self._excel is not None:
+            self._excel.spool(idx, signed, handle)
+        elif self._pipe is not None:
+            self._pipe.spool.append((idx, signed, handle))
+
+    def transactions(
+        self,
+        picks: list[tuple[int, Any, float]],
+        selection_type: Literal["High Value", "Random"],
+    ) -> list[CleanedTransaction]:
+        """Materialise selected rows as transactions.
+
+        Args:
+            picks (list[tuple[int, Any, float]]): Row index, handle and
+                signed amount per selected row.
+            selection_type (Literal["High Value", "Random"]): Selection label.
+
+        Returns:
+            list[CleanedTransaction]: Transactions in ``picks`` order.
+        """
+        if self._csv is not None:
+            rows = [
+                _record_row(self._csv.record(handle), self._columns)
+                for _, handle, _ in picks
+            ]
+        elif self._excel is not None or self._pipe is not None:
+            rows = [
+                _record_row(handle, self._columns) for _, handle, _ in picks
+            ]
+        else:
+            fetched = self._columnar.take_rows(h for _, h, _ in picks)
+            rows = [fetched[handle] for _, handle, _ in picks]
+        return [
+            _streamed_transaction(
+                idx, norm, signed, selection_type, self.source_file
+            )
+            for (idx, _, signed), norm in zip(picks, rows)
+        ]
+
+
+def _reservoir_positions(
+    eligible: int, k: int, rng: random.Random
+) -> list[int]:
+    """Replay the pass-2 reservoir on row positions alone.
+
+    The reservoir's choices depend only on the generator and the number
+    of eligible rows, so the same draws give the same slots.
+
+    Args:
+        eligible (int): Rows eligible for random selection.
+        k (int): Reservoir size.
+        rng (random.Random): Generator seeded as in pass 2.
+
+    Returns:
+        list[int]: Eligible-row ordinal held by each slot.
+    """
+    slots = list(range(min(k, eligible)))
+    for seen in range(k + 1, eligible + 1):
+        j = rng.randint(0, seen - 1)
+        if j < k:
+            slots[j] = seen - 1
+    return slots
+
+
+def _export_pass(
+    streams: list[_StreamFile],
+    params: SamplingParameters,
+    interval: float,
+    k: int,
+    eligible: int,
+    export: PopulationExport,
+    show_progress: bool,
+) -> list[tuple[int, int, Any, float]]:
+    """Run pass 2 while writing every row to the population export.
+
+    The reservoir slots are worked out before the scan (see
+    ``_reservoir_positions``), so each row's final selection is known as
+    it streams past and the sample matches the plain reservoir pass.
+
+    Args:
+        streams (list[_StreamFile]): Files opened with ``keep_excluded``.
+        params (SamplingParameters): Sampling parameters validated via Pydantic.
+        interval (float): Sampling interval.
+        k (int): Random sample size.
+        eligible (int): Rows eligible for random selection (pass 1).
+        export (PopulationExport): Open export sink.
+        show_progress (bool): Whether to show tqdm progress indicators.
+
+    Returns:
+        list[tuple[int, int, Any, float]]: Reservoir slots as file index,
+        row index, handle and signed amount.
+    """
+    positions = (
+        _reservoir_positions(eligible, k, random.Random(params.random_seed))
+        if k > 0
+        else []
+    )
+    slot_of = {position: slot for slot, position in enumerate(positions)}
+    slots: list[Any] = [None] * len(positions)
+    seen = 0
+    for index, stream in enumerate(streams):
+        amounts = _progress(
+            stream.iter_amounts(),
+            "Pass 2: exporting population",
+            show_progress,
+            stream.num_rows,
+        )
+        for idx, signed, handle in amounts:
+            if signed is None:
+                continue
+            selection: Literal["High Value", "Random"] | None = None
+            reason: str | None = None
+            if type(handle) is _Excluded:
+                handle, reason = handle
+            else:
                 abs_val = abs(signed)
-                balance_cat = _derive_balance(signed)
-                include, _ = _apply_balance_filters(
-                    abs_val, balance_cat, params
+                include, reason = _apply_balance_filters(
+                    abs_val, _derive_balance(signed), params
                 )
                 if not include:
-                    continue
-                if abs_val > interval:
-                    continue
-                seen += 1
-                if len(reservoir) < k:
-                    reservoir.append(
-                        CleanedTransaction(
-                            transaction_id=_clean_string(
-                                norm.get("transaction_id")
-                            ),
-                            amount_signed=signed,
-                            amount_abs=abs_val,
-                            effective_date=_parse_date(
-                                norm.get("effective_date", "")
-                            )["value"],
-                            document_type=_clean_string(
-                                norm.get("document_type")
-                            ),
-                            description=_clean_string(norm.get("description")),
-                            balance_category=balance_cat,
-                            selection_type="Random",
-                            source_row_index=idx,
-                        )
-                    )
+                    pass
+                elif abs_val > interval:
+                    selection = "High Value"
                 else:
-                    j = rng.randint(0, seen - 1)
-                    if j < k:
-                        reservoir[j] = CleanedTransaction(
-                            transaction_id=_clean_string(
-                                norm.get("transaction_id")
-                            ),
-                            amount_signed=signed,
-                            amount_abs=abs_val,
-                            effective_date=_parse_date(
-                                norm.get("effective_date", "")
-                            )["value"],
-                            document_type=_clean_string(
-                                norm.get("document_type")
-                            ),
-                            description=_clean_string(norm.get("description")),
-                            balance_category=balance_cat,
-                            selection_type="Random",
-                            source_row_index=idx,
-                        )
+                    slot = slot_of.get(seen)
+                    seen += 1
+                    if slot is not None:
+                        slots[slot] = (index, idx, handle, signed)
+                        selection = "Random"
+            norm = stream.export_row(idx, handle)
+            export.write(
+                (
+                    stream.source_file,
+                    idx,
+                    _clean_string(norm.get("transaction_id")),
+                    signed,
+                    abs(signed),
+                    _parse_date(norm.get("effective_date", ""))["value"],
+                    _clean_string(norm.get("document_type")),
+                    _clean_string(norm.get("description")),
+                    _derive_balance(signed),
+                    selection is not None,
+                    selection,
+                    reason,
+                )
+            )
+    return slots
+
+
+def _progress(
+    iterator: Iterator[Any],
+    desc: str,
+    show_progress: bool,
+    total: int | None = None,
+) -> Iterator[Any]:
+    """Wrap an iterator in a tqdm bar when progress output is enabled."""
+    if show_progress:
+        return tqdm(iterator, desc=desc, unit="row", total=total)
+    return iterator
+
+
+def _field_amount(field: str | bytes | None) -> float | None:
+    """Parse an amount field without building the row around it.
+
+    Raw bytes from the memory-mapped reader go straight to ``float``;
+    anything it rejects is decoded and re-checked by ``_parse_amount`` so
+    the outcome matches the text path exactly.
+
+    Args:
+        field (str | bytes | None): Amount field, ``None`` when absent.
+
+    Returns:
+        float | None: Signed amount, or ``None`` when missing or invalid.
+    """
+    if field is None:
+        return None
+    if isinstance(field, bytes):
+        try:
+            return float(field)
+        except ValueError:
+            field = field.decode("utf-8", "replace")
+    return _parse_amount(field)["value"]
+
+
+def _record_row(record: list[str], columns: dict[str, int]) -> dict[str, str]:
+    """Key a record by canonical column name, for selected rows only.
+
+    Args:
+        record (list[str]): Field values for one row.
+        columns (dict[str, int]): Canonical column positions.
+
+    Returns:
+        dict[str, str]: Row keyed like ``_normalize_row`` output.
+    """
+    width = len(record)
+    return {
+        name: record[position]
+        for name, position in columns.items()
+        if position < width
+    }
+
+
+def _streamed_transaction(
+    idx: int,
+    norm: dict[str, str],
+    signed: float,
+    selection_type: Literal["High Value", "Random"],
+    source_file: str | None = None,
+) -> CleanedTransaction:
+    """Build a selected transaction from a normalized streamed row.
+
+    Args:
+        idx (int): Row index within the population file.
+        norm (dict[str, str]): Row keyed by canonical column names.
+        signed (float): Parsed signed amount.
+        selection_type (Literal["High Value", "Random"]): Selection label.
+        source_file (str | None): File label for multi-file populations.
+
+    Returns:
+        CleanedTransaction: Transaction ready for reporting.
+    """
+    return CleanedTransaction(
+        transaction_id=_clean_string(norm.get("transaction_id")),
+        amount_signed=signed,
+        amount_abs=abs(signed),
+        effective_date=_parse_date(norm.get("effective_date", ""))["value"],
+        document_type=_clean_string(norm.get("document_type")),
+        description=_clean_string(norm.get("description")),
+        balance_category=_derive_balance(signed),
+        selection_type=selection_type,
+        source_row_index=idx,
+        source_file=source_file,
+    )
+
+
+def _random_target(remaining_abs: float, interval: float) -> int:
+    """Return the random sample size for the remaining balance.
+
+    Args:
+        remaining_abs (float): Population balance excluding high value.
+        interval (float): Sampling interval.
+
+    Returns:
+        int: Number of random items to select.
+    """
+    tentative_size = remaining_abs / interval if interval > 0 else 0
+    return int(tentative_size + 0.9999)
+
+
+def _finish_streaming(
+    high_value: list[CleanedTransaction],
+    reservoir: list[CleanedTransaction],
+    population_size: int,
+    total_abs: float,
+    interval: float,
+    excluded_zero: int,
+    excluded_balance: int,
+    groups: BreakdownAccumulator | None = None,
+) -> tuple[list[CleanedTransaction], SampleStatistics]:
+    """Combine streamed selections and compute their statistics."""
 
     sample = high_value + reservoir
+    if groups is not None:
+        groups.add_sample(sample)
     coverage_abs = sum(t.amount_abs for t in sample)
     coverage_percent = coverage_abs / total_abs * 100 if total_abs > 0 else 0.0
 
@@ -261,6 +1081,7 @@ def generate_sample_streaming(
         coverage_percent=coverage_percent,
         excluded_zero_amounts=excluded_zero,
         excluded_due_to_balance=excluded_balance,
+        breakdown=groups.result() if groups is not None else None,
     )
 
     log.info(
@@ -352,8 +1173,12 @@ def _exclude_transactions(
     Returns:
         list[CleanedTransaction]: Population items remaining for random selection.
     """
-    exclude_indices = {t.source_row_index for t in to_exclude}
-    return [t for t in population if t.source_row_index not in exclude_indices]
+    exclude_keys = {(t.source_file, t.source_row_index) for t in to_exclude}
+    return [
+        t
+        for t in population
+        if (t.source_file, t.source_row_index) not in exclude_keys
+    ]
 
 
 def _select_random_sample(
@@ -431,6 +1256,7 @@ def _build_statistics(
     interval: float,
     zero_filtered: int,
     balance_filtered: int,
+    groups: BreakdownAccumulator | None = None,
 ) -> SampleStatistics:
     """Compute coverage and count metrics for reporting."""
 
@@ -445,6 +1271,8 @@ def _build_statistics(
         1 for t in sample if t.selection_type == "High Value"
     )
     random_count = sum(1 for t in sample if t.selection_type == "Random")
+    if groups is not None:
+        groups.add_sample(sample)
 
     stats = SampleStatistics(
         population_size=len(population),
@@ -456,6 +1284,7 @@ def _build_statistics(
         coverage_percent=coverage_percent,
         excluded_zero_amounts=zero_filtered,
         excluded_due_to_balance=balance_filtered,
+        breakdown=groups.result() if groups is not None else None,
     )
 
     return stats
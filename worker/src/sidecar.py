@@ -0,0 +1,110 @@
+"""Persisted report inputs, so outputs can be rebuilt without resampling."""
+
+from __future__ import annotations
+
+import gzip
+import os
+from datetime import datetime
+from pathlib import Path
+
+from .logging_setup import get_logger
+from .models import (
+    CleanedTransaction,
+    DataQualityReport,
+    EventCode,
+    ReportInputs,
+    SampleStatistics,
+    SamplingParameters,
+)
+
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".report.json.gz"
+# Fast gzip: the sample's repeated keys still shrink about tenfold
+SIDECAR_COMPRESSLEVEL = 1
+
+log = get_logger("sidecar")
+
+
+def sidecar_path(output_dir: Path, run_id: str) -> Path:
+    """Return where a run's report inputs are stored.
+
+    Args:
+        output_dir (Path): Run output directory.
+        run_id (str): Run identifier.
+
+    Returns:
+        Path: ``runs/<run_id>.report.json.gz`` under ``output_dir``.
+    """
+    return output_dir / "runs" / f"{run_id}{SIDECAR_SUFFIX}"
+
+
+def save_report_inputs(
+    path: Path,
+    sample: list[CleanedTransaction],
+    quality_report: DataQualityReport,
+    sample_stats: SampleStatistics,
+    params: SamplingParameters,
+    timestamp: datetime,
+    run_id: str,
+) -> Path:
+    """Write everything ``generate_reports`` needs, atomically.
+
+    Args:
+        path (Path): Destination file.
+        sample (list[CleanedTransaction]): Selected sample transactions.
+        quality_report (DataQualityReport): Data quality statistics.
+        sample_stats (SampleStatistics): Calculated sampling metrics.
+        params (SamplingParameters): Parameters used to drive sampling.
+        timestamp (datetime): Report timestamp.
+        run_id (str): Unique identifier for the execution run.
+
+    Returns:
+        Path: The written file.
+    """
+    inputs = ReportInputs(
+        version=SIDECAR_VERSION,
+        run_id=run_id,
+        timestamp=timestamp,
+        parameters=params,
+        quality_report=quality_report,
+        sample_statistics=sample_stats,
+        sample=sample,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    with gzip.open(
+        partial, "wb", compresslevel=SIDECAR_COMPRESSLEVEL
+    ) as handle:
+        handle.write(inputs.model_dump_json().encode("utf-8"))
+    os.replace(partial, path)
+    log.info(
+        EventCode.REPORT_INPUTS_SAVED.value, path=str(path), rows=len(sample)
+    )
+    return path
+
+
+def load_report_inputs(path: Path) -> ReportInputs:
+    """Read report inputs written by ``save_report_inputs``.
+
+    Args:
+        path (Path): Sidecar file.
+
+    Returns:
+        ReportInputs: The run's sample, statistics and parameters.
+
+    Raises:
+        ValueError: If the file was written by another sidecar version.
+    """
+    with gzip.open(path, "rb") as handle:
+        inputs = ReportInputs.model_validate_json(handle.read())
+    if inputs.version != SIDECAR_VERSION:
+        raise ValueError(
+            f"{path} has report inputs version {inputs.version}, "
+            f"expected {SIDECAR_VERSION}"
+        )
+    log.info(
+        EventCode.REPORT_INPUTS_LOADED.value,
+        path=str(path),
+        rows=len(inputs.sample),
+    )
+    return inputs
@@ -0,0 +1,534 @@
+"""SQLite population source with sampling filters pushed down into SQL."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .cleaner import (
+    PopulationScope,
+    _clean_string,
+    _parse_amount,
+    _parse_date,
+    _resolve_columns,
+)
+from .models import SamplingParameters
+from .readers import _to_text
+
+DEFAULT_FETCH_ROWS = 10_000
+
+_QUERY_PREFIX = re.compile(r"^\s*(select|with|values)\b", re.IGNORECASE)
+
+
+class SqlitePopulation:
+    """Read-only population over a table or query in a SQLite file.
+
+    Row indices follow the source order (``rowid`` for tables), matching
+    the row index a CSV export of the same rows would get. Sources
+    without a usable ``rowid`` (queries, views and ``WITHOUT ROWID``
+    tables) are copied once into a temporary table, so their rows keep
+    one order however often they are read. Amounts are parsed once by
+    ``_parse_amount`` (registered as a SQL function) into a temporary
+    ``(_idx, _rowid, _amount)`` table, so the zero, balance-type and
+    high-value tests run as plain SQL ``WHERE`` clauses and selected rows
+    are fetched by ``rowid``. Population scope filters add normalised
+    ``_doc`` and ISO ``_date`` columns, filled only when a document type or
+    date filter is set.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sql: str | None = None,
+        fetch_rows: int = DEFAULT_FETCH_ROWS,
+    ) -> None:
+        self.path = Path(path)
+        self.fetch_rows = fetch_rows
+        if not self.path.is_file():
+            raise FileNotFoundError(self.path)
+        self._conn = sqlite3.connect(
+            f"{self.path.resolve().as_uri()}?mode=ro", uri=True
+        )
+        self._conn.create_function(
+            "parse_amount", 1, _sql_amount, deterministic=True
+        )
+        self._conn.create_function(
+            "scope_document_type", 1, _sql_document_type, deterministic=True
+        )
+        self._conn.create_function(
+            "scope_date", 1, _sql_date, deterministic=True
+        )
+        self._source = self._resolve_source(sql)
+        cursor = self._conn.execute(
+            f"SELECT * FROM {self._source} AS s LIMIT 0"
+        )
+        self.header = [column[0] for column in cursor.description]
+        self.columns = _resolve_columns(self.header)
+        self._amounts_loaded = False
+
+    def __enter__(self) -> "SqlitePopulation":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        """Yield every row keyed by its column name, in source order.
+
+        Returns:
+            Iterator[dict[str, Any]]: Rows shaped like ``csv.DictReader``
+            output, fetched ``fetch_rows`` at a time.
+        """
+        cursor = self._conn.execute(
+            f"SELECT * FROM {self._source} AS s ORDER BY s.rowid"
+        )
+        header = self.header
+        while batch := cursor.fetchmany(self.fetch_rows):
+            for row in batch:
+                yield {key: _to_text(value) for key, value in zip(header, row)}
+
+    def population_totals(
+        self, params: SamplingParameters, interval: float
+    ) -> dict[str, Any]:
+        """Aggregate the filtered population in one SQL pass.
+
+        Args:
+            params (SamplingParameters): Filters to apply.
+            interval (float): High-value threshold on absolute amounts.
+
+        Returns:
+            dict[str, Any]: ``population_size``, ``population_abs``,
+            ``remaining_size`` and ``remaining_abs`` (excluding high value),
+            ``excluded_zero``, ``excluded_balance`` and the scope exclusions
+            ``excluded_amount_band``, ``excluded_document_type`` and
+            ``excluded_date``.
+        """
+        self._load_amounts(params)
+        band, doc, date = _scope_clauses(params)
+        zero, balance = _filter_clauses(params)
+        in_scope = f"NOT ({band}) AND NOT ({doc}) AND NOT ({date})"
+        included = f"{in_scope} AND NOT ({zero}) AND NOT ({balance})"
+        remaining = f"{included} AND ABS(_amount) <= :interval"
+        row = self._conn.execute(
+            f"""
+            SELECT
+                COUNT(CASE WHEN {included} THEN 1 END),
+                TOTAL(CASE WHEN {included} THEN ABS(_amount) END),
+                COUNT(CASE WHEN {remaining} THEN 1 END),
+                TOTAL(CASE WHEN {remaining} THEN ABS(_amount) END),
+                COUNT(CASE WHEN {in_scope} AND ({zero}) THEN 1 END),
+                COUNT(
+                    CASE WHEN {in_scope} AND NOT ({zero}) AND ({balance})
+                    THEN 1 END
+                ),
+                COUNT(CASE WHEN ({band}) THEN 1 END),
+                COUNT(CASE WHEN NOT ({band}) AND ({doc}) THEN 1 END),
+                COUNT(
+                    CASE WHEN NOT ({band}) AND NOT ({doc}) AND ({date})
+                    THEN 1 END
+                )
+            FROM temp._population
+            WHERE _amount IS NOT NULL
+            """,
+            _bindings(params, interval),
+        ).fetchone()
+        keys = (
+            "population_size",
+            "population_abs",
+            "remaining_size",
+            "remaining_abs",
+            "excluded_zero",
+            "excluded_balance",
+            "excluded_amount_band",
+            "excluded_document_type",
+            "excluded_date",
+        )
+        return dict(zip(keys, row))
+
+    def high_value_indices(
+        self, params: SamplingParameters, interval: float
+    ) -> list[int]:
+        """Return indices of included rows above the interval, in order.
+
+        Args:
+            params (SamplingParameters): Filters to apply.
+            interval (float): High-value threshold on absolute amounts.
+
+        Returns:
+            list[int]: Row indices in source order.
+        """
+        self._load_amounts(params)
+        cursor = self._conn.execute(
+            f"""
+            SELECT _idx FROM temp._population
+            WHERE {_included_clause(params)} AND ABS(_amount) > :interval
+            ORDER BY _idx
+            """,
+            _bindings(params, interval),
+        )
+        return [idx for (idx,) in cursor]
+
+    def remaining_indices(
+        self,
+        params: SamplingParameters,
+        interval: float,
+        positions: list[int],
+    ) -> list[int]:
+        """Map positions within the non-high-value population to indices.
+
+        Args:
+            params (SamplingParameters): Filters to apply.
+            interval (float): High-value threshold on absolute amounts.
+            positions (list[int]): Zero-based positions among the included,
+                non-high-value rows in source order.
+
+        Returns:
+            list[int]: Row indices, in ``positions`` order.
+        """
+        self._load_amounts(params)
+        self._conn.execute("DROP TABLE IF EXISTS temp._picked")
+        self._conn.execute(
+            "CREATE TEMP TABLE _picked (pos INTEGER PRIMARY KEY, draw INTEGER)"
+        )
+        self._conn.executemany(
+            "INSERT INTO temp._picked VALUES (?, ?)",
+            ((pos, draw) for draw, pos in enumerate(positions)),
+        )
+        cursor = self._conn.execute(
+            f"""
+            SELECT r._idx, p.draw FROM (
+                SELECT _idx, ROW_NUMBER() OVER (ORDER BY _idx) - 1 AS pos
+                FROM temp._population
+                WHERE {_included_clause(params)}
+                    AND ABS(_amount) <= :interval
+            ) AS r
+            JOIN temp._picked AS p ON p.pos = r.pos
+            """,
+            _bindings(params, interval),
+        )
+        by_draw = sorted(cursor, key=lambda pair: pair[1])
+        return [idx for idx, _ in by_draw]
+
+    def take_rows(self, indices: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Fetch full rows for selected indices only.
+
+        Each row is looked up by the ``rowid`` recorded when the amounts
+        were loaded, so only the selected rows are read.
+
+        Args:
+            indices (Iterable[int]): Zero-based population row indices.
+
+        Returns:
+            dict[int, dict[str, Any]]: Rows keyed by index, with columns
+            keyed by canonical name.
+
+        Raises:
+            RuntimeError: If called before the amounts are loaded.
+        """
+        if not self._amounts_loaded:
+            raise RuntimeError("take_rows needs the population loaded first")
+        self._conn.execute("DROP TABLE IF EXISTS temp._wanted")
+        self._conn.execute(
+            "CREATE TEMP TABLE _wanted (_idx INTEGER PRIMARY KEY)"
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO temp._wanted VALUES (?)",
+            ((idx,) for idx in indices),
+        )
+        cursor = self._conn.execute(
+            f"""
+            SELECT p._idx, s.* FROM temp._wanted AS w
+            JOIN temp._population AS p ON p._idx = w._idx
+            JOIN {self._source} AS s ON s.rowid = p._rowid
+            """
+        )
+        rows: dict[int, dict[str, Any]] = {}
+        while batch := cursor.fetchmany(self.fetch_rows):
+            for idx, *values in batch:
+                rows[idx] = {
+                    name: _to_text(values[position])
+                    for name, position in self.columns.items()
+                }
+        return rows
+
+    def _load_amounts(self, params: SamplingParameters) -> None:
+        """Parse every amount once into ``temp._population``.
+
+        Each row's ``rowid`` is kept alongside its index for
+        :meth:`take_rows`. Document type and date keys are parsed too when ``params`` has a
+        field filter; otherwise those columns stay ``NULL``.
+
+        Args:
+            params (SamplingParameters): Filters about to be applied.
+        """
+        if self._amounts_loaded:
+            return
+        scope = PopulationScope.from_params(params)
+        with_fields = scope is not None and scope.needs_fields
+        amount = self._column_expr("parse_amount", "amount")
+        doc = self._column_expr("scope_document_type", "document_type")
+        date = self._column_expr("scope_date", "effective_date")
+        if not with_fields:
+            doc = date = "NULL"
+        self._conn.execute(
+            "CREATE TEMP TABLE _population "
+            "(_idx INTEGER PRIMARY KEY, _rowid INTEGER, _amount REAL, "
+            "_doc TEXT, _date TEXT)"
+        )
+        self._conn.execute(
+            f"""
+            INSERT INTO temp._population (_idx, _rowid, _amount, _doc, _date)
+            SELECT ROW_NUMBER() OVER (ORDER BY s.rowid) - 1, s.rowid,
+                {amount}, {doc}, {date}
+            FROM {self._source} AS s
+            """
+        )
+        self._amounts_loaded = True
+
+    def _column_expr(self, function: str, field: str) -> str:
+        """Return ``function(column)`` for a canonical field, or ``NULL``.
+
+        Args:
+            function (str): Registered SQL function name.
+            field (str): Canonical column name.
+
+        Returns:
+            str: SQL expression over the source alias ``s``.
+        """
+        position = self.columns.get(field)
+        if position is None:
+            return "NULL"
+        return f"{function}(s.{_quote(self.header[position])})"
+
+    def _resolve_source(self, sql: str | None) -> str:
+        """Return the quoted source table, copying it first if needed.
+
+        Queries, views and ``WITHOUT ROWID`` tables run once into
+        ``temp._source``, whose ``rowid`` order is the order they
+        returned, so every later read sees the same rows at the same
+        indices. The copy takes as much temporary storage as the rows.
+
+        Args:
+            sql (str | None): Table name or query; ``None`` selects the
+                only table in the database.
+
+        Returns:
+            str: Quoted table name, read in ``rowid`` order.
+
+        Raises:
+            ValueError: If no table is named and the database does not
+                contain exactly one.
+        """
+        if sql is not None and _QUERY_PREFIX.match(sql):
+            return self._copy_source(f"({sql.strip().rstrip(';')})")
+        if sql is None:
+            tables = [
+                name
+                for (name,) in self._conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' "
+                    "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+                )
+            ]
+            if len(tables) != 1:
+                raise ValueError(
+                    f"{self.path} has tables {tables}; "
+                    "name one with --sql TABLE or pass a SELECT query"
+                )
+            sql = tables[0]
+        if not self._has_rowid(sql):
+            return self._copy_source(_quote(sql))
+        return _quote(sql)
+
+    def _has_rowid(self, name: str) -> bool:
+        """Return whether a named table keeps a ``rowid`` for its rows.
+
+        Args:
+            name (str): Table or view name.
+
+        Returns:
+            bool: ``False`` for views and ``WITHOUT ROWID`` tables.
+        """
+        kind = self._conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = ? COLLATE NOCASE",
+            (name,),
+        ).fetchone()
+        if kind is not None and kind[0] == "view":
+            return False
+        try:
+            self._conn.execute(f"SELECT rowid FROM {_quote(name)} LIMIT 0")
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def _copy_source(self, source: str) -> str:
+        """Copy a ``FROM`` item into ``temp._source`` in its own order.
+
+        Args:
+            source (str): Quoted name or parenthesised query.
+
+        Returns:
+            str: The temporary table's name.
+        """
+        self._conn.execute(
+            f"CREATE TEMP TABLE _source AS SELECT * FROM {source}"
+        )
+        return "temp._source"
+
+
+def iter_sqlite_rows(path: Path, sql: str | None = None) -> Iterator[dict]:
+    """Yield every row of a SQLite population source.
+
+    Args:
+        path (Path): SQLite database path.
+        sql (str | None): Table name or query; ``None`` selects the only
+            table in the database.
+
+    Returns:
+        Iterator[dict]: Rows keyed by column name.
+    """
+    with SqlitePopulation(path, sql) as source:
+        yield from source.iter_rows()
+
+
+def _sql_amount(value: Any) -> float | None:
+    """``parse_amount`` SQL function: the cleaner's amount rules.
+
+    Args:
+        value (Any): Stored cell value of any SQLite type.
+
+    Returns:
+        float | None: Signed amount, or ``NULL`` when missing or invalid.
+    """
+    return _parse_amount(_to_text(value))["value"]
+
+
+def _sql_document_type(value: Any) -> str:
+    """``scope_document_type`` SQL function: trimmed, upper-cased text."""
+    return (_clean_string(_to_text(value)) or "").upper()
+
+
+def _sql_date(value: Any) -> str | None:
+    """``scope_date`` SQL function: ISO date, ``NULL`` when unparseable."""
+    parsed = _parse_date(_to_text(value))["value"]
+    return None if parsed is None else parsed.date().isoformat()
+
+
+def _scope_clauses(params: SamplingParameters) -> tuple[str, str, str]:
+    """Build the amount band, document type and date exclusion predicates.
+
+    They mirror ``PopulationScope`` over the ``_amount``, ``_doc`` and
+    ``_date`` columns; unset filters become ``0``. Values are bound by
+    :func:`_bindings`.
+
+    Args:
+        params (SamplingParameters): Filters to apply.
+
+    Returns:
+        tuple[str, str, str]: SQL predicates true for rows outside the
+        amount band, document types and date range.
+    """
+    band = []
+    if params.amount_min is not None:
+        band.append("ABS(_amount) < :amount_min")
+    if params.amount_max is not None:
+        band.append("ABS(_amount) > :amount_max")
+    doc = []
+    if params.include_document_types:
+        doc.append("_doc NOT IN (SELECT value FROM json_each(:include_types))")
+    if params.exclude_document_types:
+        doc.append("_doc IN (SELECT value FROM json_each(:exclude_types))")
+    date = []
+    if params.date_from or params.date_to:
+        date.append("_date IS NULL")
+    if params.date_from:
+        date.append("_date < :date_from")
+    if params.date_to:
+        date.append("_date > :date_to")
+    return (
+        " OR ".join(band) or "0",
+        " OR ".join(doc) or "0",
+        " OR ".join(date) or "0",
+    )
+
+
+def _included_clause(params: SamplingParameters) -> str:
+    """Return the predicate for rows inside the sampling population.
+
+    Args:
+        params (SamplingParameters): Filters to apply.
+
+    Returns:
+        str: SQL predicate over ``temp._population``.
+    """
+    band, doc, date = _scope_clauses(params)
+    zero, balance = _filter_clauses(params)
+    excluded = " OR ".join(
+        f"({clause})" for clause in (band, doc, date, zero, balance)
+    )
+    return f"_amount IS NOT NULL AND NOT ({excluded})"
+
+
+def _bindings(params: SamplingParameters, interval: float) -> dict[str, Any]:
+    """Return the named parameters used by the filter predicates.
+
+    Args:
+        params (SamplingParameters): Filters to apply.
+        interval (float): High-value threshold on absolute amounts.
+
+    Returns:
+        dict[str, Any]: Values for ``:interval`` and the scope filters.
+    """
+    return {
+        "interval": interval,
+        "amount_min": params.amount_min,
+        "amount_max": params.amount_max,
+        "include_types": json.dumps(
+            [t.strip().upper() for t in params.include_document_types]
+        ),
+        "exclude_types": json.dumps(
+            [t.strip().upper() for t in params.exclude_document_types]
+        ),
+        "date_from": params.date_from and params.date_from.isoformat(),
+        "date_to": params.date_to and params.date_to.isoformat(),
+    }
+
+
+def _filter_clauses(params: SamplingParameters) -> tuple[str, str]:
+    """Build the zero and balance-type exclusion predicates.
+
+    They mirror ``_apply_balance_filters``: zero amounts are excluded
+    first, then rows outside the requested balance category.
+
+    Args:
+        params (SamplingParameters): Filters to apply.
+
+    Returns:
+        tuple[str, str]: SQL predicates over ``_amount`` that are true for
+        rows excluded as zero and as the wrong balance type.
+    """
+    zero = "_amount = 0" if params.exclude_zero_amounts else "0"
+    balance = {
+        "both": "0",
+        "credit": "NOT (_amount > 0)",
+        "debit": "NOT (_amount < 0)",
+    }[params.balance_type]
+    return zero, balance
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier.
+
+    Args:
+        identifier (str): Table or column name.
+
+    Returns:
+        str: Double-quoted identifier with embedded quotes escaped.
+    """
+    return '"' + identifier.replace('"', '""') + '"'
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import csv
+import random
+from collections.abc import Callable, Sequence
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, NamedTuple
 
 import pytest
 
@@ -37,6 +41,124 @@ def sample_csv(tmp_path_factory) -> Path:
     return p
 
 
+LEDGER_HEADER = [
+    "transaction_id",
+    "amount",
+    "effective_date",
+    "document_type",
+    "description",
+]
+
+
+class SyntheticLedger(NamedTuple):
+    """Rows written by ``make_ledger`` and the CSV holding them."""
+
+    path: Path
+    rows: list[list[Any]]
+    date_format: str
+
+    @property
+    def header(self) -> list[str]:
+        return list(LEDGER_HEADER)
+
+    def records(self) -> list[tuple[Any, ...]]:
+        """Return the rows as written to the CSV, dates as text."""
+        return [
+            tuple(
+                (
+                    f"{value:{self.date_format}}"
+                    if isinstance(value, datetime)
+                    else value
+                )
+                for value in row
+            )
+            for row in self.rows
+        ]
+
+    def write(self, append: bool = False) -> Path:
+        """Write the rows to ``path``; appended rows get no header."""
+        with open(
+            self.path, "a" if append else "w", newline="", encoding="utf-8"
+        ) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            if not append:
+                writer.writerow(self.header)
+            writer.writerows(self.records())
+        return self.path
+
+
+@pytest.fixture()
+def make_ledger(tmp_path: Path) -> Callable[..., SyntheticLedger]:
+    """Factory writing a seeded synthetic ledger CSV under ``tmp_path``.
+
+    Row ``i`` is ``[T{i}, amount, date, document type, "Line {i}"]`` with
+    the amount drawn uniformly from ``-spread..spread`` and rounded to
+    cents, unless ``special[i % every]`` replaces it (callables receive
+    the drawn amount). Dates fall on day ``i % 28 + 1`` of the first
+    ``months`` months of 2024, ``ids`` wraps transaction ids to create
+    duplicates and ``append`` adds the rows to an existing file without
+    a header. Tests editing ``rows`` call ``write`` again.
+    """
+
+    def make(
+        count: int = 400,
+        *,
+        seed: int = 0,
+        start: int = 0,
+        spread: float = 3000.0,
+        every: int = 50,
+        special: dict[int, Any] | None = None,
+        months: int = 1,
+        documents: Sequence[str] = ("INV", "CM"),
+        ids: int | None = None,
+        date_format: str = "%d/%m/%Y",
+        name: str = "ledger.csv",
+        append: bool = False,
+    ) -> SyntheticLedger:
+        rng = random.Random(seed)
+        special = special or {}
+        rows: list[list[Any]] = []
+        for i in range(start, start + count):
+            amount: Any = round(rng.uniform(-spread, spread), 2)
+            if i % every in special:
+                value = special[i % every]
+                amount = value(amount) if callable(value) else value
+            rows.append(
+                [
+                    f"T{i if ids is None else i % ids}",
+                    amount,
+                    datetime(2024, i % months + 1, i % 28 + 1),
+                    rng.choice(documents),
+                    f"Line {i}",
+                ]
+            )
+        ledger = SyntheticLedger(tmp_path / name, rows, date_format)
+        ledger.write(append)
+        return ledger
+
+    return make
+
+
+@pytest.fixture()
+def make_params() -> Callable[..., SamplingParameters]:
+    """Factory for parameters suited to ``make_ledger`` populations.
+
+    Keyword arguments override the defaults.
+    """
+
+    def make(**overrides: Any) -> SamplingParameters:
+        values: dict[str, Any] = {
+            "tolerable_misstatement": 9000.0,
+            "expected_misstatement": 100.0,
+            "assurance_factor": 2.0,
+            "random_seed": 17,
+        }
+        values.update(overrides)
+        return SamplingParameters(**values)
+
+    return make
+
+
 @pytest.fixture()
 def sampling_params() -> SamplingParameters:
     """Default parameters for tests."""
@@ -0,0 +1,118 @@
+"""Tests for the population breakdown by document type and month."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from worker.src.breakdown import BLANK_GROUP, OTHER_GROUP, BreakdownAccumulator
+from worker.src.cleaner import clean_data
+from worker.src.models import SamplingParameters
+from worker.src.reporter import generate_reports
+from worker.src.sampler import generate_sample, generate_sample_streaming
+
+
+def _params() -> SamplingParameters:
+    return SamplingParameters(
+        tolerable_misstatement=1000.0,
+        expected_misstatement=100.0,
+        assurance_factor=2.0,
+        random_seed=9,
+    )
+
+
+def test_accumulator_bounds_and_merges_groups() -> None:
+    first = BreakdownAccumulator(interval=100.0, max_groups=2)
+    first.add("INV", "debit", datetime(2024, 1, 5), 150.0)
+    first.add("CM", "credit", datetime(2024, 2, 5), 20.0)
+    first.add("JE", "debit", None, 30.0)
+    second = BreakdownAccumulator(interval=100.0, max_groups=2)
+    second.add("INV", "debit", datetime(2024, 1, 9), 10.0)
+    second.add("PAY", "debit", datetime(2024, 1, 9), 5.0)
+    first.merge(second)
+
+    result = first.result()
+    docs = {g.key: g for g in result.document_type}
+    assert list(docs) == ["INV", "CM", OTHER_GROUP]
+    assert docs["INV"].count == 2
+    assert docs["INV"].amount_abs == pytest.approx(160.0)
+    assert docs["INV"].high_value_count == 1
+    assert docs[OTHER_GROUP].count == 2
+    # The blank month arrives once both groups are taken
+    assert [g.key for g in result.month] == ["2024-01", "2024-02", OTHER_GROUP]
+    assert sum(g.count for g in result.month) == 5
+    assert result.max_groups == 2
+
+
+def test_streaming_breakdown_matches_in_memory(sample_csv: Path) -> None:
+    cleaned, _ = clean_data(sample_csv)
+    memory_sample, memory_stats = generate_sample(
+        cleaned, _params(), breakdown=True
+    )
+    stream_sample, stream_stats = generate_sample_streaming(
+        sample_csv, _params(), breakdown=True
+    )
+    # The random picks differ between the samplers; the population
+    # totals do not
+    fields = {"sample_count", "sample_amount_abs"}
+    for stats, sample in (
+        (memory_stats, memory_sample),
+        (stream_stats, stream_sample),
+    ):
+        breakdown = stats.breakdown
+        assert breakdown is not None
+        for table in (breakdown.document_type, breakdown.month):
+            assert sum(g.count for g in table) == stats.population_size
+            assert sum(g.sample_count for g in table) == len(sample)
+    for key in ("document_type", "balance_category", "month"):
+        assert [
+            g.model_dump(exclude=fields)
+            for g in getattr(stream_stats.breakdown, key)
+        ] == [
+            g.model_dump(exclude=fields)
+            for g in getattr(memory_stats.breakdown, key)
+        ]
+    breakdown = memory_stats.breakdown
+    # The 13/31/2024 row has no valid date
+    assert breakdown.month[-1].key == BLANK_GROUP
+
+    _, plain_stats = generate_sample(cleaned, _params())
+    assert plain_stats.breakdown is None
+
+
+def test_breakdown_sheet_written(sample_csv: Path, tmp_path: Path) -> None:
+    cleaned, quality = clean_data(sample_csv)
+    sample, stats = generate_sample(cleaned, _params(), breakdown=True)
+    path = generate_reports(
+        tmp_path,
+        sample,
+        quality,
+        stats,
+        _params(),
+        datetime.now(timezone.utc),
+        "run-1",
+    )
+    workbook = load_workbook(path)
+    assert workbook.sheetnames[-2:] == [
+        "Population Breakdown",
+        "Parameters Used",
+    ]
+    rows = list(workbook["Population Breakdown"].values)
+    assert rows[0][:2] == ("Document Type", "Count")
+    assert rows[1][0] == "INV"
+    workbook.close()
+
+
+def test_sqlite_breakdown_rejected(tmp_path: Path) -> None:
+    import sqlite3
+
+    path = tmp_path / "gl.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE gl (transaction_id TEXT, amount REAL)")
+    with pytest.raises(ValueError):
+        generate_sample_streaming(
+            path, _params(), sql="SELECT * FROM gl", breakdown=True
+        )
@@ -0,0 +1,161 @@
+"""Tests for streamed ZIP bundles of run artefacts."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from worker.src.bundle import (
+    MANIFEST_NAME,
+    bundle_members,
+    iter_bundle,
+    write_bundle,
+)
+
+WORKER = Path(__file__).resolve().parents[1]
+
+
+def test_iter_bundle_streams_in_bounded_chunks(tmp_path: Path) -> None:
+    (tmp_path / "runs").mkdir()
+    report = tmp_path / "report.xlsx"
+    report.write_bytes(os.urandom(300_000))
+    (tmp_path / "sample.csv").write_text("id,amount\n" + "A,1\n" * 50_000)
+    (tmp_path / "runs" / "r1.json").write_text("{}")
+    (tmp_path / "empty.csv").write_text("")
+
+    chunks = list(iter_bundle(bundle_members(tmp_path), chunk_bytes=4096))
+    # Each chunk is flushed once a block's worth has built up
+    assert len(chunks) > 50
+    assert max(len(chunk) for chunk in chunks[:-1]) < 3 * 4096
+
+    bundle = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert bundle.testzip() is None
+    assert bundle.namelist() == [
+        "empty.csv",
+        "report.xlsx",
+        "runs/r1.json",
+        "sample.csv",
+        MANIFEST_NAME,
+    ]
+    assert bundle.getinfo("report.xlsx").compress_type == zipfile.ZIP_STORED
+    sample = bundle.getinfo("sample.csv")
+    assert sample.compress_type == zipfile.ZIP_DEFLATED
+    assert sample.compress_size < sample.file_size // 10
+
+    manifest = json.loads(bundle.read(MANIFEST_NAME))
+    for entry in manifest["files"]:
+        data = bundle.read(entry["name"])
+        assert entry["size"] == len(data)
+        assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+    assert manifest["files"][1]["compression"] == "stored"
+
+
+def test_write_bundle_replaces_atomically(tmp_path: Path) -> None:
+    source = tmp_path / "a.txt"
+    source.write_text("alpha")
+    target = tmp_path / "out" / "run.zip"
+    target.parent.mkdir()
+    target.write_bytes(b"stale")
+
+    assert write_bundle(target, [(source, "docs/a.txt")]) == target
+    assert sorted(p.name for p in target.parent.iterdir()) == ["run.zip"]
+    with zipfile.ZipFile(target) as bundle:
+        assert bundle.read("docs/a.txt") == b"alpha"
+
+
+HEADER = ["transaction_id", "amount", "effective_date", "document_type"]
+
+
+def _ledger_rows() -> list[list[str]]:
+    return [
+        [f"T{i}", str(i * 13 - 400), f"03/{i % 28 + 1:02d}/2024", "JE"]
+        for i in range(80)
+    ]
+
+
+def _run_bundle(source: Path, out: Path, *extra: str) -> dict:
+    """Run the CLI with ``--bundle`` and return the new run summary."""
+    earlier = set((out / "runs").glob("*.json"))
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [env.get("PYTHONPATH"), str(WORKER / "src")])
+    )
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "src.main",
+            "--input",
+            str(source),
+            "--output-dir",
+            str(out),
+            "--tolerable",
+            "3000",
+            "--expected",
+            "100",
+            "--assurance",
+            "3",
+            "--bundle",
+            *extra,
+        ],
+        check=True,
+        env=env,
+        cwd=str(WORKER),
+        stdout=subprocess.DEVNULL,
+    )
+    (summary,) = set((out / "runs").glob("*.json")) - earlier
+    return json.loads(summary.read_text())
+
+
+def test_cli_bundle_holds_run_artefacts(tmp_path: Path) -> None:
+    lines = [",".join(HEADER + ["description"])]
+    lines += [",".join(row + [""]) for row in _ledger_rows()]
+    lines.append("BAD,abc,03/01/2024,JE,")
+    source = tmp_path / "gl.csv"
+    source.write_text("\n".join(lines) + "\n")
+    out = tmp_path / "out"
+    run = _run_bundle(source, out, "--output-format", "xlsx", "csv")
+    assert run["bundle"] == str(out / "runs" / f"{run['run_id']}.zip")
+    with zipfile.ZipFile(run["bundle"]) as bundle:
+        assert bundle.namelist() == [
+            "sample_selection_output.xlsx",
+            "sample_selection_output.csv",
+            "rejected_rows.csv",
+            f"runs/{run['run_id']}.report.json.gz",
+            f"runs/{run['run_id']}.json",
+            MANIFEST_NAME,
+        ]
+        assert json.loads(bundle.read(f"runs/{run['run_id']}.json")) == run
+
+
+def test_cli_bundle_skips_stale_rejected_rows(tmp_path: Path) -> None:
+    """A second run that rejects nothing leaves the old file out."""
+    out = tmp_path / "out"
+    source = tmp_path / "gl.csv"
+    lines = [",".join(HEADER)] + [",".join(row) for row in _ledger_rows()]
+    source.write_text("\n".join(lines + ["BAD,abc,03/01/2024,JE"]) + "\n")
+    first = _run_bundle(source, out)
+    with zipfile.ZipFile(first["bundle"]) as bundle:
+        assert "rejected_rows.csv" in bundle.namelist()
+
+    # Workbooks skip the cleaning pass under --fast, so the first
+    # run's rejected_rows.csv stays in the output directory
+    workbook = Workbook()
+    workbook.active.append(HEADER)
+    for row in _ledger_rows():
+        workbook.active.append(row)
+    xlsx = tmp_path / "gl.xlsx"
+    workbook.save(xlsx)
+    second = _run_bundle(xlsx, out, "--fast")
+    assert second["run_id"] != first["run_id"]
+    assert (out / "rejected_rows.csv").exists()
+    with zipfile.ZipFile(second["bundle"]) as bundle:
+        assert "rejected_rows.csv" not in bundle.namelist()
@@ -5,11 +5,14 @@ from __future__ import annotations
 from pathlib import Path
 
 from worker.src.cleaner import (
+    INTERN_PROBE_ROWS,
     _clean_string,
     _derive_balance,
     _parse_amount,
     _parse_date,
+    _StringPool,
     clean_data,
+    load_raw_data,
 )
 
 
@@ -107,3 +110,90 @@ def test_clean_data_handles_invalid_amounts(tmp_path: Path) -> None:
     cleaned, report = clean_data(csv_path)
     assert len(cleaned) == 1
     assert report.invalid_amount_format == 1
+
+
+def test_clean_data_writes_rejected_rows(tmp_path: Path) -> None:
+    """Rejected rows are quarantined with their index and reason code."""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text(
+        "transaction_id,amount,effective_date,document_type,description\n"
+        "1,,01/01/2024,INV,Missing\n"
+        "2,200,01/01/2024,INV,Valid\n"
+        "3,oops,01/01/2024,INV,Invalid\n"
+    )
+    rejected_path = tmp_path / "out" / "rejected_rows.csv"
+    cleaned, report = clean_data(csv_path, rejected_path=rejected_path)
+    assert len(cleaned) == 1
+    assert report.validation_failed == 0
+    lines = rejected_path.read_text().splitlines()
+    assert lines == [
+        "row_index,reason,transaction_id,amount,effective_date,"
+        "document_type,description",
+        "0,missing_amount,1,,01/01/2024,INV,Missing",
+        "2,invalid_amount,3,oops,01/01/2024,INV,Invalid",
+    ]
+
+
+def test_clean_data_skips_rejected_file_when_clean(tmp_path: Path) -> None:
+    """No quarantine file is created when every row is accepted."""
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("transaction_id,amount\n1,100\n")
+    rejected_path = tmp_path / "rejected_rows.csv"
+    clean_data(csv_path, rejected_path=rejected_path)
+    assert not rejected_path.exists()
+
+
+def test_clean_data_removes_rejected_file_of_earlier_run(
+    tmp_path: Path,
+) -> None:
+    """A clean run does not leave the previous run's rejections behind."""
+    rejected_path = tmp_path / "rejected_rows.csv"
+    dirty = tmp_path / "dirty.csv"
+    dirty.write_text("transaction_id,amount\n1,oops\n2,100\n")
+    clean_data(dirty, rejected_path=rejected_path)
+    assert rejected_path.exists()
+
+    clean = tmp_path / "clean.csv"
+    clean.write_text("transaction_id,amount\n1,100\n")
+    _, report = clean_data(clean, rejected_path=rejected_path)
+    assert report.invalid_amount_format == 0
+    assert not rejected_path.exists()
+
+
+def test_parse_date_memoised_results_are_stable() -> None:
+    """Repeated date strings resolve identically through the cache."""
+    first = _parse_date(" 05/06/2024 ")
+    second = _parse_date("05/06/2024")
+    assert first == second == {"value": first["value"], "valid": True}
+    assert _parse_date("31/31/2024") == {"value": None, "valid": False}
+    assert _parse_date("31/31/2024") == {"value": None, "valid": False}
+
+
+def test_string_pool_drops_high_cardinality_columns() -> None:
+    """Repetitive columns share instances; unique columns pass through."""
+    pool = _StringPool(("document_type", "transaction_id"))
+    shared = set()
+    for i in range(INTERN_PROBE_ROWS):
+        shared.add(id(pool.intern("document_type", "".join(["IN", "V"]))))
+        pool.intern("transaction_id", f"T{i}")
+    assert len(shared) == 1
+    assert pool.columns == ["document_type"]
+    value = f"T{INTERN_PROBE_ROWS}"
+    assert pool.intern("transaction_id", value) is value
+    assert pool.intern("document_type", None) is None
+
+
+def test_clean_data_interns_without_changing_values(tmp_path: Path) -> None:
+    """Interned descriptions are shared objects with unchanged values."""
+    csv_path = tmp_path / "data.csv"
+    lines = ["transaction_id,amount,effective_date,document_type,description"]
+    lines += [
+        f"T{i},{i + 1},01/01/2024,INV,Accrual {i % 3}" for i in range(50)
+    ]
+    csv_path.write_text("\n".join(lines) + "\n")
+    cleaned, report = clean_data(csv_path)
+    raw = load_raw_data(csv_path)
+    assert report.total_rows_raw == 50
+    assert [t.description for t in cleaned] == [r["description"] for r in raw]
+    assert len({id(t.description) for t in cleaned}) == 3
+    assert len({id(t.document_type) for t in cleaned}) == 1
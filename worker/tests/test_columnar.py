@@ -0,0 +1,166 @@
+"""Tests for Parquet / Arrow IPC population input."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from worker.src.cleaner import clean_data
+from worker.src.models import SamplingParameters
+from worker.src.sampler import generate_sample_streaming
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+feather = pytest.importorskip("pyarrow.feather")
+
+ROWS = 200
+
+
+def _columns() -> dict[str, list]:
+    """Aliased headers with a mix of valid, zero, invalid and large rows."""
+    ids, amounts, dates, docs, descs = [], [], [], [], []
+    for i in range(ROWS):
+        ids.append(f"T{i}")
+        if i % 37 == 0:
+            amounts.append("bad")
+        elif i % 23 == 0:
+            amounts.append("0")
+        elif i % 41 == 0:
+            amounts.append("")
+        else:
+            sign = -1 if i % 3 == 0 else 1
+            amounts.append(str(sign * (i * 97 % 1500 + 0.5)))
+        dates.append(f"{i % 28 + 1:02d}/01/2024")
+        docs.append("INV" if i % 2 else "CM")
+        descs.append(f"Row {i}")
+    return {
+        "TransactionID": ids,
+        "Value": amounts,
+        "Date": dates,
+        "DocType": docs,
+        "Description": descs,
+    }
+
+
+@pytest.fixture()
+def population_files(tmp_path: Path) -> dict[str, Path]:
+    columns = _columns()
+    csv_path = tmp_path / "population.csv"
+    lines = [",".join(columns)]
+    for values in zip(*columns.values()):
+        lines.append(",".join(values))
+    csv_path.write_text("\n".join(lines) + "\n")
+
+    table = pa.table(columns)
+    parquet_path = tmp_path / "population.parquet"
+    pq.write_table(table, parquet_path, row_group_size=64)
+    feather_path = tmp_path / "population.feather"
+    feather.write_feather(table, feather_path, chunksize=50)
+    return {
+        "csv": csv_path,
+        "parquet": parquet_path,
+        "feather": feather_path,
+    }
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+@pytest.mark.parametrize("balance_type", ["both", "debit"])
+def test_columnar_streaming_matches_csv(
+    population_files: dict[str, Path], fmt: str, balance_type: str
+) -> None:
+    """Columnar streaming selects the same rows as the CSV path."""
+    params = SamplingParameters(
+        tolerable_misstatement=5000.0,
+        expected_misstatement=500.0,
+        assurance_factor=4.0,
+        balance_type=balance_type,
+        random_seed=3,
+    )
+    csv_sample, csv_stats = generate_sample_streaming(
+        population_files["csv"], params
+    )
+    col_sample, col_stats = generate_sample_streaming(
+        population_files[fmt], params
+    )
+    assert col_stats == csv_stats
+    assert [t.model_dump() for t in col_sample] == [
+        t.model_dump() for t in csv_sample
+    ]
+
+
+def test_columnar_breakdown_matches_csv(
+    population_files: dict[str, Path],
+) -> None:
+    """The breakdown reads the columnar date and type columns in step."""
+    params = SamplingParameters(
+        tolerable_misstatement=5000.0,
+        expected_misstatement=500.0,
+        assurance_factor=4.0,
+        balance_type="debit",
+        random_seed=3,
+    )
+    _, csv_stats = generate_sample_streaming(
+        population_files["csv"], params, breakdown=True
+    )
+    _, col_stats = generate_sample_streaming(
+        population_files["parquet"], params, breakdown=True
+    )
+    assert col_stats.breakdown is not None
+    assert col_stats.breakdown == csv_stats.breakdown
+    assert len(col_stats.breakdown.month) == 1
+
+
+def test_columnar_clean_data_matches_csv(
+    population_files: dict[str, Path],
+) -> None:
+    """In-memory cleaning reads columnar files with the same results."""
+    csv_cleaned, csv_report = clean_data(population_files["csv"])
+    pq_cleaned, pq_report = clean_data(population_files["parquet"])
+    assert pq_report == csv_report
+    assert pq_cleaned == csv_cleaned
+
+
+def test_columnar_typed_columns(tmp_path: Path) -> None:
+    """Numeric amounts and timestamp dates are read without text parsing."""
+    from datetime import datetime
+
+    path = tmp_path / "typed.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                "trx_id": ["A", "B", "C"],
+                "amount": [1500.0, -20.0, None],
+                "effective_date": [datetime(2024, 3, 1)] * 3,
+            }
+        ),
+        path,
+    )
+    params = SamplingParameters(
+        tolerable_misstatement=1000.0,
+        expected_misstatement=0.0,
+        assurance_factor=1.0,
+        random_seed=1,
+    )
+    sample, stats = generate_sample_streaming(path, params)
+    assert stats.population_size == 2
+    assert sample[0].transaction_id == "A"
+    assert sample[0].selection_type == "High Value"
+    assert sample[0].effective_date == datetime(2024, 3, 1)
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps"
+)
+def test_columnar_close_unmaps_ipc_file(
+    population_files: dict[str, Path],
+) -> None:
+    """Closing an Arrow IPC population releases its memory map."""
+    from worker.src.columnar import ColumnarPopulation
+
+    path = str(population_files["feather"])
+    source = ColumnarPopulation(population_files["feather"])
+    assert sum(1 for _ in source.iter_amounts()) == ROWS
+    assert path in Path("/proc/self/maps").read_text()
+    source.close()
+    assert path not in Path("/proc/self/maps").read_text()
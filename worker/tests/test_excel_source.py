@@ -0,0 +1,146 @@
+"""Tests for the streaming Excel population input."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+from worker.src import excel_source
+from worker.src.cleaner import clean_data
+from worker.src.models import SamplingParameters
+from worker.src.sampler import generate_sample_streaming
+
+
+@pytest.fixture()
+def population(make_ledger, tmp_path: Path) -> tuple[Path, Path]:
+    """Write the same rows to a workbook (second sheet) and a CSV."""
+    ledger = make_ledger(
+        200,
+        seed=6,
+        every=40,
+        special={
+            5: 0,
+            13: "n/a",
+            21: None,
+            30: lambda amount: f"{abs(amount):,.2f}",
+        },
+    )
+    workbook = Workbook()
+    workbook.active.title = "Notes"
+    workbook.active.append(["Prepared by", "Audit"])
+    sheet = workbook.create_sheet("GL")
+    sheet.append(["TRX_ID", "Value", "Date", "DocType", "Description"])
+    for i, row in enumerate(ledger.rows):
+        sheet.append(row)
+        if i == 50:
+            sheet.append([])
+    xlsx = tmp_path / "ledger.xlsx"
+    workbook.save(xlsx)
+    return xlsx, ledger.path
+
+
+@pytest.fixture()
+def params(make_params) -> SamplingParameters:
+    return make_params(
+        tolerable_misstatement=6000.0, balance_type="debit", random_seed=12
+    )
+
+
+def test_excel_clean_data_matches_csv(
+    population: tuple[Path, Path],
+) -> None:
+    """Workbook rows go through the same cleaner as CSV rows."""
+    xlsx, csv_path = population
+    cleaned, report = clean_data(xlsx, sheet="GL")
+    expected, expected_report = clean_data(csv_path)
+    assert report == expected_report
+    assert cleaned == expected
+
+
+def test_excel_streaming_parses_workbook_once(
+    population: tuple[Path, Path],
+    params: SamplingParameters,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Pass 2 replays the spool and selects what the CSV path selects."""
+    xlsx, csv_path = population
+    opened = []
+    open_sheet = excel_source._open_sheet
+
+    def counting_open(path: Path, sheet: str | None):
+        opened.append(sheet)
+        return open_sheet(path, sheet)
+
+    monkeypatch.setattr(excel_source, "_open_sheet", counting_open)
+    sample, stats = generate_sample_streaming(xlsx, params, sheet="2")
+    expected, expected_stats = generate_sample_streaming(csv_path, params)
+    assert opened == ["2"]
+    assert stats == expected_stats
+    assert stats.random_sample_count > 0
+    assert sample == expected
+
+
+def test_excel_sheet_selection(population: tuple[Path, Path]) -> None:
+    """Sheets are chosen by name or position; unknown sheets fail."""
+    xlsx, _ = population
+    records = excel_source.iter_excel_records(xlsx)
+    assert next(records) == ["Prepared by", "Audit"]
+    records.close()
+    with excel_source.ExcelPopulation(xlsx, "GL") as source:
+        assert source.header == [
+            "TRX_ID",
+            "Value",
+            "Date",
+            "DocType",
+            "Description",
+        ]
+    with pytest.raises(ValueError):
+        list(excel_source.iter_excel_rows(xlsx, "Missing"))
+
+
+def test_cli_fast_skips_cleaning_workbook(
+    population: tuple[Path, Path], tmp_path: Path
+) -> None:
+    """``--fast`` reads a workbook once and notes the skipped checks."""
+    xlsx, _ = population
+    out_dir = tmp_path / "out"
+    worker = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [env.get("PYTHONPATH"), str(worker / "src")])
+    )
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "src.main",
+            "--input",
+            str(xlsx),
+            "--sheet",
+            "GL",
+            "--output-dir",
+            str(out_dir),
+            "--tolerable",
+            "6000",
+            "--expected",
+            "100",
+            "--assurance",
+            "2",
+            "--fast",
+        ],
+        check=True,
+        env=env,
+        cwd=str(worker),
+        stdout=subprocess.DEVNULL,
+    )
+    (summary_path,) = (out_dir / "runs").glob("*.json")
+    quality = json.loads(summary_path.read_text())["data_quality"]
+    assert "Excel workbook" in quality["notes"]
+    assert quality["total_rows_raw"] > 0
+    assert not (out_dir / "rejected_rows.csv").exists()
@@ -0,0 +1,208 @@
+"""Tests for the annotated population export."""
+
+from __future__ import annotations
+
+import csv
+import io
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+from worker.src.models import SamplingParameters
+from worker.src.readers import resolve_inputs
+from worker.src.sampler import generate_sample_streaming
+
+
+def _ledger(make_ledger):
+    return make_ledger(
+        seed=12,
+        spread=4000.0,
+        special={3: 0, 11: "bad"},
+        documents=["INV", "JE"],
+    )
+
+
+@pytest.fixture()
+def ledger(make_ledger) -> Path:
+    return _ledger(make_ledger).path
+
+
+@pytest.fixture()
+def params(make_params) -> SamplingParameters:
+    return make_params(balance_type="debit")
+
+
+def _read(path: Path) -> list[dict[str, str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _check(rows: list[dict[str, str]], sample) -> None:
+    """Selected export rows are the sample, with matching selection types."""
+    selected = {
+        (row["source_file"], int(row["source_row_index"])): row
+        for row in rows
+        if row["selected"] == "True"
+    }
+    assert len(selected) == len(sample)
+    for txn in sample:
+        row = selected[(txn.source_file or "", txn.source_row_index)]
+        assert row["transaction_id"] == txn.transaction_id
+        assert row["selection_type"] == txn.selection_type
+        assert float(row["amount_signed"]) == txn.amount_signed
+
+
+def test_csv_export_flags_every_row(
+    ledger: Path, params: SamplingParameters, tmp_path: Path
+) -> None:
+    """The sample is unchanged and every valid-amount row is written once."""
+    expected = generate_sample_streaming(ledger, params)
+    out = tmp_path / "population.csv"
+    sample, stats = generate_sample_streaming(
+        ledger, params, block_size=512, export_path=out
+    )
+    assert (sample, stats) == expected
+    rows = _read(out)
+    assert len(rows) == 392
+    _check(rows, sample)
+    reasons = Counter(row["exclusion_reason"] for row in rows)
+    assert reasons["zero"] == stats.excluded_zero_amounts
+    assert reasons["balance"] == stats.excluded_due_to_balance
+    assert reasons[""] == stats.population_size
+    types = Counter(row["selection_type"] for row in rows)
+    assert types["High Value"] == stats.high_value_count
+    assert types["Random"] == stats.random_sample_count > 0
+    # Dates match the CSV report's ISO text
+    assert rows[0]["effective_date"] == "2024-01-01T00:00:00"
+
+
+def test_export_keeps_scope_exclusions(
+    ledger: Path, params: SamplingParameters, tmp_path: Path
+) -> None:
+    params = params.model_copy(update={"exclude_document_types": ["JE"]})
+    out = tmp_path / "population.csv"
+    scope_counts: dict[str, int] = {}
+    sample, _ = generate_sample_streaming(
+        ledger, params, scope_counts=scope_counts, export_path=out
+    )
+    rows = _read(out)
+    _check(rows, sample)
+    excluded = [
+        row for row in rows if row["exclusion_reason"] == "document_type"
+    ]
+    assert len(excluded) == scope_counts["document_type"] > 0
+    assert {row["document_type"] for row in excluded} == {"JE"}
+    assert sample == generate_sample_streaming(ledger, params)[0]
+
+
+def test_excel_and_stdin_exports_match_csv(
+    ledger: Path,
+    params: SamplingParameters,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    make_ledger,
+) -> None:
+    """Spooled sources write the same rows as the CSV file."""
+    population = _ledger(make_ledger)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(population.header)
+    for row in population.rows:
+        sheet.append(row)
+    xlsx = tmp_path / "ledger.xlsx"
+    workbook.save(xlsx)
+    generate_sample_streaming(
+        ledger, params, export_path=tmp_path / "from_csv.csv"
+    )
+    expected = [
+        {k: v for k, v in row.items() if k != "source_file"}
+        for row in _read(tmp_path / "from_csv.csv")
+    ]
+
+    sample, _ = generate_sample_streaming(
+        xlsx, params, export_path=tmp_path / "from_xlsx.csv"
+    )
+    rows = _read(tmp_path / "from_xlsx.csv")
+    _check(rows, sample)
+    assert [row["selection_type"] for row in rows] == [
+        row["selection_type"] for row in expected
+    ]
+
+    stream = io.BytesIO(ledger.read_bytes())
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(stream))
+    sample, _ = generate_sample_streaming(
+        resolve_inputs("-"), params, export_path=tmp_path / "from_stdin.csv"
+    )
+    rows = _read(tmp_path / "from_stdin.csv")
+    _check(rows, sample)
+    assert [
+        {k: v for k, v in row.items() if k != "source_file"} for row in rows
+    ] == expected
+
+
+def test_multi_file_parquet_export(
+    ledger: Path, params: SamplingParameters, tmp_path: Path
+) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    second = tmp_path / "second.csv"
+    second.write_text(ledger.read_text())
+    out = tmp_path / "population.parquet"
+    sample, stats = generate_sample_streaming(
+        [ledger, second], params, export_path=out
+    )
+    assert (sample, stats) == generate_sample_streaming(
+        [ledger, second], params
+    )
+    table = pq.read_table(out)
+    assert table.num_rows == 2 * 392
+    rows = [
+        {
+            key: "" if value is None else str(value)
+            for key, value in row.items()
+        }
+        for row in table.to_pylist()
+    ]
+    _check(rows, sample)
+    assert isinstance(table.column("effective_date")[0].as_py(), datetime)
+
+
+def test_sqlite_export_rejected(
+    params: SamplingParameters, tmp_path: Path
+) -> None:
+    with pytest.raises(ValueError):
+        generate_sample_streaming(
+            tmp_path / "gl.sqlite",
+            params,
+            export_path=tmp_path / "population.csv",
+        )
+
+
+def test_columnar_input_export(
+    ledger: Path, params: SamplingParameters, tmp_path: Path
+) -> None:
+    """Parquet rows are read alongside the amount scan, in order."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [row for row in _read(ledger) if row["amount"] != "bad"]
+    table = pa.table(
+        {
+            "transaction_id": [row["transaction_id"] for row in rows],
+            "amount": [float(row["amount"]) for row in rows],
+            "effective_date": [row["effective_date"] for row in rows],
+            "document_type": [row["document_type"] for row in rows],
+        }
+    )
+    source = tmp_path / "ledger.parquet"
+    pq.write_table(table, source, row_group_size=50)
+    out = tmp_path / "population.csv"
+    sample, _ = generate_sample_streaming(source, params, export_path=out)
+    exported = _read(out)
+    assert len(exported) == len(rows)
+    _check(exported, sample)
+    assert [row["transaction_id"] for row in exported] == [
+        row["transaction_id"] for row in rows
+    ]
@@ -0,0 +1,230 @@
+"""Tests for incremental runs over append-only CSV populations."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from worker.src import incremental
+from worker.src.cleaner import clean_data
+from worker.src.incremental import load_state, sample_incremental
+from worker.src.models import SamplingParameters
+from worker.src.sampler import generate_sample
+
+
+def _write(make_ledger, start: int, count: int, append: bool = True) -> Path:
+    return make_ledger(
+        count,
+        seed=start,
+        start=start,
+        every=45,
+        special={4: "bad", 9: "0"},
+        documents=["INV"],
+        ids=370,
+        append=append,
+    ).path
+
+
+@pytest.fixture()
+def ledger(make_ledger) -> Path:
+    return _write(make_ledger, 0, 400, append=False)
+
+
+@pytest.fixture()
+def params(make_params) -> SamplingParameters:
+    return make_params(random_seed=5)
+
+
+@pytest.fixture()
+def full_runs(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every run that reads the whole file."""
+    calls: list[Path] = []
+    start = incremental._IncrementalRun.start.__func__
+
+    def counting_start(cls, input_csv, params, block_size):
+        calls.append(input_csv)
+        return start(cls, input_csv, params, block_size)
+
+    monkeypatch.setattr(
+        incremental._IncrementalRun, "start", classmethod(counting_start)
+    )
+    return calls
+
+
+def _fresh(ledger: Path, params: SamplingParameters, tmp_path: Path):
+    return sample_incremental(ledger, params, tmp_path / "fresh.json")
+
+
+def test_full_run_matches_in_memory_totals(
+    ledger: Path, params: SamplingParameters, tmp_path: Path
+) -> None:
+    """The first run cleans like ``clean_data`` and samples the same sizes."""
+    sample, stats, report = sample_incremental(
+        ledger, params, tmp_path / "state.json"
+    )
+    cleaned, expected_report = clean_data(ledger)
+    _, expected = generate_sample(cleaned, params)
+    assert report == expected_report.model_copy(
+        update={
+            "excluded_zero_amounts": expected.excluded_zero_amounts,
+            "excluded_due_to_balance": expected.excluded_due_to_balance,
+        }
+    )
+    assert stats.population_size == expected.population_size
+    assert stats.population_balance_abs == pytest.approx(
+        expected.population_balance_abs
+    )
+    assert stats.high_value_count == expected.high_value_count
+    assert stats.random_sample_count == expected.random_sample_count
+    assert len({t.transaction_id for t in sample}) > 1
+
+
+def test_resumed_run_reads_only_the_tail(
+    ledger: Path,
+    params: SamplingParameters,
+    tmp_path: Path,
+    full_runs: list[Path],
+    make_ledger,
+) -> None:
+    """Appended rows update the first run's state to the full answer."""
+    state_path = tmp_path / "state.json"
+    sample_incremental(ledger, params, state_path)
+    offset = load_state(state_path).offset
+    _write(make_ledger, 400, 60)
+    result = sample_incremental(ledger, params, state_path)
+    assert len(full_runs) == 1
+    state = load_state(state_path)
+    assert state.offset == ledger.stat().st_size > offset
+    assert state.rows_read == 460
+    assert result == _fresh(ledger, params, tmp_path)
+    # Nothing appended: the state is reused as is
+    assert sample_incremental(ledger, params, state_path) == result
+    assert len(full_runs) == 2
+
+
+def test_id_sketch_kept_beside_state(
+    ledger: Path,
+    params: SamplingParameters,
+    tmp_path: Path,
+    full_runs: list[Path],
+    make_ledger,
+) -> None:
+    """The Bloom filter lives in one binary file next to the JSON."""
+    state_path = tmp_path / "state.json"
+    sample_incremental(ledger, params, state_path)
+    first = load_state(state_path).id_sketch_file
+    _write(make_ledger, 400, 60)
+    result = sample_incremental(ledger, params, state_path)
+    sketch_file = load_state(state_path).id_sketch_file
+    assert sketch_file != first
+    assert [p.name for p in tmp_path.glob("state.json.*")] == [sketch_file]
+    sketch = tmp_path / sketch_file
+    assert state_path.stat().st_size < sketch.stat().st_size
+    assert len(full_runs) == 1
+    # A missing sketch cannot be resumed from
+    sketch.unlink()
+    assert sample_incremental(ledger, params, state_path) == result
+    assert len(full_runs) == 2
+
+
+@pytest.mark.parametrize("change", ["rewrite", "truncate", "params"])
+def test_changed_file_or_parameters_force_a_full_run(
+    ledger: Path,
+    params: SamplingParameters,
+    tmp_path: Path,
+    full_runs: list[Path],
+    change: str,
+) -> None:
+    """Edits before the saved offset are caught by the prefix checks."""
+    state_path = tmp_path / "state.json"
+    sample_incremental(ledger, params, state_path)
+    data = ledger.read_bytes()
+    if change == "rewrite":
+        ledger.write_bytes(data.replace(b"T3,", b"X3,", 1) + b"T9,5.00,,,\n")
+    elif change == "truncate":
+        ledger.write_bytes(data[: len(data) // 2 + 1])
+    else:
+        params = params.model_copy(update={"random_seed": 6})
+    result = sample_incremental(ledger, params, state_path)
+    assert len(full_runs) == 2
+    assert result == _fresh(ledger, params, tmp_path)
+
+
+def test_candidate_pool_overflow_falls_back(
+    ledger: Path,
+    params: SamplingParameters,
+    tmp_path: Path,
+    full_runs: list[Path],
+    make_ledger,
+) -> None:
+    """A sample outgrowing the saved pool is rebuilt from the whole file."""
+    state_path = tmp_path / "state.json"
+    sample_incremental(ledger, params, state_path)
+    capacity = load_state(state_path).candidate_capacity
+    _write(make_ledger, 400, 3 * capacity)
+    result = sample_incremental(ledger, params, state_path)
+    assert len(full_runs) == 2
+    assert load_state(state_path).candidate_capacity > capacity
+    assert result == _fresh(ledger, params, tmp_path)
+
+
+def test_non_csv_inputs_rejected(
+    params: SamplingParameters, tmp_path: Path
+) -> None:
+    with pytest.raises(ValueError):
+        sample_incremental(Path("-"), params, tmp_path / "state.json")
+    with pytest.raises(ValueError):
+        sample_incremental(
+            tmp_path / "gl.parquet", params, tmp_path / "state.json"
+        )
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        ["--breakdown"],
+        ["--fast", "--pipeline"],
+        ["--fast", "--export-population", "population.csv"],
+    ],
+)
+def test_cli_rejects_flags_with_state(
+    ledger: Path, tmp_path: Path, extra: list[str]
+) -> None:
+    """Flag combinations ``--state`` cannot honour are usage errors."""
+    worker = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [env.get("PYTHONPATH"), str(worker / "src")])
+    )
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "src.main",
+            "--input",
+            str(ledger),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--tolerable",
+            "9000",
+            "--expected",
+            "100",
+            "--assurance",
+            "2",
+            "--state",
+            str(tmp_path / "state.json"),
+            *extra,
+        ],
+        env=env,
+        cwd=str(worker),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2
+    assert "--state" in result.stderr
+    assert "Traceback" not in result.stderr
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,137 @@
+"""Tests for multi-file populations sampled as one population."""
+
+from __future__ import annotations
+
+import csv
+import random
+from pathlib import Path
+
+import pytest
+
+from worker.src.cleaner import clean_data
+from worker.src.models import SamplingParameters
+from worker.src.readers import resolve_inputs
+from worker.src.sampler import generate_sample, generate_sample_streaming
+
+HEADERS = [
+    "transaction_id,amount,effective_date,document_type,description",
+    "TRX_ID,Value,Date,DocType,Description",
+    "Description,Amount Value,Effective Date,Document Type,TransactionID",
+]
+
+
+@pytest.fixture()
+def monthly_files(tmp_path: Path) -> tuple[list[Path], Path]:
+    """Write three monthly files with different headers plus their union."""
+    rng = random.Random(3)
+    months = tmp_path / "gl"
+    months.mkdir()
+    files = []
+    union = ["transaction_id,amount,effective_date,document_type,description"]
+    for month, header in enumerate(HEADERS, start=1):
+        lines = [header]
+        for i in range(40):
+            txn = f"M{month}-{i}"
+            amount = "bad" if i == 7 else f"{rng.uniform(-900, 900):.2f}"
+            date = f"0{month}/{i % 28 + 1:02d}/2024"
+            doc = rng.choice(["INV", "CM"])
+            desc = f"Line {i}"
+            union.append(f"{txn},{amount},{date},{doc},{desc}")
+            if month == 3:
+                lines.append(f"{desc},{amount},{date},{doc},{txn}")
+            else:
+                lines.append(f"{txn},{amount},{date},{doc},{desc}")
+        path = months / f"2024-0{month}.csv"
+        path.write_text("\n".join(lines) + "\n")
+        files.append(path)
+    combined = tmp_path / "combined.csv"
+    combined.write_text("\n".join(union) + "\n")
+    return files, combined
+
+
+@pytest.fixture()
+def params(make_params) -> SamplingParameters:
+    return make_params(tolerable_misstatement=3000.0)
+
+
+def _key(txn) -> tuple:
+    return (txn.transaction_id, txn.amount_signed, txn.selection_type)
+
+
+def test_resolve_inputs_directory_glob_and_list(
+    monthly_files: tuple[list[Path], Path],
+) -> None:
+    """Directories and globs expand sorted; repeats are kept once."""
+    files, _ = monthly_files
+    directory = files[0].parent
+    assert resolve_inputs(directory) == files
+    assert resolve_inputs(str(directory / "2024-0[12].csv")) == files[:2]
+    assert resolve_inputs([files[2], str(directory / "*.csv")]) == [
+        files[2],
+        files[0],
+        files[1],
+    ]
+    with pytest.raises(FileNotFoundError):
+        resolve_inputs(str(directory / "*.parquet"))
+
+
+def test_streaming_union_matches_concatenated(
+    monthly_files: tuple[list[Path], Path], params: SamplingParameters
+) -> None:
+    """Split files select exactly what the concatenated file selects."""
+    files, combined = monthly_files
+    expected, expected_stats = generate_sample_streaming(combined, params)
+    sample, stats = generate_sample_streaming(files, params)
+    assert stats == expected_stats
+    assert stats.random_sample_count > 0
+    assert [_key(t) for t in sample] == [_key(t) for t in expected]
+    for txn in sample:
+        month = int(txn.transaction_id[1])
+        assert txn.source_file == str(files[month - 1])
+        assert txn.transaction_id == f"M{month}-{txn.source_row_index}"
+        assert txn.description == f"Line {txn.source_row_index}"
+
+
+def test_streaming_union_prefetch_matches(
+    monthly_files: tuple[list[Path], Path], params: SamplingParameters
+) -> None:
+    """Concurrent prefetched scans combine to the same totals."""
+    files, _ = monthly_files
+    mapped = generate_sample_streaming(files, params)
+    prefetched = generate_sample_streaming(
+        files, params, block_size=64, prefetch_depth=2
+    )
+    assert prefetched == mapped
+
+
+def test_in_memory_union_matches_concatenated(
+    monthly_files: tuple[list[Path], Path], params: SamplingParameters
+) -> None:
+    """Per-file indices restart, and row keys stay unique over the union."""
+    files, combined = monthly_files
+    cleaned, report = clean_data(files)
+    combined_cleaned, combined_report = clean_data(combined)
+    assert report == combined_report
+    assert [t.amount_signed for t in cleaned] == [
+        t.amount_signed for t in combined_cleaned
+    ]
+    assert {t.source_row_index for t in cleaned} == set(range(40)) - {7}
+    sample, stats = generate_sample(cleaned, params)
+    expected, expected_stats = generate_sample(combined_cleaned, params)
+    assert stats == expected_stats
+    assert [_key(t) for t in sample] == [_key(t) for t in expected]
+    assert all(t.source_file for t in sample)
+
+
+def test_rejected_rows_record_source_file(
+    monthly_files: tuple[list[Path], Path], tmp_path: Path
+) -> None:
+    """Rejections from every file land in one quarantine file."""
+    files, _ = monthly_files
+    rejected_path = tmp_path / "out" / "rejected_rows.csv"
+    clean_data(files, rejected_path=rejected_path)
+    with open(rejected_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["source_file"] for r in rows] == [str(p) for p in files]
+    assert {r["row_index"] for r in rows} == {"7"}
+    assert [r["transaction_id"] for r in rows] == ["M1-7", "M2-7", "M3-7"]
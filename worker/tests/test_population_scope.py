@@ -0,0 +1,193 @@
+"""Tests for date range, document type and amount band scope filters."""
+
+from __future__ import annotations
+
+import io
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from worker.src.cleaner import clean_data
+from worker.src.sampler import generate_sample, generate_sample_streaming
+
+
+def _ledger(make_ledger):
+    ledger = make_ledger(
+        seed=14,
+        spread=4000.0,
+        special={3: "bad", 8: "0"},
+        months=3,
+        documents=["INV", " inv", "CM", "JE", ""],
+    )
+    for row in ledger.rows[11::70]:
+        row[2] = "not a date"
+    ledger.write()
+    return ledger
+
+
+@pytest.fixture()
+def ledger(make_ledger) -> Path:
+    return _ledger(make_ledger).path
+
+
+SCOPES = [
+    {"date_from": date(2024, 1, 10), "date_to": date(2024, 2, 20)},
+    {"include_document_types": ["inv", "CM"]},
+    {"exclude_document_types": ["JE"], "amount_min": 500.0},
+    {
+        "amount_min": 100.0,
+        "amount_max": 3000.0,
+        "include_document_types": ["INV"],
+        "date_to": date(2024, 3, 1),
+    },
+]
+
+
+def _key(txn) -> tuple:
+    return (txn.transaction_id, txn.amount_signed, txn.selection_type)
+
+
+@pytest.mark.parametrize("scope", SCOPES)
+def test_clean_data_drops_rows_outside_scope(
+    ledger: Path, make_params, scope
+) -> None:
+    """Out-of-scope rows are counted, not rejected, and never kept."""
+    params = make_params(random_seed=3, **scope)
+    everything, _ = clean_data(ledger)
+    cleaned, report = clean_data(ledger, params=params)
+    scoped = (
+        report.excluded_by_date
+        + report.excluded_by_document_type
+        + report.excluded_by_amount_band
+    )
+    assert scoped > 0
+    assert report.total_rows_raw == 400
+    assert len(cleaned) + scoped == len(everything)
+    for txn in cleaned:
+        if params.date_from or params.date_to:
+            day = txn.effective_date.date()
+            assert (params.date_from or date.min) <= day
+            assert day <= (params.date_to or date.max)
+        if params.include_document_types:
+            assert txn.document_type.upper() in {"INV", "CM"}
+        if params.exclude_document_types:
+            assert txn.document_type != "JE"
+        if params.amount_min is not None:
+            assert txn.amount_abs >= params.amount_min
+        if params.amount_max is not None:
+            assert txn.amount_abs <= params.amount_max
+
+
+@pytest.mark.parametrize("scope", SCOPES)
+def test_streaming_scope_matches_in_memory(
+    ledger: Path, make_params, scope
+) -> None:
+    """Both streaming passes apply the scope the cleaner applies."""
+    params = make_params(random_seed=3, **scope)
+    cleaned, report = clean_data(ledger, params=params)
+    expected, expected_stats = generate_sample(cleaned, params)
+    counts: dict[str, int] = {}
+    sample, stats = generate_sample_streaming(
+        ledger, params, scope_counts=counts
+    )
+    assert stats.population_size == expected_stats.population_size
+    assert stats.high_value_count == expected_stats.high_value_count
+    assert stats.random_sample_count == expected_stats.random_sample_count
+    assert stats.population_balance_abs == pytest.approx(
+        expected_stats.population_balance_abs
+    )
+    assert counts == {
+        "date": report.excluded_by_date,
+        "document_type": report.excluded_by_document_type,
+        "amount_band": report.excluded_by_amount_band,
+    }
+    assert {t.transaction_id for t in sample} <= {
+        t.transaction_id for t in cleaned
+    }
+
+
+@pytest.mark.parametrize("scope", SCOPES)
+def test_sqlite_scope_pushdown_matches_in_memory(
+    ledger: Path, tmp_path: Path, make_ledger, make_params, scope
+) -> None:
+    """Scope predicates run in SQL and select what the cleaner keeps."""
+    params = make_params(random_seed=3, **scope)
+    db = tmp_path / "ledger.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE gl (TRX_ID, Value, Date, DocType, Description)"
+        )
+        conn.executemany(
+            "INSERT INTO gl VALUES (?, ?, ?, ?, ?)",
+            _ledger(make_ledger).records(),
+        )
+    conn.close()
+    cleaned, report = clean_data(ledger, params=params)
+    expected, expected_stats = generate_sample(cleaned, params)
+    counts: dict[str, int] = {}
+    sample, stats = generate_sample_streaming(db, params, scope_counts=counts)
+    assert [_key(t) for t in sample] == [_key(t) for t in expected]
+    assert stats.population_size == expected_stats.population_size
+    assert counts == {
+        "date": report.excluded_by_date,
+        "document_type": report.excluded_by_document_type,
+        "amount_band": report.excluded_by_amount_band,
+    }
+
+
+def test_spooled_and_columnar_sources_apply_scope(
+    make_ledger,
+    make_params,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Excel, stdin and Parquet sources filter pass 1 like CSV does."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    pa = pytest.importorskip("pyarrow")
+    from openpyxl import Workbook
+
+    population = _ledger(make_ledger)
+    ledger = population.path
+    params = make_params(random_seed=3, **SCOPES[3])
+    expected = generate_sample_streaming(ledger, params)
+
+    columns = zip(*population.records())
+    parquet = tmp_path / "ledger.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                name: [str(value) for value in column]
+                for name, column in zip(population.header, columns)
+            }
+        ),
+        parquet,
+    )
+    assert generate_sample_streaming(parquet, params) == expected
+
+    workbook = Workbook()
+    workbook.active.append(population.header)
+    for row in population.rows:
+        workbook.active.append(row)
+    xlsx = tmp_path / "ledger.xlsx"
+    workbook.save(xlsx)
+    assert generate_sample_streaming(xlsx, params) == expected
+
+    stream = io.BytesIO(ledger.read_bytes())
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(stream))
+    assert generate_sample_streaming(Path("-"), params) == expected
+
+
+def test_scope_parameters_validated(make_params) -> None:
+    """Inverted ranges and negative bands are rejected."""
+    with pytest.raises(ValidationError):
+        make_params(date_from=date(2024, 2, 1), date_to=date(2024, 1, 1))
+    with pytest.raises(ValidationError):
+        make_params(amount_min=10.0, amount_max=5.0)
+    with pytest.raises(ValidationError):
+        make_params(amount_min=-1.0)
+    assert not make_params().has_scope_filters()
+    assert make_params(exclude_document_types=["JE"]).has_scope_filters()
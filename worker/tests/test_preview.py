@@ -0,0 +1,110 @@
+"""Tests for the block-sampled population preview."""
+
+from __future__ import annotations
+
+import random
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from worker.src.models import SamplingParameters
+from worker.src.preview import _read_lines, estimate_population
+from worker.src.sampler import generate_sample_streaming
+
+
+@pytest.fixture()
+def ledger(tmp_path: Path) -> Path:
+    """Write 20k rows of varying width, with a few unusable amounts."""
+    rng = random.Random(2)
+    lines = ["transaction_id,amount,effective_date,document_type,description"]
+    for i in range(20_000):
+        amount = f"{rng.lognormvariate(6, 1.5) * rng.choice([-1, 1]):.2f}"
+        if i % 500 == 1:
+            amount = "bad"
+        desc = "x" * rng.randint(0, 40)
+        doc = rng.choice(["INV", "CM", "JE"])
+        lines.append(f"T{i},{amount},{i % 28 + 1:02d}/01/2024,{doc},{desc}")
+    path = tmp_path / "ledger.csv"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _params(**extra) -> SamplingParameters:
+    return SamplingParameters(
+        tolerable_misstatement=20_000.0,
+        expected_misstatement=1_000.0,
+        assurance_factor=2.0,
+        random_seed=8,
+        **extra,
+    )
+
+
+@pytest.mark.parametrize(
+    "extra", [{}, {"balance_type": "credit", "exclude_document_types": ["JE"]}]
+)
+def test_preview_read_whole_is_exact(ledger: Path, extra) -> None:
+    """Blocks covering the whole file reproduce the streaming totals."""
+    params = _params(**extra)
+    _, stats = generate_sample_streaming(ledger, params)
+    estimate = estimate_population(
+        ledger, params, blocks=4, block_size=1 << 20
+    )
+    assert estimate.exact
+    assert estimate.rows.estimate == estimate.rows_sampled == 20_000
+    assert estimate.population_size.estimate == stats.population_size
+    assert estimate.population_balance_abs.estimate == pytest.approx(
+        stats.population_balance_abs
+    )
+    assert estimate.high_value_count.estimate == stats.high_value_count
+    assert estimate.random_sample_count.estimate == stats.random_sample_count
+    assert estimate.population_size.lower == estimate.population_size.upper
+
+
+def test_preview_bounds_cover_true_values(ledger: Path) -> None:
+    """A 10% block sample brackets the exact figures."""
+    params = _params()
+    _, stats = generate_sample_streaming(ledger, params)
+    estimate = estimate_population(ledger, params, blocks=20, block_size=4096)
+    assert estimate.is_estimate and not estimate.exact
+    assert estimate.bytes_sampled < estimate.bytes_total / 5
+    for field, truth in (
+        ("rows", 20_000),
+        ("population_size", stats.population_size),
+        ("population_balance_abs", stats.population_balance_abs),
+        ("high_value_count", stats.high_value_count),
+        ("random_sample_count", stats.random_sample_count),
+    ):
+        bounds = getattr(estimate, field)
+        assert bounds.lower <= truth <= bounds.upper, field
+    dumped = estimate.model_dump(mode="json")
+    assert dumped["is_estimate"] is True
+    assert dumped["confidence_level"] == 0.95
+
+
+def test_blocks_own_the_lines_starting_inside_them(tmp_path: Path) -> None:
+    """Adjacent blocks split lines by start offset, without overlap."""
+    path = tmp_path / "lines.csv"
+    path.write_bytes(b"h\naa\nbbbb\nc\ndddddd\n")
+    with open(path, "rb") as f:
+        parts = [_read_lines(f, start, start + 4, 2) for start in (2, 6, 10)]
+        tail = _read_lines(f, 14, 21, 2)
+    assert b"".join(parts + [tail]) == b"aa\nbbbb\nc\ndddddd\n"
+    assert parts[1] == b""
+
+
+def test_preview_rejects_unseekable_or_typed_inputs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        estimate_population(Path("-"), _params())
+    with pytest.raises(ValueError):
+        estimate_population(tmp_path / "gl.xlsx", _params())
+
+
+def test_preview_applies_scope(ledger: Path) -> None:
+    """Scope filters shrink the estimated population like the sampler."""
+    params = _params(date_to=date(2024, 1, 14))
+    _, stats = generate_sample_streaming(ledger, params)
+    estimate = estimate_population(
+        ledger, params, blocks=1, block_size=1 << 21
+    )
+    assert estimate.population_size.estimate == stats.population_size
@@ -0,0 +1,180 @@
+"""Tests for the population readers."""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from worker.src.readers import (
+    CsvPopulation,
+    ReadStats,
+    iter_csv_records,
+    iter_csv_rows,
+)
+
+HEADER = "transaction_id,amount,effective_date,document_type,description"
+
+
+def _dict_reader_rows(path: Path) -> list[dict[str, str]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+CONTENTS = [
+    f"{HEADER}\nT1,100,01/01/2024,INV,Plain\nT2,-5,01/02/2024,CM,Two\n",
+    f"{HEADER}\r\nT1,100,01/01/2024,INV,Crlf\r\nT2,7,,,\r\n",
+    f"﻿{HEADER}\nT1,100,01/01/2024,INV,Bom\n",
+    f"{HEADER}\n\nT1,100,01/01/2024,INV,Blank\n\nT2,3,x,y,z",
+    f"{HEADER}\nT1,100\nT2,1,2,3,4,5,6\n",
+    f"{HEADER}\nT1,100,01/01/2024,INV,Café\nT2,1,,,Ünïcode\n",
+    (
+        f"{HEADER}\n"
+        + "".join(f"T{i},{i},01/01/2024,INV,Row {i}\n" for i in range(30))
+        + 'T99,"1,000",01/01/2024,INV,"Quoted, with comma"\n'
+        + 'T100,5,01/01/2024,INV,"multi\nline"\n'
+    ),
+    f'{HEADER}\n"T1","100","01/01/2024","INV","All quoted"\n',
+    f"{HEADER}\rT1,100,01/01/2024,INV,Bare CR\r",
+    (
+        f"{HEADER}\r\n"
+        + "".join(f"T{i},{i},01/01/2024,INV,Row {i}\r\n" for i in range(30))
+        + "T99,5,01/01/2024,INV,Stray\rT100,6,01/01/2024,INV,CR\r\n"
+    ),
+]
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 1 << 20])
+@pytest.mark.parametrize("content", CONTENTS)
+def test_iter_csv_rows_matches_dict_reader(
+    tmp_path: Path, content: str, block_size: int
+) -> None:
+    """Fast and fallback paths yield exactly what DictReader yields."""
+    path = tmp_path / "population.csv"
+    path.write_bytes(content.encode("utf-8"))
+    assert list(iter_csv_rows(path, block_size)) == _dict_reader_rows(path)
+
+
+def test_iter_csv_rows_empty_file(tmp_path: Path) -> None:
+    """An empty file yields no rows."""
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"")
+    assert list(iter_csv_rows(path)) == []
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 1 << 20])
+@pytest.mark.parametrize("content", CONTENTS)
+def test_csv_population_matches_records(
+    tmp_path: Path, content: str, block_size: int
+) -> None:
+    """Mapped and fallback scans see the same fields and records."""
+    path = tmp_path / "population.csv"
+    path.write_bytes(content.encode("utf-8"))
+    expected = list(iter_csv_records(path))
+    header_line = content.split("\n", 1)[0].removesuffix("\r")
+    with CsvPopulation(path, block_size) as source:
+        # Quotes and bare CRs below the header switch to csv per block
+        assert source.mapped == (
+            '"' not in header_line and "\r" not in header_line
+        )
+        assert source.header == expected[0]
+        for _ in range(2):  # both passes reuse the same mapping
+            scanned = list(source.iter_fields(1))
+            assert [source.record(h) for _, h in scanned] == expected[1:]
+            fields = [
+                f.decode() if isinstance(f, bytes) else f for f, _ in scanned
+            ]
+            assert fields == [
+                r[1] if len(r) > 1 else None for r in expected[1:]
+            ]
+
+
+def test_csv_population_empty_file(tmp_path: Path) -> None:
+    """Empty files are not mapped and yield no rows."""
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"")
+    with CsvPopulation(path) as source:
+        assert not source.mapped
+        assert source.header == []
+        assert list(source.iter_fields(0)) == []
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 1 << 20])
+@pytest.mark.parametrize("content", CONTENTS)
+def test_prefetched_records_match(
+    tmp_path: Path, content: str, block_size: int
+) -> None:
+    """Read-ahead yields the same records and records I/O wait time."""
+    path = tmp_path / "population.csv"
+    path.write_bytes(content.encode("utf-8"))
+    stats = ReadStats()
+    prefetched = list(
+        iter_csv_records(path, block_size, prefetch_depth=2, stats=stats)
+    )
+    assert prefetched == list(iter_csv_records(path, block_size))
+    assert stats.io_wait_seconds >= 0.0
+
+
+def test_csv_population_prefetch_skips_mapping(tmp_path: Path) -> None:
+    """A positive prefetch depth reads through the background thread."""
+    path = tmp_path / "population.csv"
+    path.write_bytes(CONTENTS[0].encode("utf-8"))
+    with CsvPopulation(path, 7, prefetch_depth=3) as source:
+        assert not source.mapped
+        fields = [f for f, _ in source.iter_fields(1)]
+    assert fields == ["100", "-5"]
+
+
+def test_read_stats_parse_seconds_floor() -> None:
+    """Parse time is elapsed minus I/O wait, never negative."""
+    stats = ReadStats()
+    stats.io_wait_seconds = 2.0
+    stats.elapsed_seconds = 5.0
+    assert stats.parse_seconds == 3.0
+    stats.io_wait_seconds = 6.0
+    assert stats.parse_seconds == 0.0
+
+
+def test_read_stats_concurrent_wait_within_elapsed() -> None:
+    """Waits of parallel workers count as their share of wall time."""
+    workers = [ReadStats(), ReadStats()]
+    for worker in workers:
+        worker.elapsed_seconds = 4.0
+        worker.io_wait_seconds = 3.0
+    stats = ReadStats()
+    stats.add_concurrent(workers, 5.0)
+    assert stats.elapsed_seconds == 5.0
+    assert stats.io_wait_seconds == pytest.approx(3.75)
+    stats.add_concurrent([ReadStats()], 1.0)
+    assert stats.elapsed_seconds == 6.0
+    assert stats.io_wait_seconds == pytest.approx(3.75)
+
+
+def test_mapped_and_inline_reads_record_io_wait(tmp_path: Path) -> None:
+    """Reads are timed without the prefetch thread too."""
+    from worker.src.models import SamplingParameters
+    from worker.src.sampler import generate_sample_streaming
+
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"part{n}.csv"
+        path.write_text(
+            f"{HEADER}\n"
+            + "".join(
+                f"T{i},{i % 97},01/01/2024,INV,Row {i}\n" for i in range(2000)
+            )
+        )
+        paths.append(path)
+    params = SamplingParameters(
+        tolerable_misstatement=1000.0,
+        expected_misstatement=100.0,
+        assurance_factor=3.0,
+    )
+    stats = ReadStats()
+    generate_sample_streaming(paths, params, block_size=256, read_stats=stats)
+    assert 0.0 < stats.io_wait_seconds <= stats.elapsed_seconds
+
+    inline = ReadStats()
+    assert list(iter_csv_records(paths[0], 256, stats=inline))
+    assert inline.io_wait_seconds > 0.0
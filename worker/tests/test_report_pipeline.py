@@ -0,0 +1,186 @@
+"""Tests for the report pipeline started from streaming pass 1."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from worker.src import reporter
+from worker.src.models import DataQualityReport, SamplingParameters
+from worker.src.reporter import ReportPipeline, generate_reports
+from worker.src.sampler import generate_sample_streaming
+
+
+@pytest.fixture()
+def ledger(make_ledger) -> Path:
+    return make_ledger(600, seed=4, documents=["INV"]).path
+
+
+@pytest.fixture()
+def params(make_params) -> SamplingParameters:
+    return make_params(
+        expected_misstatement=500.0, assurance_factor=3.0, random_seed=21
+    )
+
+
+def _quality(rows: int) -> DataQualityReport:
+    return DataQualityReport(
+        total_rows_raw=rows,
+        total_rows_cleaned=rows,
+        missing_transaction_id=0,
+        missing_amount=0,
+        missing_effective_date=0,
+        missing_document_type=0,
+        missing_description=0,
+        invalid_amount_format=0,
+        invalid_date_format=0,
+        duplicate_transaction_ids=0,
+        excluded_due_to_amount=0,
+        excluded_due_to_balance=0,
+    )
+
+
+def _sheet_values(path: Path) -> dict[str, list[tuple]]:
+    workbook = load_workbook(path)
+    values = {
+        name: list(workbook[name].iter_rows(min_row=2, values_only=True))
+        for name in workbook.sheetnames
+    }
+    workbook.close()
+    return values
+
+
+@pytest.mark.parametrize("fast_writer", [False, True])
+def test_pipelined_report_matches_generate_reports(
+    ledger: Path,
+    params: SamplingParameters,
+    tmp_path: Path,
+    fast_writer: bool,
+) -> None:
+    """High-value rows are handed over after pass 1; the output is the same
+    apart from the coverage banner, which becomes a formula."""
+    pipeline = ReportPipeline(
+        tmp_path / "piped",
+        params,
+        "run-pipe",
+        fast_writer=fast_writer,
+        output_formats=["xlsx", "csv"],
+    )
+    calls = []
+
+    def start(high_value, sample_size):
+        calls.append((list(high_value), sample_size))
+        pipeline.start(high_value, sample_size)
+
+    sample, stats = generate_sample_streaming(
+        ledger, params, on_high_value=start
+    )
+    ((high_value, sample_size),) = calls
+    assert stats.high_value_count == len(high_value) > 0
+    assert sample[: len(high_value)] == high_value
+    assert sample_size == len(sample)
+
+    timestamp = datetime.now(timezone.utc)
+    path = pipeline.finish(sample, _quality(600), stats, timestamp)
+    expected = generate_reports(
+        tmp_path / "plain",
+        sample,
+        _quality(600),
+        stats,
+        params,
+        timestamp,
+        "run-pipe",
+        fast_writer=fast_writer,
+        output_formats=["xlsx", "csv"],
+    )
+    assert path.name == expected.name == "sample_selection_output.xlsx"
+    assert (
+        tmp_path / "piped" / "sample_selection_output.csv"
+    ).read_text() == (
+        tmp_path / "plain" / "sample_selection_output.csv"
+    ).read_text()
+
+    piped = load_workbook(path)
+    banner = piped["Sample Selected"]["B1"].value
+    piped.close()
+    last = 3 + len(sample)
+    assert banner == (
+        "=IF('Population Summary'!B2>0,"
+        f"SUM('Sample Selected'!C4:C{last})/'Population Summary'!B2,0)"
+    )
+    values = _sheet_values(path)
+    assert values == _sheet_values(expected)
+    picked = sum(row[2] for row in values["Sample Selected"][2:])
+    assert picked / stats.population_balance_abs == pytest.approx(
+        stats.coverage_percent / 100
+    )
+
+
+def test_coverage_formula_spans_shards(
+    tmp_path: Path,
+    ledger: Path,
+    params: SamplingParameters,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Every sample sheet's banner sums the Amount Abs of all of them."""
+    monkeypatch.setattr(reporter, "SAMPLE_ROWS_PER_SHEET", 40)
+    sample, stats = generate_sample_streaming(ledger, params)
+    # In-process, as the writer process would not see the patched limit
+    sink = reporter.XlsxSink(
+        tmp_path / "report.xlsx", params, "run-shards", coverage_formula=True
+    )
+    sink.set_results(_quality(600), stats, datetime.now(timezone.utc))
+    reporter._feed_sinks([sink], sample)
+    workbook = load_workbook(sink.path)
+    shards = workbook.sheetnames[1:-1]
+    assert len(shards) == -(-len(sample) // 40) > 1
+    banner = workbook[shards[0]]["B1"].value
+    assert all(workbook[name]["B1"].value == banner for name in shards)
+    last = 3 + len(sample) - 40 * (len(shards) - 1)
+    assert f"'{shards[-1]}'!C4:C{last}" in banner
+    workbook.close()
+
+
+def test_pipeline_without_start_and_size_check(
+    tmp_path: Path, ledger: Path, params: SamplingParameters
+) -> None:
+    """Samplers without a pass-1 hook get the whole sample at the end."""
+    sample, stats = generate_sample_streaming(ledger, params)
+    timestamp = datetime.now(timezone.utc)
+    pipeline = ReportPipeline(tmp_path / "late", params, "run-late")
+    path = pipeline.finish(sample, _quality(600), stats, timestamp)
+    rows = _sheet_values(path)["Sample Selected"][2:]
+    assert [row[0] for row in rows] == [t.transaction_id for t in sample]
+
+    short = tmp_path / "short"
+    pipeline = ReportPipeline(
+        short, params, "run-short", output_formats=["xlsx", "csv", "jsonl"]
+    )
+    pipeline.start(sample[:1], len(sample) + 1)
+    with pytest.raises(ValueError):
+        pipeline.finish(sample, _quality(600), stats, timestamp)
+    # The aborted outputs are deleted rather than left truncated
+    assert list(short.iterdir()) == []
+    with pytest.raises(ValueError):
+        ReportPipeline(tmp_path, params, "run-bad", output_formats=[])
+
+
+def test_pipeline_sink_error_is_raised(
+    tmp_path: Path, ledger: Path, params: SamplingParameters
+) -> None:
+    """Errors in the writer process come back to ``finish``."""
+    (tmp_path / "sample_selection_output.csv").mkdir()
+    pipeline = ReportPipeline(
+        tmp_path, params, "run-error", output_formats=["xlsx", "csv"]
+    )
+    sample, stats = generate_sample_streaming(
+        ledger, params, on_high_value=pipeline.start
+    )
+    with pytest.raises(IsADirectoryError):
+        pipeline.finish(
+            sample, _quality(600), stats, datetime.now(timezone.utc)
+        )
+    assert load_workbook(tmp_path / "sample_selection_output.xlsx")
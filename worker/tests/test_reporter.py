@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import csv
+import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
 from openpyxl import load_workbook
 
+from worker.src import reporter
 from worker.src.models import (
     CleanedTransaction,
     DataQualityReport,
@@ -212,3 +216,237 @@ def test_parameters_used_content(tmp_path: Path) -> None:
     assert params["Methodology"] == "RSM Random Non-Statistical"
 
     workbook.close()
+
+
+def test_fast_writer_matches_per_cell_writer(tmp_path: Path) -> None:
+    """Bulk rows hold the same values, with real dates and striped CF."""
+    sample = [
+        CleanedTransaction(
+            transaction_id=f"T{i}",
+            amount_signed=-25.5 * i,
+            amount_abs=25.5 * i,
+            effective_date=datetime(2024, 2, i + 1, 9, 30) if i else None,
+            document_type="INV",
+            description=None if i == 2 else f"Line {i}",
+            balance_category="credit",
+            source_row_index=i,
+            selection_type="Random",
+        )
+        for i in range(4)
+    ]
+    sheets = {}
+    for fast in (False, True):
+        out_dir = tmp_path / str(fast)
+        path = generate_reports(
+            out_dir,
+            sample,
+            _sample_quality(),
+            _sample_stats(),
+            _sample_params(),
+            datetime.now(timezone.utc),
+            "run-fast",
+            fast_writer=fast,
+        )
+        sheets[fast] = load_workbook(path)["Sample Selected"]
+
+    slow, fast = sheets[False], sheets[True]
+    for row in range(4, 8):
+        for col in "ABCEFGHI":
+            assert (fast[f"{col}{row}"].value or "") == (
+                slow[f"{col}{row}"].value or ""
+            )
+    assert fast["D5"].value == datetime(2024, 2, 2, 9, 30)
+    assert slow["D5"].value == "2024-02-02T09:30:00"
+    assert fast["D4"].value is None
+    assert fast["B5"].number_format == "#,##0.00"
+    (striped,) = fast.conditional_formatting
+    assert str(striped.sqref) == "A4:I7"
+    assert [rule.formula for rule in striped.rules] == [
+        ["MOD(ROW(),2)=0"],
+        ["MOD(ROW(),2)=1"],
+    ]
+
+
+@pytest.mark.parametrize("fast_writer", [False, True])
+def test_sample_sheet_shards_past_row_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fast_writer: bool
+) -> None:
+    """Rows past the per-sheet limit continue on numbered sheets."""
+    monkeypatch.setattr(reporter, "SAMPLE_ROWS_PER_SHEET", 2)
+    sample = [
+        CleanedTransaction(
+            transaction_id=f"T{i}",
+            amount_signed=float(i),
+            amount_abs=float(i),
+            source_row_index=i,
+            source_file="b.csv" if i == 4 else None,
+            selection_type="Random",
+        )
+        for i in range(5)
+    ]
+    output_path = generate_reports(
+        tmp_path,
+        sample,
+        _sample_quality(),
+        _sample_stats(),
+        _sample_params(),
+        datetime.now(timezone.utc),
+        "run-shards",
+        fast_writer=fast_writer,
+    )
+    workbook = load_workbook(output_path)
+    assert workbook.sheetnames == [
+        "Population Summary",
+        "Sample Selected",
+        "Sample Selected (2)",
+        "Sample Selected (3)",
+        "Parameters Used",
+    ]
+    ids = []
+    for name in workbook.sheetnames[1:4]:
+        sheet = workbook[name]
+        assert sheet["A3"].value == "Transaction ID"
+        assert sheet["J3"].value == "Source File"
+        ids += [row[0] for row in sheet.iter_rows(min_row=4, values_only=True)]
+    assert ids == [f"T{i}" for i in range(5)]
+
+    summary = {
+        row[0]: row[1]
+        for row in workbook["Population Summary"].iter_rows(values_only=True)
+    }
+    assert summary["Sample Selected"] == "Items 1 to 2 of 5"
+    assert summary["Sample Selected (3)"] == "Items 5 to 5 of 5"
+    workbook.close()
+
+
+def test_output_formats_hold_the_same_rows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Every sink receives the sample from one pass, in small batches."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(reporter, "SINK_BATCH_ROWS", 2)
+    sample = [
+        CleanedTransaction(
+            transaction_id=f"T{i}",
+            amount_signed=-10.0 * i,
+            amount_abs=10.0 * i,
+            effective_date=datetime(2024, 5, i + 1) if i % 2 else None,
+            balance_category="credit",
+            source_row_index=i,
+            selection_type="Random",
+        )
+        for i in range(5)
+    ]
+    path = generate_reports(
+        tmp_path,
+        sample,
+        _sample_quality(),
+        _sample_stats(),
+        _sample_params(),
+        datetime.now(timezone.utc),
+        "run-sinks",
+        output_formats=["csv", "xlsx", "jsonl", "parquet", "csv"],
+    )
+    assert path == tmp_path / "sample_selection_output.csv"
+    expected = [txn.model_dump(mode="json") for txn in sample]
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["transaction_id"] for row in rows] == [
+        f"T{i}" for i in range(5)
+    ]
+    assert rows[1]["effective_date"] == expected[1]["effective_date"]
+    assert rows[0]["effective_date"] == ""
+
+    with open(tmp_path / "sample_selection_output.jsonl") as f:
+        assert [json.loads(line) for line in f] == expected
+
+    table = pq.read_table(tmp_path / "sample_selection_output.parquet")
+    assert table.to_pylist() == [txn.model_dump() for txn in sample]
+
+    workbook = load_workbook(tmp_path / "sample_selection_output.xlsx")
+    ids = [
+        row[0]
+        for row in workbook["Sample Selected"].iter_rows(
+            min_row=4, values_only=True
+        )
+    ]
+    assert ids == [f"T{i}" for i in range(5)]
+    workbook.close()
+
+
+def test_failing_sink_is_reported(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A sink error surfaces after the other writers have finished."""
+
+    def broken(self, rows):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(reporter, "SINK_BATCH_ROWS", 1)
+    monkeypatch.setattr(reporter, "SINK_QUEUE_BATCHES", 1)
+    monkeypatch.setattr(reporter.JsonLinesSink, "write_batch", broken)
+    sample = [
+        CleanedTransaction(transaction_id=f"T{i}", source_row_index=i)
+        for i in range(10)
+    ]
+    with pytest.raises(OSError, match="disk full"):
+        generate_reports(
+            tmp_path,
+            sample,
+            _sample_quality(),
+            _sample_stats(),
+            _sample_params(),
+            datetime.now(timezone.utc),
+            "run-broken",
+            output_formats=["jsonl", "csv"],
+        )
+    with open(tmp_path / "sample_selection_output.csv") as f:
+        assert len(f.readlines()) == 11
+    with pytest.raises(ValueError):
+        generate_reports(
+            tmp_path,
+            sample,
+            _sample_quality(),
+            _sample_stats(),
+            _sample_params(),
+            datetime.now(timezone.utc),
+            "run-broken",
+            output_formats=["docx"],
+        )
+
+
+@pytest.mark.parametrize("in_memory_rows", [100, 0])
+def test_render_report_matches_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, in_memory_rows: int
+) -> None:
+    """The buffered workbook holds what generate_reports writes to disk."""
+    monkeypatch.setattr(reporter, "IN_MEMORY_MAX_ROWS", in_memory_rows)
+    sample = [
+        CleanedTransaction(
+            transaction_id=f"T{i}",
+            amount_signed=3.5 * i,
+            amount_abs=3.5 * i,
+            effective_date=datetime(2024, 7, i % 28 + 1),
+            source_row_index=i,
+            selection_type="Random",
+        )
+        for i in range(50)
+    ]
+    args = (
+        sample,
+        _sample_quality(),
+        _sample_stats(),
+        _sample_params(),
+        datetime(2024, 8, 1, tzinfo=timezone.utc),
+        "run-buffer",
+    )
+    path = generate_reports(tmp_path, *args)
+    # A tiny spool moves the finished workbook to a temporary file
+    with reporter.render_report(*args, spool_bytes=1024) as output:
+        rendered = load_workbook(output)
+        expected = load_workbook(path)
+        assert rendered.sheetnames == expected.sheetnames
+        for name in expected.sheetnames:
+            assert list(rendered[name].values) == list(expected[name].values)
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,182 @@
+"""Tests for saved report inputs and the ``report`` command."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from worker.src.models import (
+    CleanedTransaction,
+    DataQualityReport,
+    SampleStatistics,
+    SamplingParameters,
+)
+from worker.src.sidecar import load_report_inputs, save_report_inputs
+
+WORKER = Path(__file__).resolve().parents[1]
+
+
+def _quality() -> DataQualityReport:
+    return DataQualityReport(
+        total_rows_raw=2,
+        total_rows_cleaned=2,
+        missing_transaction_id=0,
+        missing_amount=0,
+        missing_effective_date=0,
+        missing_document_type=0,
+        missing_description=0,
+        invalid_amount_format=0,
+        invalid_date_format=0,
+        duplicate_transaction_ids=0,
+        excluded_due_to_amount=0,
+        excluded_due_to_balance=0,
+        notes="two rows",
+    )
+
+
+def test_round_trip_and_version(tmp_path: Path) -> None:
+    sample = [
+        CleanedTransaction(
+            transaction_id="A",
+            amount_signed=-12.5,
+            amount_abs=12.5,
+            effective_date=datetime(2024, 3, 1),
+            document_type="INV",
+            balance_category="credit",
+            source_row_index=0,
+            source_file="gl.csv",
+            selection_type="High Value",
+        )
+    ]
+    stats = SampleStatistics(
+        population_size=2,
+        population_balance_abs=20.0,
+        sampling_interval=10.0,
+        high_value_count=1,
+        random_sample_count=0,
+        coverage_abs=12.5,
+        coverage_percent=62.5,
+    )
+    params = SamplingParameters(
+        tolerable_misstatement=50.0,
+        expected_misstatement=20.0,
+        assurance_factor=3.0,
+        include_document_types=["INV"],
+    )
+    timestamp = datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone.utc)
+    path = tmp_path / "runs" / "r1.report.json.gz"
+
+    assert (
+        save_report_inputs(
+            path, sample, _quality(), stats, params, timestamp, "r1"
+        )
+        == path
+    )
+    inputs = load_report_inputs(path)
+    assert inputs.sample == sample
+    assert inputs.quality_report == _quality()
+    assert inputs.sample_statistics == stats
+    assert inputs.parameters == params
+    assert inputs.timestamp == timestamp
+    assert inputs.run_id == "r1"
+    assert list(path.parent.iterdir()) == [path]
+
+    data = json.loads(gzip.decompress(path.read_bytes()))
+    data["version"] = 0
+    path.write_bytes(gzip.compress(json.dumps(data).encode()))
+    with pytest.raises(ValueError):
+        load_report_inputs(path)
+
+
+def _run(args: list[str]) -> None:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [env.get("PYTHONPATH"), str(WORKER / "src")])
+    )
+    subprocess.run(
+        [sys.executable, "-m", "src.main", *args],
+        check=True,
+        env=env,
+        cwd=str(WORKER),
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _sheet_values(path: Path) -> dict[str, list[tuple]]:
+    workbook = load_workbook(path)
+    values = {
+        name: list(workbook[name].iter_rows(values_only=True))
+        for name in workbook.sheetnames
+    }
+    workbook.close()
+    return values
+
+
+def test_report_command_rebuilds_outputs(tmp_path: Path) -> None:
+    """Outputs rebuilt from the sidecar match the original run's."""
+    lines = ["transaction_id,amount,effective_date,document_type,description"]
+    for i in range(300):
+        lines.append(
+            f"T{i},{(i * 37) % 900 - 300},02/{i % 28 + 1:02d}/2024,JE,"
+        )
+    source = tmp_path / "gl.csv"
+    source.write_text("\n".join(lines) + "\n")
+    out = tmp_path / "out"
+    _run(
+        [
+            "--input",
+            str(source),
+            "--output-dir",
+            str(out),
+            "--tolerable",
+            "3000",
+            "--expected",
+            "100",
+            "--assurance",
+            "3",
+            "--output-format",
+            "xlsx",
+            "csv",
+        ]
+    )
+    (summary,) = (out / "runs").glob("*.json")
+    data = json.loads(summary.read_text())
+    sidecar = Path(data["report_inputs"])
+    assert sidecar == out / "runs" / f"{data['run_id']}.report.json.gz"
+    inputs = load_report_inputs(sidecar)
+    assert len(inputs.sample) == data["sample_size"]
+
+    rebuilt = tmp_path / "rebuilt"
+    _run(
+        [
+            "report",
+            str(sidecar),
+            "--output-dir",
+            str(rebuilt),
+            "--output-format",
+            "csv",
+            "xlsx",
+        ]
+    )
+    name = "sample_selection_output"
+    assert (rebuilt / f"{name}.csv").read_text() == (
+        out / f"{name}.csv"
+    ).read_text()
+    assert _sheet_values(rebuilt / f"{name}.xlsx") == _sheet_values(
+        out / f"{name}.xlsx"
+    )
+
+    # Without --output-dir the outputs replace the run's own
+    (out / f"{name}.csv").unlink()
+    _run(["report", str(sidecar), "--output-format", "csv"])
+    assert (out / f"{name}.csv").read_text() == (
+        rebuilt / f"{name}.csv"
+    ).read_text()
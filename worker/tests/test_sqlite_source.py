@@ -0,0 +1,157 @@
+"""Tests for the SQLite population source."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from worker.src.cleaner import clean_data
+from worker.src.sampler import generate_sample, generate_sample_streaming
+from worker.src.sqlite_source import SqlitePopulation
+
+
+@pytest.fixture()
+def population(make_ledger, tmp_path: Path) -> tuple[Path, Path]:
+    """Write the same rows to a SQLite table and to a CSV file."""
+    ledger = make_ledger(
+        300,
+        seed=8,
+        spread=2000.0,
+        special={
+            3: 0,
+            9: "bad",
+            11: None,
+            17: lambda amount: f"{abs(amount) + 1000:,.2f}",
+        },
+    )
+    db = tmp_path / "ledger.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE gl (TRX_ID TEXT, Value, Date TEXT, DocType TEXT, "
+            "Description TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO gl VALUES (?, ?, ?, ?, ?)", ledger.records()
+        )
+    conn.close()
+    return db, ledger.path
+
+
+def _key(txn) -> tuple:
+    return (txn.transaction_id, txn.source_row_index, txn.selection_type)
+
+
+@pytest.mark.parametrize("include_zeros", [False, True])
+@pytest.mark.parametrize("balance_type", ["debit", "credit", "both"])
+def test_sqlite_matches_in_memory_csv(
+    population: tuple[Path, Path],
+    make_params,
+    balance_type: str,
+    include_zeros: bool,
+) -> None:
+    """Pushed-down filters select what the in-memory CSV path selects."""
+    db, csv_path = population
+    params = make_params(
+        tolerable_misstatement=4000.0,
+        balance_type=balance_type,
+        exclude_zero_amounts=not include_zeros,
+        random_seed=21,
+    )
+    cleaned, _ = clean_data(csv_path)
+    expected, expected_stats = generate_sample(cleaned, params)
+    sample, stats = generate_sample_streaming(db, params)
+    assert [_key(t) for t in sample] == [_key(t) for t in expected]
+    assert stats.random_sample_count > 0
+    assert stats.high_value_count > 0
+    for field, value in stats.model_dump().items():
+        assert value == pytest.approx(getattr(expected_stats, field))
+    assert [t.effective_date for t in sample] == [
+        t.effective_date for t in expected
+    ]
+
+
+def test_sqlite_clean_data_matches_csv(population: tuple[Path, Path]) -> None:
+    """The in-memory path reads the table through the same cleaner."""
+    db, csv_path = population
+    cleaned, report = clean_data(db)
+    expected, expected_report = clean_data(csv_path)
+    assert report == expected_report
+    assert cleaned == expected
+
+
+def test_sqlite_query_source(
+    population: tuple[Path, Path], make_params
+) -> None:
+    """A SELECT query is sampled in its own row order."""
+    db, _ = population
+    params = make_params(tolerable_misstatement=4000.0, random_seed=4)
+    query = "SELECT * FROM gl WHERE DocType = 'INV' ORDER BY rowid"
+    sample, stats = generate_sample_streaming(db, params, sql=query)
+    cleaned, _ = clean_data(db, sql=query)
+    expected, expected_stats = generate_sample(cleaned, params)
+    assert [_key(t) for t in sample] == [_key(t) for t in expected]
+    assert stats.population_size == expected_stats.population_size
+    assert all(t.document_type == "INV" for t in sample)
+
+
+def test_sqlite_requires_table_choice(tmp_path: Path) -> None:
+    """Databases with several tables need an explicit source."""
+    db = tmp_path / "two.sqlite"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE a (amount REAL)")
+        conn.execute("CREATE TABLE b (amount REAL)")
+    conn.close()
+    with pytest.raises(ValueError):
+        SqlitePopulation(db)
+    with SqlitePopulation(db, "b") as source:
+        assert source.header == ["amount"]
+
+
+@pytest.mark.parametrize(
+    "sql", ["gl", "SELECT * FROM gl WHERE DocType = 'INV'"]
+)
+def test_sqlite_take_rows_follows_indices(
+    population: tuple[Path, Path], make_params, sql: str
+) -> None:
+    """Rows fetched by index match the rows read in source order."""
+    db, _ = population
+    with sqlite3.connect(db) as conn:
+        # Gaps in rowid must not shift the indices
+        conn.execute("DELETE FROM gl WHERE rowid % 7 = 0")
+    conn.close()
+    params = make_params(tolerable_misstatement=4000.0)
+    with SqlitePopulation(db, sql) as source:
+        with pytest.raises(RuntimeError):
+            source.take_rows([0])
+        ordered = [row["TRX_ID"] for row in source.iter_rows()]
+        source.population_totals(params, 1000.0)
+        wanted = [0, 5, len(ordered) - 1]
+        rows = source.take_rows(wanted)
+    assert {idx: row["transaction_id"] for idx, row in rows.items()} == {
+        idx: ordered[idx] for idx in wanted
+    }
+
+
+@pytest.mark.parametrize("name", ["gl_view", "gl_keyed"])
+def test_sqlite_sources_without_rowid(
+    population: tuple[Path, Path], make_params, name: str
+) -> None:
+    """Views and WITHOUT ROWID tables sample like the in-memory path."""
+    db, _ = population
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE VIEW gl_view AS SELECT * FROM gl")
+        conn.execute(
+            "CREATE TABLE gl_keyed (TRX_ID TEXT PRIMARY KEY, Value, "
+            "Date TEXT, DocType TEXT, Description TEXT) WITHOUT ROWID"
+        )
+        conn.execute("INSERT INTO gl_keyed SELECT * FROM gl")
+    conn.close()
+    params = make_params(tolerable_misstatement=4000.0, random_seed=5)
+    sample, stats = generate_sample_streaming(db, params, sql=name)
+    cleaned, _ = clean_data(db, sql=name)
+    expected, expected_stats = generate_sample(cleaned, params)
+    assert [_key(t) for t in sample] == [_key(t) for t in expected]
+    assert stats.population_size == expected_stats.population_size
+    assert stats.random_sample_count > 0
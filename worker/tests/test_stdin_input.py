@@ -0,0 +1,114 @@
+"""Tests for populations piped through standard input."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from worker.src.cleaner import clean_data
+from worker.src.models import SamplingParameters
+from worker.src.readers import PipePopulation, resolve_inputs
+from worker.src.sampler import generate_sample_streaming
+
+
+@pytest.fixture()
+def ledger(make_ledger) -> Path:
+    """Write a CSV population with a few unusable amounts."""
+    return make_ledger(
+        300, seed=9, spread=2500.0, every=60, special={7: "bad"}
+    ).path
+
+
+@pytest.fixture()
+def params(make_params) -> SamplingParameters:
+    return make_params(tolerable_misstatement=5000.0, random_seed=31)
+
+
+def _pipe(monkeypatch: pytest.MonkeyPatch, path: Path) -> io.BytesIO:
+    stream = io.BytesIO(path.read_bytes())
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(stream))
+    return stream
+
+
+@pytest.mark.parametrize("prefetch_depth", [0, 2])
+def test_streaming_stdin_matches_file(
+    ledger: Path,
+    params: SamplingParameters,
+    monkeypatch: pytest.MonkeyPatch,
+    prefetch_depth: int,
+) -> None:
+    """Pass 2 replays the spool and selects what the file path selects."""
+    expected = generate_sample_streaming(ledger, params)
+    stream = _pipe(monkeypatch, ledger)
+    inputs = resolve_inputs("-")
+    assert inputs == [Path("-")]
+    sample, stats = generate_sample_streaming(
+        inputs, params, block_size=256, prefetch_depth=prefetch_depth
+    )
+    assert stream.tell() == len(ledger.read_bytes())
+    assert stats.random_sample_count > 0
+    assert (sample, stats) == expected
+
+
+def test_clean_data_reads_stdin(
+    ledger: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The in-memory path reads standard input in its single pass."""
+    expected = clean_data(ledger)
+    _pipe(monkeypatch, ledger)
+    assert clean_data(Path("-")) == expected
+
+
+def test_pipe_population_reads_once(ledger: Path) -> None:
+    """The stream is consumed by the first scan only."""
+    with open(ledger, "rb") as f, PipePopulation(f, block_size=128) as pipe:
+        assert pipe.header[:2] == ["transaction_id", "amount"]
+        assert sum(1 for _ in pipe.iter_fields(1)) == 300
+        with pytest.raises(RuntimeError):
+            next(pipe.iter_fields(1))
+
+
+def test_cli_fast_reads_piped_input(ledger: Path, tmp_path: Path) -> None:
+    """``--input -`` samples a pipe and records the skipped checks."""
+    out_dir = tmp_path / "out"
+    env = os.environ.copy()
+    worker_src = Path.cwd() / "worker" / "src"
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [env.get("PYTHONPATH"), str(worker_src)])
+    )
+    cmd = [
+        sys.executable,
+        "-m",
+        "src.main",
+        "--input",
+        "-",
+        "--output-dir",
+        str(out_dir),
+        "--tolerable",
+        "5000",
+        "--expected",
+        "100",
+        "--assurance",
+        "2",
+        "--fast",
+    ]
+    with open(ledger, "rb") as stdin:
+        subprocess.run(
+            cmd,
+            check=True,
+            env=env,
+            stdin=stdin,
+            cwd=str(Path.cwd() / "worker"),
+        )
+    (summary_path,) = (out_dir / "runs").glob("*.json")
+    summary = json.loads(summary_path.read_text())
+    quality = summary["data_quality"]
+    assert quality["total_rows_raw"] == 295
+    assert "standard input" in quality["notes"]
+    assert summary["sample_size"] > 0
@@ -37,3 +37,81 @@ def test_streaming_empty_file(tmp_path: Path) -> None:
     )
     with pytest.raises(ValueError):
         generate_sample_streaming(empty, params)
+
+
+def test_streaming_sample_fields_match_cleaned(sample_csv: Path) -> None:
+    """Deferred parsing yields the same fields as the in-memory cleaner."""
+    from worker.src.cleaner import clean_data
+
+    params = SamplingParameters(
+        tolerable_misstatement=1000.0,
+        expected_misstatement=100.0,
+        assurance_factor=10.0,
+        random_seed=5,
+    )
+    cleaned, _ = clean_data(sample_csv)
+    by_index = {t.source_row_index: t for t in cleaned}
+    sample, _ = generate_sample_streaming(sample_csv, params)
+    assert any(t.selection_type == "Random" for t in sample)
+    for txn in sample:
+        expected = by_index[txn.source_row_index]
+        assert txn.effective_date == expected.effective_date
+        assert txn.description == expected.description
+        assert txn.document_type == expected.document_type
+
+
+@pytest.mark.parametrize("balance_type", ["debit", "credit", "both"])
+def test_streaming_filter_counts_match_in_memory(
+    sample_csv: Path, balance_type: str
+) -> None:
+    """Amount-field pushdown keeps exclusion counts exact."""
+    from worker.src.cleaner import clean_data
+    from worker.src.sampler import generate_sample
+
+    params = SamplingParameters(
+        tolerable_misstatement=1000.0,
+        expected_misstatement=100.0,
+        assurance_factor=2.0,
+        balance_type=balance_type,
+        random_seed=9,
+    )
+    cleaned, _ = clean_data(sample_csv)
+    _, memory_stats = generate_sample(cleaned, params)
+    _, stream_stats = generate_sample_streaming(sample_csv, params)
+    assert stream_stats.population_size == memory_stats.population_size
+    assert (
+        stream_stats.excluded_zero_amounts
+        == memory_stats.excluded_zero_amounts
+    )
+    assert (
+        stream_stats.excluded_due_to_balance
+        == memory_stats.excluded_due_to_balance
+    )
+    assert stream_stats.population_balance_abs == pytest.approx(
+        memory_stats.population_balance_abs
+    )
+
+
+def test_streaming_prefetch_matches_mapped(sample_csv: Path) -> None:
+    """Read-ahead produces the same sample and fills the read timings."""
+    from worker.src.readers import ReadStats
+
+    params = SamplingParameters(
+        tolerable_misstatement=1000.0,
+        expected_misstatement=100.0,
+        assurance_factor=10.0,
+        random_seed=5,
+    )
+    mapped, mapped_stats = generate_sample_streaming(sample_csv, params)
+    read_stats = ReadStats()
+    prefetched, prefetched_stats = generate_sample_streaming(
+        sample_csv,
+        params,
+        block_size=64,
+        prefetch_depth=2,
+        read_stats=read_stats,
+    )
+    assert prefetched == mapped
+    assert prefetched_stats == mapped_stats
+    assert read_stats.elapsed_seconds > 0.0
+    assert read_stats.parse_seconds <= read_stats.elapsed_seconds